@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the JSON codecs on the example responses embedded in the method
+docstrings.
+
+use:
+  $ python benchmarks/bench_codec.py
+"""
+import importlib
+import inspect
+import json
+import pkgutil
+import textwrap
+import timeit
+
+from slack_time import methods
+from slack_time.codec import CODECS
+from slack_time.codec import orjson
+from slack_time.utils import make_json_encoded
+
+MARKER = ">>> response.json()"
+
+
+def iter_examples():
+    """yield every example response that is valid JSON"""
+    for info in pkgutil.iter_modules(methods.__path__):
+        module = importlib.import_module(f"{methods.__name__}.{info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            for _, func in inspect.getmembers(cls, inspect.isfunction):
+                doc = inspect.getdoc(func) or ""
+                if MARKER not in doc:
+                    continue
+                example = textwrap.dedent(doc.split(MARKER, 1)[1])
+                try:
+                    yield json.loads(example)
+                except ValueError:
+                    continue
+
+
+def main(number: int = 200):
+    examples = list(iter_examples())
+    raw = [json.dumps(example).encode() for example in examples]
+    size = sum(len(r) for r in raw)
+    print(f"{len(examples)} example responses, {size} bytes")
+
+    for name, codec_cls in CODECS.items():
+        if name == "orjson" and orjson is None:
+            print(f"{name:>8}: not installed")
+            continue
+        codec = codec_cls()
+
+        def decode():
+            for r in raw:
+                codec.loads(r)
+
+        def encode():
+            for example in examples:
+                make_json_encoded(example, codec)
+
+        loads = timeit.timeit(decode, number=number) / number
+        dumps = timeit.timeit(encode, number=number) / number
+        print(
+            f"{name:>8}: loads {loads * 1e6:8.1f}us  dumps {dumps * 1e6:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the cold import time of slack_time, with the method namespaces
+loaded lazily (the default) against loading all of them up front.
+
+use:
+  $ python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+LAZY = "from slack_time import SlackTime; SlackTime('token').chat"
+EAGER = (
+    "from slack_time import SlackTime, methods; "
+    "[getattr(methods, name) for name in methods.__all__]; "
+    "SlackTime('token').chat"
+)
+
+
+def cold_import(code: str, number: int) -> float:
+    """median wall time of running `code` in a fresh interpreter"""
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(number: int = 20):
+    baseline = cold_import("pass", number)
+    for name, code in (("lazy", LAZY), ("eager", EAGER)):
+        elapsed = cold_import(code, number) - baseline
+        print(f"{name:>6}: {elapsed * 1e3:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,11 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     install_requires=["requests >= 2.2"],
+    extras_require={
+        "async": ["aiohttp >= 3.6"],
+        "orjson": ["orjson"],
+        "rtm": ["websocket-client >= 0.57"],
+    },
     test_suite="tests",
     classifiers=[
         "Programming Language :: Python",
@@ -1,36 +1,63 @@
 # -*- coding: utf-8 -*-
 import os
+from typing import TYPE_CHECKING
 
+import requests
+
+from .api import make_session
 from .api import SlackAPI
-from .methods import Admin
-from .methods import Api
-from .methods import Apps
-from .methods import Auth
-from .methods import Bots
-from .methods import Calls
-from .methods import Chat
-from .methods import Conversations
-from .methods import Dialog
-from .methods import Dnd
-from .methods import Emoji
-from .methods import Files
-from .methods import Migration
-from .methods import OAuth
-from .methods import Pins
-from .methods import Reactions
-from .methods import Reminders
-from .methods import Rtm
-from .methods import Search
-from .methods import Stars
-from .methods import Team
-from .methods import Usergroups
-from .methods import Users
-from .methods import Views
-from .methods import Workflows
+from .bulk import bulk
+from .bulk import iter_bulk
+from .cache import ResponseCache
+from .coalesce import SingleFlight
+from .codec import get_codec
+from .codec import JSONCodec
+from .directory import ChannelDirectory
+from .pagination import is_cursor_paginated
+from .pagination import paginate
+from .pagination import paginate_numbered
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
 from .utils import cached_property
 from .utils import SlackError
 
-__all__ = ["get_slack_time", "SlackTime", "SlackError"]
+if TYPE_CHECKING:
+    from .methods import Admin
+    from .methods import Api
+    from .methods import Apps
+    from .methods import Auth
+    from .methods import Bots
+    from .methods import Calls
+    from .methods import Chat
+    from .methods import Conversations
+    from .methods import Dialog
+    from .methods import Dnd
+    from .methods import Emoji
+    from .methods import Files
+    from .methods import Migration
+    from .methods import OAuth
+    from .methods import Pins
+    from .methods import Reactions
+    from .methods import Reminders
+    from .methods import Rtm
+    from .methods import Search
+    from .methods import Stars
+    from .methods import Team
+    from .methods import Usergroups
+    from .methods import Users
+    from .methods import Views
+    from .methods import Workflows
+
+__all__ = [
+    "get_slack_time",
+    "SlackTime",
+    "SlackError",
+    "RateLimiter",
+    "RetryPolicy",
+    "JSONCodec",
+    "ResponseCache",
+    "SingleFlight",
+]
 
 
 class SlackTime(SlackAPI):
@@ -42,106 +69,273 @@ class SlackTime(SlackAPI):
       >>> client = SlackTime("xoxo-token-goes-here")
       >>> client.chat.post_message("#general", "hey team!")
       <Response [200]>
+
+    A pooled `requests.Session` is made for the client (unless one is
+    passed in) and shared by every method namespace, so connections are
+    reused across calls. Close it with `client.close()` or use the client
+    as a context manager:
+      >>> with SlackTime("xoxo-token-goes-here") as client:
+      ...     client.chat.post_message("#general", "hey team!")
+
+    :param pool_connections: number of per-host connection pools to cache
+    :type int: e.g. 10
+
+    :param pool_maxsize: max number of connections kept open per host
+    :type int: e.g. 10
+
+    :param pool_block: block when all connections to a host are in use
+    :type bool: e.g. False
+
+    :param keep_alive: reuse connections between requests
+    :type bool: e.g. True
+
+    :param rate_limit: queue requests to stay inside Slack's rate limits
+    :type bool: e.g. True (pass `rate_limiter=` to tune it)
+
+    :param retry: retry transient failures
+    :type bool: e.g. True (pass `retry_policy=` to tune it)
+
+    :param codec: JSON codec, the fastest one installed by default
+    :type JSONCodec: e.g. JSONCodec()
+
+    :param resolve_channels: look up `channel` names in a ChannelDirectory
+      so methods are called with IDs
+    :type bool: e.g. False (pass `channel_directory=` to share one)
+
+    :param coalesce: share one request between identical concurrent reads
+    :type bool: e.g. True (pass `single_flight=` to share between clients)
     """
 
+    def __init__(
+        self,
+        token: str,
+        session: requests.Session = None,
+        *args,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        rate_limit: bool = True,
+        retry: bool = True,
+        resolve_channels: bool = False,
+        coalesce: bool = True,
+        **kwargs
+    ):
+        if rate_limit:
+            kwargs.setdefault("rate_limiter", RateLimiter())
+        if retry:
+            kwargs.setdefault("retry_policy", RetryPolicy())
+        if coalesce:
+            kwargs.setdefault("single_flight", SingleFlight())
+        kwargs.setdefault("codec", get_codec())
+        self._owns_session = session is None
+        if session is None:
+            session = make_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+            )
+        super().__init__(token, session, *args, **kwargs)
+        if resolve_channels and self._channel_directory is None:
+            self._channel_directory = ChannelDirectory(self)
+
+    def close(self) -> None:
+        """close the client's session if the client made it"""
+        if self._owns_session:
+            self._session.close()
+
+    def paginate(self, method, *args, **kwargs):
+        """
+        lazily yield every item of a paginated method, by cursor or by page
+        number, see `slack_time.pagination.paginate` and
+        `slack_time.pagination.paginate_numbered`
+
+        use:
+          >>> for user in client.paginate(client.users.list):
+          ...     print(user["name"])
+          >>> for match in client.paginate(client.search.messages, "hi"):
+          ...     print(match["text"])
+        """
+        if is_cursor_paginated(method):
+            return paginate(method, *args, **kwargs)
+        return paginate_numbered(method, *args, **kwargs)
+
+    def bulk(self, calls, workers: int = 8):
+        """
+        run many independent calls over a pool of `workers` threads that
+        share the client's connections and rate limiter, and return a
+        BulkResult for each in order, with the response or the exception
+        see `slack_time.bulk.iter_bulk`
+
+        use:
+          >>> calls = [(client.users.info, {"user": u}) for u in user_ids]
+          >>> results = client.bulk(calls)
+          >>> [r.response.body["user"] for r in results if r.ok]
+        """
+        return bulk(calls, workers=workers)
+
+    def iter_bulk(self, calls, workers: int = 8):
+        """
+        like `bulk`, but lazily yield the results in order so `calls` can
+        be a generator of any size
+        """
+        return iter_bulk(calls, workers=workers)
+
+    def __enter__(self) -> "SlackTime":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     @cached_property
-    def admin(self) -> Admin:
+    def admin(self) -> "Admin":
+        from .methods.admin import Admin
+
         return Admin(**self.params)
 
     @cached_property
-    def api(self) -> Api:
+    def api(self) -> "Api":
+        from .methods.api import Api
+
         return Api(**self.params)
 
     @cached_property
-    def apps(self) -> Apps:
+    def apps(self) -> "Apps":
+        from .methods.apps import Apps
+
         return Apps(**self.params)
 
     @cached_property
-    def auth(self) -> Auth:
+    def auth(self) -> "Auth":
+        from .methods.auth import Auth
+
         return Auth(**self.params)
 
     @cached_property
-    def bots(self) -> Bots:
+    def bots(self) -> "Bots":
+        from .methods.bots import Bots
+
         return Bots(**self.params)
 
     @cached_property
-    def calls(self) -> Calls:
+    def calls(self) -> "Calls":
+        from .methods.calls import Calls
+
         return Calls(**self.params)
 
     @cached_property
-    def chat(self) -> Chat:
+    def chat(self) -> "Chat":
+        from .methods.chat import Chat
+
         return Chat(**self.params)
 
     @cached_property
-    def conversations(self) -> Conversations:
+    def conversations(self) -> "Conversations":
+        from .methods.conversations import Conversations
+
         return Conversations(**self.params)
 
     @cached_property
-    def dialog(self) -> Dialog:
+    def dialog(self) -> "Dialog":
+        from .methods.dialog import Dialog
+
         return Dialog(**self.params)
 
     @cached_property
-    def dnd(self) -> Dnd:
+    def dnd(self) -> "Dnd":
+        from .methods.dnd import Dnd
+
         return Dnd(**self.params)
 
     @cached_property
-    def emoji(self) -> Emoji:
+    def emoji(self) -> "Emoji":
+        from .methods.emoji import Emoji
+
         return Emoji(**self.params)
 
     @cached_property
-    def files(self) -> Files:
+    def files(self) -> "Files":
+        from .methods.files import Files
+
         return Files(**self.params)
 
     @cached_property
-    def migration(self) -> Migration:
+    def migration(self) -> "Migration":
+        from .methods.migration import Migration
+
         return Migration(**self.params)
 
     @cached_property
-    def oauth(self) -> OAuth:
+    def oauth(self) -> "OAuth":
+        from .methods.oauth import OAuth
+
         return OAuth(**self.params)
 
     @cached_property
-    def pins(self) -> Pins:
+    def pins(self) -> "Pins":
+        from .methods.pins import Pins
+
         return Pins(**self.params)
 
     @cached_property
-    def reactions(self) -> Reactions:
+    def reactions(self) -> "Reactions":
+        from .methods.reactions import Reactions
+
         return Reactions(**self.params)
 
     @cached_property
-    def reminders(self) -> Reminders:
+    def reminders(self) -> "Reminders":
+        from .methods.reminders import Reminders
+
         return Reminders(**self.params)
 
     @cached_property
-    def rtm(self) -> Rtm:
+    def rtm(self) -> "Rtm":
+        from .methods.rtm import Rtm
+
         return Rtm(**self.params)
 
     @cached_property
-    def search(self) -> Search:
+    def search(self) -> "Search":
+        from .methods.search import Search
+
         return Search(**self.params)
 
     @cached_property
-    def stars(self) -> Stars:
+    def stars(self) -> "Stars":
+        from .methods.stars import Stars
+
         return Stars(**self.params)
 
     @cached_property
-    def team(self) -> Team:
+    def team(self) -> "Team":
+        from .methods.team import Team
+
         return Team(**self.params)
 
     @cached_property
-    def usergroups(self) -> Usergroups:
+    def usergroups(self) -> "Usergroups":
+        from .methods.usergroups import Usergroups
+
         return Usergroups(**self.params)
 
     @cached_property
-    def users(self) -> Users:
+    def users(self) -> "Users":
+        from .methods.users import Users
+
         return Users(**self.params)
 
     @cached_property
-    def views(self) -> Views:
+    def views(self) -> "Views":
+        from .methods.views import Views
+
         return Views(**self.params)
 
     @cached_property
-    def workflows(self) -> Workflows:
+    def workflows(self) -> "Workflows":
+        from .methods.workflows import Workflows
+
         return Workflows(**self.params)
 
 
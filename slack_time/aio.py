@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+from collections import deque
+from functools import lru_cache
+from functools import partial
+from functools import wraps
+from urllib.parse import urlsplit
+
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.bulk import BulkResult
+from slack_time.codec import DECODE_ERRORS
+from slack_time.codec import get_codec
+from slack_time.pagination import is_cursor_paginated
+from slack_time.pagination import MAX_COUNTS
+from slack_time.pagination import max_limit
+from slack_time.pagination import method_name
+from slack_time.pagination import next_cursor
+from slack_time.pagination import numbered_page_items
+from slack_time.pagination import page_items
+from slack_time.pagination import paging
+from slack_time.rate_limit import RateLimiter
+from slack_time.response import SlackResponse
+from slack_time.retry import RetryPolicy
+from slack_time.utils import cached_property
+from slack_time.utils import check_response
+from slack_time.utils import close_opened_files
+from slack_time.utils import rewind_files
+
+try:
+    import aiohttp
+except ImportError:
+    raise ImportError(
+        "AsyncSlackTime requires aiohttp, install it with: "
+        "pip install slack_time[async]"
+    ) from None
+
+__all__ = [
+    "AsyncSlackAPI",
+    "AsyncSlackTime",
+    "make_async",
+    "iter_bulk",
+    "bulk",
+]
+
+# not ValueError itself, which also covers mistakes such as a bad URL (but
+# so does aiohttp's InvalidURL, a ClientError too)
+TRANSIENT_EXCEPTIONS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    *DECODE_ERRORS,
+)
+
+
+def _form_value(value):
+    """
+    mirror how requests form-encodes scalar values
+    """
+    if isinstance(value, (str, bytes)):
+        return value
+    return str(value)
+
+
+def _make_params(params: dict) -> dict:
+    if params is None:
+        return None
+    return {k: _form_value(v) for k, v in params.items() if v is not None}
+
+
+def _make_data(data: dict, files: dict):
+    if not files:
+        return _make_params(data)
+
+    form = aiohttp.FormData()
+    for key, value in (data or {}).items():
+        if value is not None:
+            form.add_field(key, _form_value(value))
+    for key, value in files.items():
+        filename = os.path.basename(getattr(value, "name", key) or key)
+        form.add_field(key, value, filename=filename)
+    return form
+
+
+async def _run(call) -> BulkResult:
+    method, kwargs = call
+    try:
+        return BulkResult(call, await method(**kwargs), None)
+    except Exception as e:
+        return BulkResult(call, None, e)
+
+
+async def iter_bulk(calls, workers: int = 8):
+    """
+    yield a BulkResult for each (async method, kwargs) in `calls`, in
+    order, with no more than `workers` calls in flight or waiting to be
+    consumed at once, see `slack_time.bulk.iter_bulk`
+
+    use:
+      >>> calls = [(client.users.info, {"user": u}) for u in user_ids]
+      >>> async for result in iter_bulk(calls):
+      ...     print(result.response.body["user"])
+    """
+    window = deque()
+    try:
+        for call in calls:
+            window.append(asyncio.ensure_future(_run(call)))
+            if len(window) >= workers:
+                yield await window.popleft()
+        while window:
+            yield await window.popleft()
+    finally:
+        for task in window:
+            task.cancel()
+
+
+async def bulk(calls, workers: int = 8) -> list:
+    """
+    run every (async method, kwargs) in `calls` concurrently and return
+    their results in order, see `iter_bulk`
+    """
+    return [result async for result in iter_bulk(calls, workers=workers)]
+
+
+class AsyncSlackAPI(SlackAPI):
+    """
+    Base API for all Slack endpoints on top of an `aiohttp.ClientSession`.
+
+    Every method returns an awaitable resolving to a `SlackResponse`
+    wrapping the `aiohttp` response.
+    """
+
+    async def _request(self, method: str, url: str, **kwargs):
+        timeout = kwargs.pop("timeout", self._timeout)
+        proxies = kwargs.pop("proxies", self._proxies) or {}
+        kwargs["params"] = _make_params(kwargs.pop("params", None))
+        kwargs["proxy"] = proxies.get(urlsplit(url).scheme)
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        if self._retry_policy is None:
+            return await self._send(method, url, **kwargs)
+
+        path = url.rsplit("/", maxsplit=1).pop()
+        policy = self._retry_policy.for_method(path)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = await self._send(method, url, **kwargs)
+            except TRANSIENT_EXCEPTIONS as e:
+                if isinstance(e, aiohttp.InvalidURL):
+                    raise
+                sent = not isinstance(e, aiohttp.ClientConnectorError)
+                if not policy.should_retry_exception(path, attempt, sent):
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                # the rate limiter has already re-queued it as often as it
+                # allows, so don't multiply its retries
+                if resp.status == 429 and self._rate_limiter is not None:
+                    return resp
+                if not policy.should_retry_response(
+                    path, attempt, resp.status, resp.error
+                ):
+                    return resp
+                delay = policy.delay(attempt, resp.headers.get("Retry-After"))
+            rewind_files(kwargs.get("files"))
+            await asyncio.sleep(delay)
+
+    async def _send(self, method: str, url: str, **kwargs):
+        payload = kwargs.pop("data", None)
+        files = kwargs.pop("files", None)
+
+        limiter = self._rate_limiter
+        path = url.rsplit("/", maxsplit=1).pop()
+        retries = limiter.max_retries if limiter is not None else 0
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                delay = limiter.reserve(path, kwargs["params"] or payload)
+                await asyncio.sleep(delay)
+            data = _make_data(payload, files)
+            resp = await self._session.request(
+                method, url, data=data, **kwargs
+            )
+            if limiter is None or resp.status != 429:
+                break
+            retry_after = resp.headers.get("Retry-After")
+            limiter.retry_after(path, kwargs["params"] or payload, retry_after)
+            if attempt == retries:
+                # out of retries, the 429 is the response
+                break
+            resp.release()
+            rewind_files(files)
+
+        async with resp:
+            content = await resp.read()
+        loads = self._codec.loads if self._codec is not None else None
+        resp = SlackResponse(resp, content, loads=loads)
+        # fail here, not in the caller, if the body isn't JSON
+        resp.successful
+        return resp
+
+    async def _post(self, path: str, payload: dict = None, **kwargs):
+        url = self.make_url(path)
+        # aiohttp already streams files from their handles, progress is
+        # only reported by the sync client
+        kwargs.pop("progress", None)
+        kwargs.setdefault("data", payload)
+        try:
+            resp = await self._request("post", url, **kwargs)
+        finally:
+            close_opened_files(kwargs.get("files"))
+        return check_response(path, resp)
+
+    def _bulk(self, calls, workers: int):
+        # an awaitable for the results, so helpers such as
+        # files.upload_many return one too
+        return bulk(calls, workers=workers)
+
+    async def _get(self, path: str, payload: dict = None, **kwargs):
+        url = self.make_url(path)
+        kwargs.setdefault("params", payload)
+        cache = self._cache
+        if cache is None or not cache.cacheable(path, kwargs):
+            resp = await self._request("get", url, **kwargs)
+            return check_response(path, resp)
+
+        key = cache.key(path, kwargs["params"])
+        resp = cache.get(key)
+        if resp is None:
+            resp = await self._request("get", url, **kwargs)
+            cache.set(key, resp)
+        return check_response(path, resp)
+
+
+def _async_namespace(func):
+    @wraps(func)
+    def accessor(self):
+        namespace = func(self)
+        if isinstance(namespace, SlackAPI) and not isinstance(
+            namespace, AsyncSlackAPI
+        ):
+            namespace = make_async(type(namespace))(**self.params)
+        return namespace
+
+    return cached_property(accessor)
+
+
+def _sync_only(cls: type, name: str):
+    def unavailable(self, *args, **kwargs):
+        raise NotImplementedError(
+            f"{cls.__name__.lower()}.{name} is only available on the sync "
+            "client, SlackTime"
+        )
+
+    unavailable.__name__ = name
+    return unavailable
+
+
+@lru_cache(maxsize=None)
+def make_async(cls: type) -> type:
+    """
+    make an async twin of a SlackAPI namespace class
+
+    the twin reuses every method (and so all payload building) of `cls`,
+    only swapping the transport, and its nested namespaces are async too;
+    helpers marked `sync_only` raise NotImplementedError
+    """
+    namespace = {}
+    for klass in reversed(cls.__mro__):
+        if not issubclass(klass, SlackAPI) or klass is SlackAPI:
+            continue
+        for name, attr in vars(klass).items():
+            if getattr(attr, "sync_only", False):
+                namespace[name] = _sync_only(klass, name)
+                continue
+            func = getattr(attr, "func", None) or getattr(attr, "fget", None)
+            if func is not None:
+                namespace[name] = _async_namespace(func)
+    return type("Async" + cls.__name__, (AsyncSlackAPI, cls), namespace)
+
+
+class AsyncSlackTime(make_async(SlackTime)):
+    """
+    asyncio SlackTime client
+
+    has the same namespaces and method signatures as `SlackTime` but every
+    method returns an awaitable, it must be made inside a running loop
+
+    use:
+      >>> from slack_time.aio import AsyncSlackTime
+      >>> async with AsyncSlackTime("xoxo-token-goes-here") as client:
+      ...     await client.chat.post_message("#general", "hey team!")
+      <ClientResponse(https://slack.com/api/chat.postMessage) [200 OK]>
+
+    :param limit: max number of connections open at once
+    :type int: e.g. 100
+
+    :param limit_per_host: max number of connections open per host
+    :type int: e.g. 10 (0 for no limit)
+
+    :param keep_alive: reuse connections between requests
+    :type bool: e.g. True
+
+    :param rate_limit: queue requests to stay inside Slack's rate limits
+    :type bool: e.g. True (pass `rate_limiter=` to tune it)
+
+    :param retry: retry transient failures
+    :type bool: e.g. True (pass `retry_policy=` to tune it)
+
+    :param codec: JSON codec, the fastest one installed by default
+    :type JSONCodec: e.g. JSONCodec()
+    """
+
+    def __init__(
+        self,
+        token: str,
+        session: "aiohttp.ClientSession" = None,
+        *args,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keep_alive: bool = True,
+        rate_limit: bool = True,
+        retry: bool = True,
+        **kwargs
+    ):
+        if rate_limit:
+            kwargs.setdefault("rate_limiter", RateLimiter())
+        if retry:
+            kwargs.setdefault("retry_policy", RetryPolicy())
+        kwargs.setdefault("codec", get_codec())
+        self._owns_session = session is None
+        if session is None:
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit_per_host,
+                force_close=not keep_alive,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+        SlackAPI.__init__(self, token, session, *args, **kwargs)
+
+    async def close(self) -> None:
+        """close the client's session if the client made it"""
+        if self._owns_session:
+            await self._session.close()
+
+    async def iter_pages(self, method, *args, limit: int = None, **kwargs):
+        """
+        yield each response of a cursor paginated method
+        see `slack_time.pagination.iter_pages`
+        """
+        if limit is None:
+            limit = max_limit(method)
+        cursor = kwargs.pop("cursor", None)
+        while True:
+            resp = await method(*args, cursor=cursor, limit=limit, **kwargs)
+            yield resp
+            cursor = next_cursor(resp.body)
+            if not cursor:
+                return
+
+    async def iter_numbered_pages(
+        self, method, *args, count: int = None, workers: int = 4, **kwargs
+    ):
+        """
+        yield each response of a page number paginated method in page
+        order, fetching the pages after the first `workers` at a time
+        see `slack_time.pagination.iter_numbered_pages`
+        """
+        if count is None:
+            count = MAX_COUNTS.get(method_name(method))
+        first = await method(*args, count=count, page=1, **kwargs)
+        yield first
+
+        pages = paging(first.body).get("pages", 1)
+        fetch = partial(method, *args)
+        calls = (
+            (fetch, dict(kwargs, count=count, page=page))
+            for page in range(2, pages + 1)
+        )
+        async for result in iter_bulk(calls, workers=workers):
+            if not result.ok:
+                raise result.error
+            yield result.response
+
+    async def paginate(self, method, *args, key: str = None, **kwargs):
+        """
+        lazily yield every item of a paginated method, by cursor or by page
+        number, see `slack_time.pagination.paginate` and
+        `slack_time.pagination.paginate_numbered`
+
+        use:
+          >>> async for user in client.paginate(client.users.list):
+          ...     print(user["name"])
+          >>> async for match in client.paginate(client.search.messages, "hi"):
+          ...     print(match["text"])
+        """
+        if is_cursor_paginated(method):
+            pages = self.iter_pages(method, *args, **kwargs)
+            async for resp in pages:
+                for item in page_items(resp.body, key):
+                    yield item
+            return
+        pages = self.iter_numbered_pages(method, *args, **kwargs)
+        async for resp in pages:
+            for item in numbered_page_items(resp.body, key):
+                yield item
+
+    async def bulk(self, calls, workers: int = 8) -> list:
+        """
+        run many independent calls concurrently, at most `workers` at once,
+        and return a BulkResult for each in order
+        see `slack_time.aio.bulk`
+
+        use:
+          >>> calls = [(client.users.info, {"user": u}) for u in user_ids]
+          >>> results = await client.bulk(calls)
+        """
+        return await bulk(calls, workers=workers)
+
+    def iter_bulk(self, calls, workers: int = 8):
+        """
+        like `bulk`, but lazily yield the results in order
+        see `slack_time.aio.iter_bulk`
+        """
+        return iter_bulk(calls, workers=workers)
+
+    async def __aenter__(self) -> "AsyncSlackTime":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -1,7 +1,78 @@
 # -*- coding: utf-8 -*-
+import time
+from typing import TYPE_CHECKING
+
 import requests
+from requests.adapters import HTTPAdapter
+from slack_time.bulk import bulk
+from slack_time.cache import request_key
+from slack_time.cache import ResponseCache
+from slack_time.coalesce import SingleFlight
+from slack_time.codec import DECODE_ERRORS
+from slack_time.codec import JSONCodec
+from slack_time.multipart import MultipartStream
+from slack_time.rate_limit import RateLimiter
+from slack_time.response import SlackResponse
+from slack_time.retry import RetryPolicy
 from slack_time.utils import raise_exception_on_error_from_server
+from slack_time.utils import rewind_body
 from slack_time.utils import SLACK_API_BASE_URL
+from urllib3.exceptions import NewConnectionError
+
+if TYPE_CHECKING:
+    from slack_time.directory import ChannelDirectory
+
+
+def make_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """
+    make a requests session with a tuned connection pool
+
+    :param pool_connections: number of per-host connection pools to cache
+    :type int: e.g. 10
+
+    :param pool_maxsize: max number of connections kept open per host
+    :type int: e.g. 10
+
+    :param pool_block: block when all connections to a host are in use
+    :type bool: e.g. False
+
+    :param keep_alive: reuse connections between requests
+    :type bool: e.g. True
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# not ValueError itself, which also covers mistakes such as MissingSchema
+TRANSIENT_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    *DECODE_ERRORS,
+)
+
+
+def was_sent(exc: Exception) -> bool:
+    """
+    could a request that failed with `exc` have reached the server
+    """
+    if isinstance(exc, requests.ConnectTimeout):
+        return False
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return not isinstance(reason, NewConnectionError)
 
 
 class SlackAPI:
@@ -19,6 +90,25 @@ class SlackAPI:
 
     :param timeout: number of seconds for timeout
     :type int: e.g. 60 (for 60s)
+
+    :param rate_limiter: scheduler that paces requests to Slack's limits
+    :type RateLimiter: e.g. RateLimiter(burst=5)
+
+    :param retry_policy: policy for retrying transient failures
+    :type RetryPolicy: e.g. RetryPolicy(max_attempts=5)
+
+    :param codec: JSON codec for responses and JSON encoded fields
+    :type JSONCodec: e.g. OrjsonCodec()
+
+    :param cache: cache for the responses of read only methods
+    :type ResponseCache: e.g. ResponseCache({"users.info": 60})
+
+    :param channel_directory: resolves `channel` names to IDs
+    :type ChannelDirectory: e.g. ChannelDirectory(client)
+
+    :param single_flight: shares one request between identical concurrent
+      reads
+    :type SingleFlight: e.g. SingleFlight()
     """
 
     url = SLACK_API_BASE_URL
@@ -29,11 +119,23 @@ class SlackAPI:
         session: requests.Session = None,
         proxies: dict = None,
         timeout: int = 10,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        codec: JSONCodec = None,
+        cache: ResponseCache = None,
+        channel_directory: "ChannelDirectory" = None,
+        single_flight: SingleFlight = None,
     ):
         self._token = token
         self._session = session
         self._proxies = proxies
         self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._codec = codec
+        self._cache = cache
+        self._channel_directory = channel_directory
+        self._single_flight = single_flight
 
     @property
     def params(self) -> dict:
@@ -42,37 +144,142 @@ class SlackAPI:
             "session": self._session,
             "proxies": self._proxies,
             "timeout": self._timeout,
+            "rate_limiter": self._rate_limiter,
+            "retry_policy": self._retry_policy,
+            "codec": self._codec,
+            "cache": self._cache,
+            "channel_directory": self._channel_directory,
+            "single_flight": self._single_flight,
         }
         return rv
 
     def make_url(self, path: str) -> str:
         return self.url + "/" + path
 
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+    def _request(self, method: str, url: str, **kwargs) -> SlackResponse:
         kwargs.setdefault("timeout", self._timeout)
         kwargs.setdefault("proxies", self._proxies)
         client = self._session if self._session else requests
 
-        resp = client.request(method, url, **kwargs)
+        if self._retry_policy is None:
+            return self._send(client, method, url, **kwargs)
+
+        path = url.rsplit("/", maxsplit=1).pop()
+        policy = self._retry_policy.for_method(path)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = self._send(client, method, url, **kwargs)
+            except TRANSIENT_EXCEPTIONS as e:
+                sent = was_sent(e)
+                if not policy.should_retry_exception(path, attempt, sent):
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                status = resp.status_code
+                # the rate limiter has already re-queued it as often as it
+                # allows, so don't multiply its retries
+                if status == 429 and self._rate_limiter is not None:
+                    return resp
+                if not policy.should_retry_response(
+                    path, attempt, status, resp.error
+                ):
+                    return resp
+                delay = policy.delay(attempt, resp.headers.get("Retry-After"))
+            rewind_body(kwargs)
+            time.sleep(delay)
+
+    def _send(
+        self, client, method: str, url: str, **kwargs
+    ) -> SlackResponse:
+        limiter = self._rate_limiter
+        if limiter is None:
+            resp = client.request(method, url, **kwargs)
+        else:
+            path = url.rsplit("/", maxsplit=1).pop()
+            payload = kwargs.get("params") or kwargs.get("data")
+            if isinstance(payload, MultipartStream):
+                payload = None
+            for _ in range(limiter.max_retries + 1):
+                limiter.wait(path, payload)
+                resp = client.request(method, url, **kwargs)
+                if resp.status_code != 429:
+                    break
+                retry_after = resp.headers.get("Retry-After")
+                limiter.retry_after(path, payload, retry_after)
+                rewind_body(kwargs)
+
         # got these features from:
         # https://github.com/os/slacker/blob/master/slacker/__init__.py
-        resp.body = resp.json()
-        resp.successful = resp.body["ok"]
-        resp.error = resp.body.get("error")
+        loads = self._codec.loads if self._codec is not None else None
+        resp = SlackResponse(resp, loads=loads)
+        # fail here, not in the caller, if the body isn't JSON
+        resp.successful
         return resp
 
+    def _resolve_channel(self, payload: dict) -> dict:
+        """swap a channel name in the payload for its ID"""
+        directory = self._channel_directory
+        if directory is None or not payload:
+            return payload
+        channel = payload.get("channel")
+        if not isinstance(channel, str):
+            return payload
+        channel_id = directory.resolve(channel)
+        if channel_id == channel:
+            return payload
+        return dict(payload, channel=channel_id)
+
     @raise_exception_on_error_from_server
     def _post(
         self, path: str, payload: dict = None, **kwargs
-    ) -> requests.Response:
+    ) -> SlackResponse:
         url = self.make_url(path)
+        payload = self._resolve_channel(payload)
+        progress = kwargs.pop("progress", None)
+        if kwargs.get("files"):
+            # stream the files rather than have requests read them into
+            # memory to build the body
+            body = MultipartStream(
+                payload, kwargs.pop("files"), progress=progress
+            )
+            headers = dict(kwargs.get("headers") or {})
+            headers["Content-Type"] = body.content_type
+            kwargs["headers"] = headers
+            kwargs["data"] = body
         kwargs.setdefault("data", payload)
         return self._request("post", url, **kwargs)
 
     @raise_exception_on_error_from_server
     def _get(
         self, path: str, payload: dict = None, **kwargs
-    ) -> requests.Response:
+    ) -> SlackResponse:
         url = self.make_url(path)
+        payload = self._resolve_channel(payload)
         kwargs.setdefault("params", payload)
-        return self._request("get", url, **kwargs)
+        cache = self._cache
+        if cache is None or not cache.cacheable(path, kwargs):
+            return self._coalesced_get(path, url, **kwargs)
+
+        key = cache.key(path, kwargs["params"])
+        resp = cache.get(key)
+        if resp is None:
+            resp = self._coalesced_get(path, url, **kwargs)
+            cache.set(key, resp)
+        return resp
+
+    def _coalesced_get(self, path: str, url: str, **kwargs) -> SlackResponse:
+        flight = self._single_flight
+        # only plain reads are shared, not uploads or custom headers etc.
+        if flight is None or kwargs.keys() != {"params"}:
+            return self._request("get", url, **kwargs)
+        key = request_key(path, kwargs["params"])
+        return flight.do(key, lambda: self._request("get", url, **kwargs))
+
+    def _bulk(self, calls, workers: int):
+        """
+        run helper calls made of this client's methods concurrently, the
+        async client swaps in an asyncio version
+        """
+        return bulk(calls, workers=workers)
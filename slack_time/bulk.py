@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Run many independent calls concurrently.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> calls = [(client.users.info, {"user": u}) for u in user_ids]
+  >>> for result in client.bulk(calls):
+  ...     print(result.response.body["user"] if result.ok else result.error)
+"""
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+__all__ = ["BulkResult", "iter_bulk", "bulk"]
+
+Call = Tuple[Callable, dict]
+
+
+class BulkResult(namedtuple("BulkResult", ["call", "response", "error"])):
+    """the response of one call, or the exception it raised"""
+
+    __slots__ = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run(call: Call) -> BulkResult:
+    method, kwargs = call
+    try:
+        return BulkResult(call, method(**kwargs), None)
+    except Exception as e:
+        return BulkResult(call, None, e)
+
+
+def iter_bulk(calls: Iterable[Call], workers: int = 8) -> Iterator:
+    """
+    yield a BulkResult for each (method, kwargs) in `calls`, in order
+
+    calls run over `workers` threads, with no more than `workers` calls in
+    flight or waiting to be consumed at once, so `calls` can be a lazy
+    iterable of any length; each call still goes through the client's
+    rate limiter and connection pool (keep `workers` at or under the
+    client's `pool_maxsize`)
+
+    :param calls: client methods and their keyword arguments
+    :type Iterable[Tuple[Callable, dict]]: e.g.
+      [(client.users.info, {"user": "U123"})]
+
+    :param workers: number of calls to run at once
+    :type int: e.g. 8
+    """
+    pool = ThreadPoolExecutor(max_workers=workers)
+    window = deque()
+    try:
+        for call in calls:
+            window.append(pool.submit(_run, call))
+            if len(window) >= workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        for future in window:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def bulk(calls: Iterable[Call], workers: int = 8) -> List[BulkResult]:
+    """
+    run every (method, kwargs) in `calls` concurrently and return their
+    results in order, see `iter_bulk`
+    """
+    return list(iter_bulk(calls, workers=workers))
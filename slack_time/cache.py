@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ["ResponseCache", "DEFAULT_TTLS", "request_key"]
+
+# seconds to keep the responses of read only methods that are called a lot
+# with the same arguments
+DEFAULT_TTLS = {
+    "bots.info": 3600,
+    "conversations.info": 60,
+    "emoji.list": 600,
+    "team.info": 3600,
+    "team.profile.get": 3600,
+    "usergroups.list": 300,
+    "users.info": 300,
+}
+
+
+def request_key(path: str, payload: dict = None) -> tuple:
+    """
+    hashable key for a request, made of the method, the token and the rest
+    of the payload, so identical requests get equal keys
+    """
+    payload = payload or {}
+    args = tuple(
+        sorted(
+            (k, str(v))
+            for k, v in payload.items()
+            if v is not None and k != "token"
+        )
+    )
+    return path, payload.get("token"), args
+
+
+class ResponseCache:
+    """
+    LRU cache with a per-method TTL for successful responses of read only
+    methods, looked up before `SlackAPI._get` sends a request.
+
+    Entries are keyed by method, token and the rest of the payload, so
+    clients with different tokens can share a cache without seeing each
+    other's responses. Cached responses are shared between callers, so
+    don't mutate their `body`.
+
+    use:
+      >>> client = SlackTime(token, cache=ResponseCache({"users.info": 60}))
+
+    :param ttls: seconds to cache each method for
+    :type dict: e.g. {"users.info": 60} (DEFAULT_TTLS by default)
+
+    :param maxsize: max number of responses kept
+    :type int: e.g. 1024
+    """
+
+    def __init__(
+        self, ttls: dict = None, maxsize: int = 1024, clock=time.monotonic
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} size={len(self)} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    def key(self, path: str, payload: dict = None) -> tuple:
+        return request_key(path, payload)
+
+    def get(self, key: tuple):
+        """the cached response for `key`, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, resp) -> None:
+        """cache `resp` for `key` if it was successful"""
+        ttl = self.ttls.get(key[0])
+        if not ttl or not resp.successful:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, resp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def cacheable(self, path: str, kwargs: dict) -> bool:
+        """can a request to `path` with these request kwargs be cached"""
+        return bool(self.ttls.get(path)) and not kwargs.get("files")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Callable
+from typing import Hashable
+
+__all__ = ["SingleFlight"]
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in
+    flight, other threads calling with the same key wait for it and get
+    its result (or its exception) instead of making their own.
+
+    `SlackAPI._get` runs read requests through one, keyed by method, token
+    and arguments, so a burst of e.g. `users.info("U123")` from several
+    threads sends one request. Shared responses are the same object, so
+    don't mutate their `body`.
+
+    use:
+      >>> client = SlackTime(token, single_flight=SingleFlight())
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} in_flight={len(self)} "
+            f"shared={self.shared}>"
+        )
+
+    def do(self, key: Hashable, func: Callable):
+        """
+        call `func` unless a call for `key` is already in flight, in which
+        case wait for that one and return its result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exc is not None:
+                raise call.exc
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.exc = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ["JSONCodec", "OrjsonCodec", "get_codec", "DECODE_ERRORS"]
+
+# raised decoding a body that isn't JSON, e.g. a proxy error page (orjson's
+# and requests' decode errors subclass json's)
+DECODE_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+
+class JSONCodec:
+    """
+    JSON codec used to decode responses and encode JSON fields such as
+    blocks, attachments and views, backed by the stdlib json module.
+
+    Any object with the same `loads` and `dumps` methods can be passed to
+    `SlackTime(token, codec=...)`.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+    def dumps(self, obj) -> str:
+        return json.dumps(obj)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} [{self.name}]>"
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec backed by orjson (https://github.com/ijl/orjson)
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson, install it with: "
+                "pip install slack_time[orjson]"
+            )
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+    def dumps(self, obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+CODECS = {JSONCodec.name: JSONCodec, OrjsonCodec.name: OrjsonCodec}
+
+
+def get_codec(name: str = None) -> JSONCodec:
+    """
+    get the codec called `name`, or the fastest one installed
+    """
+    if name is not None:
+        return CODECS[name]()
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Client side directories of a workspace, so common lookups don't need an
+API call each time.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> users = UserDirectory(client).load()
+  >>> users.by_email("spengler@ghostbusters.example.com").id
+  'W012A3CDE'
+  >>> channels = ChannelDirectory(client).load()
+  >>> channels.resolve("#general")
+  'C012AB3CD'
+"""
+import re
+import threading
+import time
+from collections import namedtuple
+from typing import Iterator
+from typing import List
+
+from slack_time.pagination import paginate
+
+__all__ = ["User", "UserDirectory", "Channel", "ChannelDirectory"]
+
+User = namedtuple(
+    "User",
+    [
+        "id",
+        "team_id",
+        "name",
+        "real_name",
+        "display_name",
+        "email",
+        "is_bot",
+        "deleted",
+        "updated",
+    ],
+)
+
+
+def make_user(user: dict) -> User:
+    """compact record of a user object from users.list or users.info"""
+    profile = user.get("profile") or {}
+    return User(
+        id=user["id"],
+        team_id=user.get("team_id"),
+        name=user.get("name"),
+        real_name=user.get("real_name") or profile.get("real_name"),
+        display_name=profile.get("display_name"),
+        email=profile.get("email"),
+        is_bot=user.get("is_bot", False),
+        deleted=user.get("deleted", False),
+        updated=user.get("updated"),
+    )
+
+
+def _norm(value: str) -> str:
+    return value.strip().lstrip("@").lower() if value else value
+
+
+class UserDirectory:
+    """
+    In memory index of a workspace's users, streamed from users.list.
+
+    Users can be found by ID, email, username or display name without any
+    API calls. `refresh` streams users.list again and only re-indexes the
+    users that changed, and `update` applies a single user object, e.g.
+    from a `user_change` or `team_join` event.
+
+    :param client: client to call users.list with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param include_deleted: keep deactivated users in the directory
+    :type bool: e.g. False
+    """
+
+    def __init__(self, client, include_deleted: bool = False):
+        self._client = client
+        self.include_deleted = include_deleted
+        self.loaded = False
+        self._by_id = {}
+        self._by_email = {}
+        self._by_name = {}
+        self._by_display_name = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._by_id
+
+    def __iter__(self) -> Iterator[User]:
+        return iter(list(self._by_id.values()))
+
+    def _index(self, user: User) -> None:
+        self._by_id[user.id] = user
+        if user.email:
+            self._by_email[_norm(user.email)] = user.id
+        if user.name:
+            self._by_name[_norm(user.name)] = user.id
+        if user.display_name:
+            ids = self._by_display_name.setdefault(
+                _norm(user.display_name), set()
+            )
+            ids.add(user.id)
+
+    def _unindex(self, user: User) -> None:
+        self._by_id.pop(user.id, None)
+        if self._by_email.get(_norm(user.email)) == user.id:
+            del self._by_email[_norm(user.email)]
+        if self._by_name.get(_norm(user.name)) == user.id:
+            del self._by_name[_norm(user.name)]
+        ids = self._by_display_name.get(_norm(user.display_name))
+        if ids is not None:
+            ids.discard(user.id)
+            if not ids:
+                del self._by_display_name[_norm(user.display_name)]
+
+    def update(self, user: dict) -> User:
+        """add or replace one user, given a user object from Slack"""
+        record = make_user(user)
+        with self._lock:
+            old = self._by_id.get(record.id)
+            if old is not None:
+                self._unindex(old)
+            if self.include_deleted or not record.deleted:
+                self._index(record)
+        return record
+
+    def remove(self, user_id: str) -> None:
+        with self._lock:
+            user = self._by_id.get(user_id)
+            if user is not None:
+                self._unindex(user)
+
+    def load(self, **kwargs) -> "UserDirectory":
+        """
+        stream users.list into the directory, then drop the users that
+        weren't listed; kwargs are passed to users.list
+        """
+        seen = set()
+        users = paginate(self._client.users.list, prefetch=1, **kwargs)
+        for user in users:
+            seen.add(user["id"])
+            old = self._by_id.get(user["id"])
+            if old is not None and old.updated == user.get("updated"):
+                continue
+            self.update(user)
+        with self._lock:
+            for user_id in set(self._by_id) - seen:
+                self._unindex(self._by_id[user_id])
+            self.loaded = True
+        return self
+
+    refresh = load
+
+    def _ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load()
+
+    def get(self, user_id: str) -> User:
+        self._ensure_loaded()
+        return self._by_id.get(user_id)
+
+    def by_email(self, email: str) -> User:
+        self._ensure_loaded()
+        return self._by_id.get(self._by_email.get(_norm(email)))
+
+    def by_name(self, name: str) -> User:
+        """find a user by username, with or without the @"""
+        self._ensure_loaded()
+        return self._by_id.get(self._by_name.get(_norm(name)))
+
+    def by_display_name(self, display_name: str) -> List[User]:
+        """find users by display name, which aren't unique"""
+        self._ensure_loaded()
+        ids = self._by_display_name.get(_norm(display_name), ())
+        return [self._by_id[user_id] for user_id in sorted(ids)]
+
+    def find(self, query: str) -> User:
+        """
+        find a user by ID, email, username or (unique) display name
+        e.g. "U012AB3CD", "spengler@example.com", "@spengler"
+        """
+        user = self.get(query) or self.by_email(query) or self.by_name(query)
+        if user is None:
+            users = self.by_display_name(query)
+            user = users[0] if len(users) == 1 else None
+        return user
+
+
+Channel = namedtuple(
+    "Channel",
+    ["id", "name", "previous_names", "user", "is_private", "is_archived"],
+)
+
+CHANNEL_TYPES = "public_channel,private_channel,mpim,im"
+
+# user IDs too, which chat.postMessage takes as a channel for their DM
+# IDs always have a digit, unlike names in capitals such as GENERAL
+CHANNEL_ID_PATTERN = re.compile(r"^[CGDUW](?=[A-Z]*[0-9])[A-Z0-9]{6,}$")
+
+
+def is_channel_id(value: str) -> bool:
+    """
+    does `value` look like a conversation or user ID e.g. C1234567890 or
+    U0123456789
+    """
+    return bool(CHANNEL_ID_PATTERN.match(value))
+
+
+def make_channel(channel: dict) -> Channel:
+    """compact record of a conversation object from conversations.list"""
+    return Channel(
+        id=channel["id"],
+        name=channel.get("name"),
+        previous_names=tuple(channel.get("previous_names") or ()),
+        user=channel.get("user"),
+        is_private=channel.get("is_private", False),
+        is_archived=channel.get("is_archived", False),
+    )
+
+
+def normalize_channel_name(name: str) -> str:
+    """e.g. " #General " -> "general" """
+    return name.strip().lstrip("#").lower() if name else name
+
+
+class ChannelDirectory:
+    """
+    In memory index of channel names to IDs, streamed from
+    conversations.list.
+
+    Channels are found by name (with or without the #, in any case) or by
+    a name they had before a rename, and direct messages by the user they
+    are with. A name that isn't found triggers a reload, at most once every
+    `min_reload_interval` seconds, to pick up new channels.
+
+    Pass `resolve_channels=True` to `SlackTime` to have every method's
+    `channel` argument resolved through a directory.
+
+    :param client: client to call conversations.list with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param types: conversation types to index
+    :type str: e.g. "public_channel,private_channel"
+
+    :param min_reload_interval: min seconds between reloads on a miss
+    :type float: e.g. 60
+    """
+
+    def __init__(
+        self,
+        client,
+        types: str = CHANNEL_TYPES,
+        min_reload_interval: float = 60,
+        clock=time.monotonic,
+    ):
+        self._client = client
+        self.types = types
+        self.min_reload_interval = min_reload_interval
+        self.loaded_at = None
+        self._clock = clock
+        self._by_id = {}
+        self._by_name = {}
+        self._by_previous_name = {}
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._by_id
+
+    def __iter__(self) -> Iterator[Channel]:
+        return iter(list(self._by_id.values()))
+
+    def update(self, channel: dict) -> Channel:
+        """
+        add or replace one channel, given a conversation object from Slack
+        e.g. from a `channel_created` or `channel_rename` event
+        """
+        record = make_channel(channel)
+        with self._lock:
+            old = self._by_id.get(record.id)
+            if old is not None and old.name:
+                name = normalize_channel_name(old.name)
+                if self._by_name.get(name) == old.id:
+                    del self._by_name[name]
+                self._by_previous_name[name] = old.id
+            self._by_id[record.id] = record
+            if record.name:
+                self._by_name[normalize_channel_name(record.name)] = record.id
+            for name in record.previous_names:
+                name = normalize_channel_name(name)
+                self._by_previous_name.setdefault(name, record.id)
+            if record.user:
+                self._by_user[record.user] = record.id
+        return record
+
+    def load(self, **kwargs) -> "ChannelDirectory":
+        """
+        stream conversations.list into the directory, kwargs are passed to
+        conversations.list
+        """
+        with self._load_lock:
+            self._load(**kwargs)
+        return self
+
+    def _load(self, **kwargs) -> None:
+        kwargs.setdefault("types", self.types)
+        channels = paginate(
+            self._client.conversations.list, prefetch=1, **kwargs
+        )
+        for channel in channels:
+            self.update(channel)
+        self.loaded_at = self._clock()
+
+    refresh = load
+
+    def _lookup(self, name: str) -> str:
+        name = normalize_channel_name(name)
+        return self._by_name.get(name) or self._by_previous_name.get(name)
+
+    def get(self, channel_id: str) -> Channel:
+        return self._by_id.get(channel_id)
+
+    def im_for(self, user_id: str) -> str:
+        """ID of the direct message with a user, if it's been opened"""
+        return self._by_user.get(user_id)
+
+    def resolve(self, channel: str) -> str:
+        """
+        ID for a channel name, e.g. "#general" -> "C012AB3CD", or
+        `channel` itself if it is already an ID or can't be found
+        """
+        if not channel or is_channel_id(channel):
+            return channel
+
+        channel_id = self._lookup(channel)
+        if channel_id is None and self._can_reload():
+            with self._load_lock:
+                # another thread may have reloaded while this one waited
+                channel_id = self._lookup(channel)
+                if channel_id is None and self._can_reload():
+                    self._load()
+                    channel_id = self._lookup(channel)
+        return channel_id or channel
+
+    def _can_reload(self) -> bool:
+        if self.loaded_at is None:
+            return True
+        elapsed = self._clock() - self.loaded_at
+        return elapsed >= self.min_reload_interval
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Exceptions raised for errors returned by Slack.
+
+Every error code gets one SlackError subclass, named after the code in
+CamelCase, that is made once and then reused, so specific errors can be
+caught:
+
+  >>> from slack_time.errors import ChannelNotFound
+  >>> try:
+  ...     client.chat.post_message("#nope", "hello?")
+  ... except ChannelNotFound:
+  ...     pass
+"""
+import re
+
+__all__ = ["SlackError", "error_class", "class_name"]
+
+
+class SlackError(Exception):
+    """
+    Base class for errors returned by Slack
+
+    :param response: the response with the error, if there is one
+    :type SlackResponse: e.g. <Response [200]>
+    """
+
+    code = None
+
+    def __init__(self, *args, response=None):
+        super().__init__(*args)
+        self.response = response
+
+
+# errors common to many methods, see https://api.slack.com/methods
+KNOWN_ERRORS = (
+    "access_denied",
+    "account_inactive",
+    "already_archived",
+    "already_in_channel",
+    "already_reacted",
+    "cant_delete_message",
+    "cant_invite_self",
+    "cant_update_message",
+    "channel_not_found",
+    "deprecated_endpoint",
+    "edit_window_closed",
+    "ekm_access_denied",
+    "fatal_error",
+    "file_deleted",
+    "file_not_found",
+    "internal_error",
+    "invalid_arg_name",
+    "invalid_arguments",
+    "invalid_array_arg",
+    "invalid_auth",
+    "invalid_blocks",
+    "invalid_charset",
+    "invalid_cursor",
+    "invalid_form_data",
+    "invalid_limit",
+    "invalid_name",
+    "invalid_post_type",
+    "invalid_ts_latest",
+    "invalid_ts_oldest",
+    "is_archived",
+    "message_not_found",
+    "method_deprecated",
+    "missing_post_type",
+    "missing_scope",
+    "msg_too_long",
+    "name_taken",
+    "no_permission",
+    "no_reaction",
+    "no_text",
+    "not_allowed_token_type",
+    "not_archived",
+    "not_authed",
+    "not_authorized",
+    "not_in_channel",
+    "plan_upgrade_required",
+    "ratelimited",
+    "request_timeout",
+    "restricted_action",
+    "service_unavailable",
+    "team_added_to_org",
+    "thread_not_found",
+    "token_revoked",
+    "too_many_emoji",
+    "too_many_reactions",
+    "two_factor_setup_required",
+    "user_is_restricted",
+    "user_not_found",
+    "users_not_found",
+)
+
+_REGISTRY = {}
+
+
+def class_name(code: str) -> str:
+    """
+    name of the exception for an error code e.g. channel_not_found ->
+    ChannelNotFound
+    """
+    name = "".join(part.capitalize() for part in re.split(r"\W|_", code))
+    if not name or not name[0].isalpha():
+        name = "Error" + name
+    return name
+
+
+def error_class(code: str) -> type:
+    """
+    get the SlackError subclass for an error code, making it on first use
+    """
+    try:
+        return _REGISTRY[code]
+    except KeyError:
+        pass
+    name = class_name(code)
+    cls = type(name, (SlackError,), {"code": code, "__module__": __name__})
+    cls = _REGISTRY.setdefault(code, cls)
+    globals().setdefault(name, cls)
+    return cls
+
+
+for _code in KNOWN_ERRORS:
+    __all__.append(class_name(_code))
+    error_class(_code)
+del _code
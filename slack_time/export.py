@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Resumable exports of channel history to compressed JSON lines.
+
+Each channel is written to `<dest>/<channel>.jsonl.gz`, one message per
+line, walking conversations.history newest first and following each
+thread with conversations.replies right after its parent. Records are
+written as they arrive, and after every page the gzip member is finished
+and a checkpoint saved to `<dest>/<channel>.checkpoint.json`, so an
+interrupted export truncates back to its last checkpoint and carries on
+from there. Once a channel is complete the next export only fetches the
+messages posted since, plus the replies posted since to earlier messages:
+it reads back the last `thread_max_age` of history to find the threads
+with new replies, including those started below a message it exported
+without any, and checks older threads it has exported one by one while
+their last reply is less than `thread_max_age` old.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> exporter = Exporter(client, "archive/")
+  >>> for result in exporter.export(["C1234567890", "C0987654321"]):
+  ...     print(result.call[1]["channel"], result.response)
+"""
+import gzip
+import json
+import logging
+import os
+import time
+from os import PathLike
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import Union
+
+from slack_time.bulk import iter_bulk
+from slack_time.pagination import iter_pages
+from slack_time.pagination import paginate
+from slack_time.utils import ts_key
+
+__all__ = ["Exporter"]
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TYPES = "public_channel,private_channel"
+
+# threads quiet for longer than this aren't checked for new replies
+THREAD_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def is_thread_parent(message: dict) -> bool:
+    """does `message` start a thread that has replies"""
+    if not message.get("reply_count"):
+        return False
+    return message.get("thread_ts") == message.get("ts")
+
+
+class Exporter:
+    """
+    Exports channels to `dest`, `workers` channels at a time.
+
+    The channels share the client, and so its rate limiter and retry
+    policy: with more workers than the rate limit allows they wait their
+    turn rather than getting `ratelimited`.
+
+    :param client: client to fetch the history with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param dest: directory to write the exports and checkpoints to
+    :type str: e.g. "archive/"
+
+    :param workers: number of channels exported at once
+    :type int: e.g. 4
+
+    :param threads: also export the replies to each thread
+    :type bool: e.g. True
+
+    :param thread_max_age: seconds of history read back on each run to
+      find new replies to earlier messages, and since its last reply
+      after which an older thread is no longer checked, None to read back
+      the whole history every run
+    :type float: e.g. 30 * 24 * 60 * 60
+    """
+
+    def __init__(
+        self,
+        client,
+        dest: Union[str, PathLike],
+        workers: int = 4,
+        threads: bool = True,
+        thread_max_age: float = THREAD_MAX_AGE,
+    ):
+        self._client = client
+        self.dest = os.fspath(dest)
+        self.workers = workers
+        self.threads = threads
+        self.thread_max_age = thread_max_age
+        codec = getattr(client, "_codec", None)
+        self._dumps = codec.dumps if codec is not None else json.dumps
+
+    def path(self, channel: str) -> str:
+        return os.path.join(self.dest, f"{channel}.jsonl.gz")
+
+    def checkpoint_path(self, channel: str) -> str:
+        return os.path.join(self.dest, f"{channel}.checkpoint.json")
+
+    def load_checkpoint(self, channel: str) -> dict:
+        """the saved progress of `channel`, or {} if it hasn't started"""
+        try:
+            with open(self.checkpoint_path(channel)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_checkpoint(self, channel: str, checkpoint: dict) -> None:
+        path = self.checkpoint_path(channel)
+        with open(path + ".tmp", "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(path + ".tmp", path)
+
+    def channels(self, types: str = EXPORT_TYPES) -> Iterator[str]:
+        """the IDs of every conversation of `types` the token can see"""
+        conversations = paginate(
+            self._client.conversations.list,
+            key="channels",
+            types=types,
+            prefetch=1,
+        )
+        for conversation in conversations:
+            yield conversation["id"]
+
+    def _replies(self, channel: str, ts: str, **kwargs) -> Iterator[dict]:
+        replies = paginate(
+            self._client.conversations.replies,
+            channel,
+            ts,
+            key="messages",
+            **kwargs,
+        )
+        for reply in replies:
+            # every page starts with the parent again
+            if reply.get("ts") != ts:
+                yield reply
+
+    def _is_recent(self, ts: str) -> bool:
+        if self.thread_max_age is None:
+            return True
+        return time.time() - float(ts) <= self.thread_max_age
+
+    def _stale_threads(
+        self, channel: str, newest: str, threads: dict
+    ) -> list:
+        """
+        the parents up to `newest` with replies the export doesn't have
+        yet, oldest first, adding the threads started since their parent
+        was exported to `threads`
+        """
+        since = None
+        if self.thread_max_age is not None:
+            since = time.time() - self.thread_max_age
+        # the history read back doesn't reach these, so each is checked
+        stale = {p for p in threads if since is not None and float(p) < since}
+        if since is None or since <= float(newest):
+            messages = paginate(
+                self._client.conversations.history,
+                channel,
+                key="messages",
+                oldest=None if since is None else f"{since:.6f}",
+                latest=newest,
+                inclusive=True,
+                prefetch=1,
+            )
+            for message in messages:
+                if not is_thread_parent(message):
+                    continue
+                parent = message["ts"]
+                known = threads.setdefault(parent, parent)
+                latest_reply = message.get("latest_reply") or parent
+                if ts_key(latest_reply) > ts_key(known):
+                    stale.add(parent)
+        return sorted(stale, key=ts_key)
+
+    def export_channel(self, channel: str) -> int:
+        """
+        export `channel`, carrying on from its checkpoint, and return the
+        number of messages written
+        """
+        os.makedirs(self.dest, exist_ok=True)
+        checkpoint = self.load_checkpoint(channel)
+        if checkpoint.get("complete"):
+            # a new run, for what was posted since the last one, and the
+            # replies since to the messages already exported
+            newest = checkpoint.get("newest")
+            threads = {
+                parent: latest
+                for parent, latest in checkpoint.get("threads", {}).items()
+                if self._is_recent(latest)
+            }
+            refresh = []
+            if self.threads and newest is not None:
+                refresh = self._stale_threads(channel, newest, threads)
+            checkpoint = {
+                "oldest": newest,
+                "offset": checkpoint["offset"],
+                "threads": threads,
+                "refresh": refresh,
+            }
+        checkpoint.setdefault("offset", 0)
+        checkpoint.setdefault("threads", {})
+        checkpoint["complete"] = False
+
+        written = 0
+        with open(self.path(channel), "ab") as raw:
+            # drop anything written after the last checkpoint
+            raw.truncate(checkpoint["offset"])
+            raw.seek(checkpoint["offset"])
+            if not checkpoint.get("history_done"):
+                written += self._export_history(raw, channel, checkpoint)
+                checkpoint["history_done"] = True
+                self._save(raw, channel, checkpoint)
+            if self.threads:
+                written += self._refresh_threads(raw, channel, checkpoint)
+
+        self.save_checkpoint(
+            channel,
+            {
+                "complete": True,
+                "newest": checkpoint.get("newest") or checkpoint.get("oldest"),
+                "offset": checkpoint["offset"],
+                "threads": checkpoint["threads"],
+            },
+        )
+        logger.info("exported %s messages from %s", written, channel)
+        return written
+
+    def _save(self, raw: IO, channel: str, checkpoint: dict) -> None:
+        raw.flush()
+        checkpoint["offset"] = raw.tell()
+        self.save_checkpoint(channel, checkpoint)
+
+    def _export_history(self, raw: IO, channel: str, checkpoint: dict) -> int:
+        written = 0
+        pages = iter_pages(
+            self._client.conversations.history,
+            channel,
+            oldest=checkpoint.get("oldest"),
+            latest=checkpoint.get("latest"),
+            prefetch=1,
+        )
+        for resp in pages:
+            messages = resp.body.get("messages") or []
+            if not messages:
+                continue
+            with gzip.GzipFile(fileobj=raw, mode="wb") as out:
+                for message in messages:
+                    written += self._write(out, channel, message, checkpoint)
+            # pages run newest first
+            checkpoint.setdefault("newest", messages[0]["ts"])
+            checkpoint["latest"] = messages[-1]["ts"]
+            self._save(raw, channel, checkpoint)
+        return written
+
+    def _write(
+        self, out: gzip.GzipFile, channel: str, message: dict, checkpoint: dict
+    ) -> int:
+        out.write(self._dumps(message).encode() + b"\n")
+        written = 1
+        if self.threads and is_thread_parent(message):
+            latest = message["ts"]
+            for reply in self._replies(channel, message["ts"]):
+                out.write(self._dumps(reply).encode() + b"\n")
+                latest = max(latest, reply["ts"], key=ts_key)
+                written += 1
+            checkpoint["threads"][message["ts"]] = latest
+        return written
+
+    def _refresh_threads(self, raw: IO, channel: str, checkpoint: dict) -> int:
+        """
+        write the replies posted since the last run to threads whose
+        parent was exported by an earlier one
+        """
+        written = 0
+        refresh = checkpoint.get("refresh") or []
+        while refresh:
+            parent = refresh[0]
+            latest = checkpoint["threads"][parent]
+            out = None
+            try:
+                for reply in self._replies(channel, parent, oldest=latest):
+                    if ts_key(reply["ts"]) <= ts_key(latest):
+                        continue
+                    if out is None:
+                        out = gzip.GzipFile(fileobj=raw, mode="wb")
+                    out.write(self._dumps(reply).encode() + b"\n")
+                    checkpoint["threads"][parent] = max(
+                        checkpoint["threads"][parent], reply["ts"], key=ts_key
+                    )
+                    written += 1
+            finally:
+                if out is not None:
+                    out.close()
+            refresh.pop(0)
+            self._save(raw, channel, checkpoint)
+        return written
+
+    def export(self, channels: Iterable[str] = None) -> Iterator:
+        """
+        export `channels`, or every channel the token can see, `workers` at
+        a time, yielding a BulkResult for each in order with the number of
+        messages written or the exception it raised
+        """
+        if channels is None:
+            channels = self.channels()
+        calls = (
+            (self.export_channel, {"channel": channel})
+            for channel in channels
+        )
+        return iter_bulk(calls, workers=self.workers)
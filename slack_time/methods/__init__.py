@@ -1,29 +1,11 @@
 # -*- coding: utf-8 -*-
-from .admin import Admin
-from .api import Api
-from .apps import Apps
-from .auth import Auth
-from .bots import Bots
-from .calls import Calls
-from .chat import Chat
-from .conversations import Conversations
-from .dialog import Dialog
-from .dnd import Dnd
-from .emoji import Emoji
-from .files import Files
-from .migration import Migration
-from .oauth import OAuth
-from .pins import Pins
-from .reactions import Reactions
-from .reminders import Reminders
-from .rtm import Rtm
-from .search import Search
-from .stars import Stars
-from .team import Team
-from .usergroups import Usergroups
-from .users import Users
-from .views import Views
-from .workflows import Workflows
+"""
+The method namespaces are imported on first access (e.g.
+`slack_time.methods.Admin`) rather than with the package, as some of them
+are big and most programs only use a few.
+"""
+import sys
+from importlib import import_module
 
 __all__ = [
     "Admin",
@@ -52,3 +34,45 @@ __all__ = [
     "Views",
     "Workflows",
 ]
+
+_MODULES = {name: name.lower() for name in __all__}
+
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) is 3.7+, so fall back to eager imports
+    from .admin import Admin
+    from .api import Api
+    from .apps import Apps
+    from .auth import Auth
+    from .bots import Bots
+    from .calls import Calls
+    from .chat import Chat
+    from .conversations import Conversations
+    from .dialog import Dialog
+    from .dnd import Dnd
+    from .emoji import Emoji
+    from .files import Files
+    from .migration import Migration
+    from .oauth import OAuth
+    from .pins import Pins
+    from .reactions import Reactions
+    from .reminders import Reminders
+    from .rtm import Rtm
+    from .search import Search
+    from .stars import Stars
+    from .team import Team
+    from .usergroups import Usergroups
+    from .users import Users
+    from .views import Views
+    from .workflows import Workflows
+
+
+def __getattr__(name: str):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -354,7 +354,7 @@ class Permissions(SlackAPI):
         return Resources(**self.params)
 
     @cached_property
-    def scopes(self):
+    def scopes(self) -> Scopes:
         return Scopes(**self.params)
 
     @cached_property
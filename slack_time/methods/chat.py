@@ -326,7 +326,7 @@ class Chat(SlackAPI):
         }
         """
         if attachments is not None:
-            attachments = make_json_encoded(attachments)
+            attachments = make_json_encoded(attachments, self._codec)
 
         payload = {
             "token": self._token,
@@ -340,7 +340,7 @@ class Chat(SlackAPI):
             payload["as_user"] = as_user
 
         if blocks is not None:
-            payload["blocks"] = make_json_encoded(blocks)
+            payload["blocks"] = make_json_encoded(blocks, self._codec)
 
         if icon_emoji is not None:
             payload["icon_emoji"] = icon_emoji
@@ -469,10 +469,12 @@ class Chat(SlackAPI):
             payload["as_user"] = as_user
 
         if attachments is not None:
-            payload["attachments"] = make_json_encoded(attachments)
+            payload["attachments"] = make_json_encoded(
+                attachments, self._codec
+            )
 
         if blocks is not None:
-            payload["blocks"] = make_json_encoded(blocks)
+            payload["blocks"] = make_json_encoded(blocks, self._codec)
 
         if icon_emoji is not None:
             payload["icon_emoji"] = icon_emoji
@@ -606,10 +608,12 @@ class Chat(SlackAPI):
             payload["as_user"] = as_user
 
         if attachments is not None:
-            payload["attachments"] = make_json_encoded(attachments)
+            payload["attachments"] = make_json_encoded(
+                attachments, self._codec
+            )
 
         if blocks is not None:
-            payload["blocks"] = make_json_encoded(blocks)
+            payload["blocks"] = make_json_encoded(blocks, self._codec)
 
         if link_names is not None:
             payload["link_names"] = link_names
@@ -679,7 +683,7 @@ class Chat(SlackAPI):
         }
         """
         if unfurls is not None:
-            unfurls = make_json_encoded(unfurls)
+            unfurls = make_json_encoded(unfurls, self._codec)
 
         payload = {
             "token": self._token,
@@ -768,10 +772,12 @@ class Chat(SlackAPI):
             payload["as_user"] = as_user
 
         if attachments is not None:
-            payload["attachments"] = make_json_encoded(attachments)
+            payload["attachments"] = make_json_encoded(
+                attachments, self._codec
+            )
 
         if blocks is not None:
-            payload["blocks"] = make_json_encoded(blocks)
+            payload["blocks"] = make_json_encoded(blocks, self._codec)
 
         if link_names is not None:
             payload["link_names"] = link_names
@@ -1,14 +1,23 @@
 # -*- coding: utf-8 -*-
+import os
 from collections.abc import Iterable
 from os import PathLike
+from typing import Callable
 from typing import IO
+from typing import List
 from typing import Union
 
 from requests import Response
 from slack_time import SlackAPI
+from slack_time.bulk import bulk
+from slack_time.bulk import BulkResult
+from slack_time.download import destination
+from slack_time.download import download_file
 from slack_time.utils import cached_property
 from slack_time.utils import comma_separated_string
 from slack_time.utils import make_file
+from slack_time.utils import make_text
+from slack_time.utils import sync_only
 
 
 class Comments(SlackAPI):
@@ -135,15 +144,20 @@ class Remote(SlackAPI):
         if filetype is not None:
             payload["filetype"] = filetype
 
+        files = {}
+
         if indexable_file_contents is not None:
             file_to_upload = make_file(indexable_file_contents)
-            payload["indexable_file_contents"] = file_to_upload
+            files["indexable_file_contents"] = file_to_upload
 
         if preview_image is not None:
-            file_to_upload = make_file(indexable_file_contents)
-            kwargs["files"] = {"file": file_to_upload}
+            file_to_upload = make_file(preview_image)
+            files["preview_image"] = file_to_upload
+
+        if files:
+            kwargs["files"] = files
 
-        return self._get("files.remote.add", payload=payload, **kwargs)
+        return self._post("files.remote.add", payload=payload, **kwargs)
 
     def info(
         self, external_id: int = None, file: str = None, **kwargs
@@ -381,18 +395,23 @@ class Remote(SlackAPI):
         if filetype is not None:
             payload["filetype"] = filetype
 
+        files = {}
+
         if indexable_file_contents is not None:
-            file_to_upload = make_file(file)
-            payload["indexable_file_contents"] = file_to_upload
+            file_to_upload = make_file(indexable_file_contents)
+            files["indexable_file_contents"] = file_to_upload
 
         if preview_image is not None:
-            file_to_upload = make_file(file)
-            kwargs["files"] = {"file": file_to_upload}
+            file_to_upload = make_file(preview_image)
+            files["preview_image"] = file_to_upload
+
+        if files:
+            kwargs["files"] = files
 
         if title is not None:
             payload["title"] = title
 
-        return self._get("files.remote.update", payload=payload, **kwargs)
+        return self._post("files.remote.update", payload=payload, **kwargs)
 
 
 class Files(SlackAPI):
@@ -428,6 +447,109 @@ class Files(SlackAPI):
 
         return self._post("files.delete", payload=payload, **kwargs)
 
+    @sync_only
+    def download(
+        self,
+        file: Union[str, dict],
+        dest: Union[str, PathLike] = None,
+        resume: bool = True,
+        progress: Callable = None,
+        unique: bool = False,
+        **kwargs
+    ) -> str:
+        """
+        Downloads a private file to disk, streaming it in chunks through
+        the client's session.
+
+        An interrupted download is resumed from where it stopped with an
+        HTTP range, and the file is checked against its `size` before it's
+        moved into place.
+
+        :param file: A file ID, or a file object from files.info or files.list.
+        :type Union[str, dict]: e.g. F0TD00400
+
+        :param dest: Where to save the file, a path or a directory to save it in under its name. Defaults to the current directory.
+        :type Union[str, PathLike]: e.g. 'downloads/'
+
+        :param resume: Continue a download left unfinished, and retry interruptions from where they stopped.
+        :type bool: e.g. True
+
+        :param progress: Called after each chunk with the bytes written and the file's size.
+        :type Callable[[int, int], None]: e.g. lambda written, size: print(written, size)
+
+        :param unique: Save it under the directory as "<id>-<name>", so files with the same name don't overwrite each other.
+        :type bool: e.g. True
+
+        :returns path: Path the file was saved to.
+        :type str: e.g. downloads/dramacat.gif
+
+        example:
+        >>> client = SlackTime(token='insert-your-token-here')
+        >>> client.files.download("F0TD00400", "downloads/")
+        'downloads/dramacat.gif'
+        """
+
+        if isinstance(file, str):
+            file = self.info(file).body["file"]
+
+        url = file.get("url_private_download") or file["url_private"]
+        kwargs.setdefault("timeout", self._timeout)
+        kwargs.setdefault("proxies", self._proxies)
+        name = file.get("name") or file["id"]
+        if unique and name != file["id"]:
+            name = f"{file['id']}-{os.path.basename(name)}"
+
+        return download_file(
+            url,
+            destination(dest, name),
+            token=self._token,
+            size=file.get("size"),
+            session=self._session,
+            resume=resume,
+            retry_policy=self._retry_policy,
+            progress=progress,
+            **kwargs,
+        )
+
+    @sync_only
+    def download_many(
+        self,
+        files: Iterable,
+        dest: Union[str, PathLike] = None,
+        workers: int = 4,
+        **kwargs
+    ) -> List[BulkResult]:
+        """
+        Downloads many files concurrently into a directory.
+
+        Each file is saved as "<id>-<name>", as names aren't unique: two
+        files called image.png would otherwise be written to the same path.
+
+        :param files: File IDs or file objects from files.info or files.list.
+        :type Iterable[Union[str, dict]]: e.g. ["F0TD00400", "F0TD00401"]
+
+        :param dest: Directory to save the files in. Defaults to the current directory.
+        :type Union[str, PathLike]: e.g. 'archive/'
+
+        :param workers: Number of files to download at once.
+        :type int: e.g. 4
+
+        :returns results: The saved path, or the exception raised, for each file in order.
+        :type List[BulkResult]: e.g. [BulkResult(call=..., response='archive/F0TD00400-dramacat.gif', error=None)]
+
+        example:
+        >>> client = SlackTime(token='insert-your-token-here')
+        >>> files = client.paginate(client.files.list, channel="C1234567890")
+        >>> client.files.download_many(files, "archive/")
+        """
+
+        dest = os.path.join(os.fspath(dest or "."), "")
+        calls = (
+            (self.download, dict(kwargs, file=file, dest=dest, unique=True))
+            for file in files
+        )
+        return bulk(calls, workers=workers)
+
     def info(
         self,
         file: str,
@@ -781,13 +903,14 @@ class Files(SlackAPI):
     def upload(
         self,
         channels: Union[str, Iterable] = None,
-        content: Union[str, PathLike, IO] = None,
-        file: Union[str, PathLike, IO] = None,
+        content: Union[str, PathLike, IO, bytes] = None,
+        file: Union[str, PathLike, IO, bytes, memoryview] = None,
         filename: str = None,
         filetype: str = None,
         initial_comment: str = None,
         thread_ts: float = None,
         title: str = None,
+        progress: Callable = None,
         **kwargs
     ) -> Response:
         """
@@ -800,11 +923,11 @@ class Files(SlackAPI):
         :param channels: Comma-separated list of channel names or IDs where the file will be shared.
         :type Union[str, Iterable]: e.g. C1234567890,C2345678901,C3456789012
 
-        :param content: File contents via a POST variable. If omitting this parameter, you must provide a file.
-        :type Union[str, PathLike, IO]: e.g. '/absolute/path/to/file' or actual IO file
+        :param content: File contents via a POST variable. If omitting this parameter, you must provide a file. A str is sent as the text itself, use a pathlib.Path or an open file to send a file's contents.
+        :type Union[str, PathLike, IO, bytes]: e.g. 'some text', pathlib.Path('/absolute/path/to/file') or actual IO file
 
         :param file: File contents via multipart/form-data. If omitting this parameter, you must submit content.
-        :type Union[str, PathLike, IO]: e.g. '/absolute/path/to/file' or actual IO file
+        :type Union[str, PathLike, IO, bytes, memoryview]: e.g. '/absolute/path/to/file' (opened and closed for you), actual IO file (left open) or bytes
 
         :param filename: Filename of file.
         :type str: e.g. foo.txt
@@ -821,6 +944,9 @@ class Files(SlackAPI):
         :param title: Title of file.
         :type str: e.g. My File
 
+        :param progress: Called as the file is streamed with the bytes sent, the total bytes and the bytes per second.
+        :type Callable[[int, int, float], None]: e.g. lambda sent, total, rate: print(sent, total)
+
         :returns response:
         :type requests.Response: e.g. <Response [200]>
 
@@ -896,8 +1022,7 @@ class Files(SlackAPI):
             payload["channels"] = comma_separated_string(channels)
 
         if content is not None:
-            file_to_upload = make_file(content)
-            payload["content"] = file_to_upload
+            payload["content"] = make_text(content)
 
         if file is not None:
             file_to_upload = make_file(file)
@@ -918,4 +1043,62 @@ class Files(SlackAPI):
         if title is not None:
             payload["title"] = title
 
+        if progress is not None:
+            kwargs["progress"] = progress
+
         return self._post("files.upload", payload=payload, **kwargs)
+
+    def upload_many(
+        self,
+        files: Iterable,
+        channels: Union[str, Iterable] = None,
+        thread_ts: float = None,
+        workers: int = 4,
+        **kwargs
+    ) -> List[BulkResult]:
+        """
+        Uploads many files concurrently.
+
+        The uploads share the client's connections and go through its rate
+        limiter, so they stay inside the files.upload tier however many
+        `workers` there are.
+
+        :param files: Files to upload, as anything files.upload takes for `file`, or dicts of files.upload arguments.
+        :type Iterable[Union[str, PathLike, IO, dict]]: e.g. ["build/app.apk", {"file": "build/notes.md", "title": "Notes"}]
+
+        :param channels: Comma-separated list of channel names or IDs where the files will be shared.
+        :type Union[str, Iterable]: e.g. C1234567890
+
+        :param thread_ts: Upload every file as a reply in this thread.
+        :type float: e.g. 1234567890.123456
+
+        :param workers: Number of files to upload at once.
+        :type int: e.g. 4
+
+        :returns results: The response, or the exception raised, for each file in order.
+        :type List[BulkResult]: e.g. [BulkResult(call=..., response=<Response [200]>, error=None)]
+
+        example:
+        >>> client = SlackTime(token='insert-your-token-here')
+        >>> response = client.chat.post_message("C1234567890", "build 42")
+        >>> client.files.upload_many(
+        ...     glob.glob("build/*"), "C1234567890", response.body["ts"]
+        ... )
+        """
+
+        if channels is not None:
+            kwargs["channels"] = channels
+
+        if thread_ts is not None:
+            kwargs["thread_ts"] = thread_ts
+
+        calls = (
+            (
+                self.upload,
+                dict(kwargs, **file)
+                if isinstance(file, dict)
+                else dict(kwargs, file=file),
+            )
+            for file in files
+        )
+        return self._bulk(calls, workers)
@@ -666,7 +666,7 @@ class Users(SlackAPI):
         crop_w: int = None,
         crop_x: int = None,
         crop_y: int = None,
-        image: Union[str, PathLike, IO] = None,
+        image: Union[str, PathLike, IO, bytes, memoryview] = None,
         **kwargs
     ) -> Response:
         """
@@ -686,7 +686,7 @@ class Users(SlackAPI):
         :type int: e.g. 15
 
         :param image: File contents via multipart/form-data.
-        :type Union[str, PathLike, IO]: e.g. '/absolute/path/to/file' or actual IO file"
+        :type Union[str, PathLike, IO, bytes, memoryview]: e.g. '/absolute/path/to/file' (opened and closed for you), actual IO file (left open) or bytes
 
         :returns response:
         :type requests.Response: e.g. <Response [200]>
@@ -710,7 +710,7 @@ class Users(SlackAPI):
 
         if image is not None:
             file_to_upload = make_file(image)
-            kwargs["files"] = {"file": file_to_upload}
+            kwargs["files"] = {"image": file_to_upload}
 
         return self._post("users.setPhoto", payload=payload, **kwargs)
 
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
+from typing import Union
+
 from requests import Response
 from slack_time import SlackAPI
+from slack_time.utils import make_json_encoded
 
 
 class Views(SlackAPI):
-    def open(self, trigger_id: str, view: str, **kwargs) -> Response:
+    def open(
+        self, trigger_id: str, view: Union[str, dict], **kwargs
+    ) -> Response:
         """
         Open a view for a user.
         https://api.slack.com/methods/views.open
@@ -16,7 +21,7 @@ class Views(SlackAPI):
         :type str: e.g. 12345.98765.abcd2358fdea
 
         :param view: A view payload. This must be a JSON-encoded string.
-        :type str:
+        :type Union[str, dict]: e.g. {"type": "modal", "blocks": []}
 
         :returns response:
         :type requests.Response: e.g. <Response [200]>
@@ -75,13 +80,17 @@ class Views(SlackAPI):
         payload = {
             "token": self._token,
             "trigger_id": trigger_id,
-            "view": view,
+            "view": make_json_encoded(view, self._codec),
         }
 
         return self._post("views.open", payload=payload, **kwargs)
 
     def publish(
-        self, user_id: str, view: str, hash: float = None, **kwargs
+        self,
+        user_id: str,
+        view: Union[str, dict],
+        hash: float = None,
+        **kwargs
     ) -> Response:
         """
         Publish a static view for a User.
@@ -94,7 +103,7 @@ class Views(SlackAPI):
         :type str: e.g. U0BPQUNTA
 
         :param view: A view payload. This must be a JSON-encoded string.
-        :type str:
+        :type Union[str, dict]: e.g. {"type": "modal", "blocks": []}
 
         :param hash: A string that represents view state to protect against possible race conditions.
         :type float: e.g. 156772938.1827394
@@ -143,14 +152,20 @@ class Views(SlackAPI):
         }
         """
 
-        payload = {"token": self._token, "user_id": user_id, "view": view}
+        payload = {
+            "token": self._token,
+            "user_id": user_id,
+            "view": make_json_encoded(view, self._codec),
+        }
 
         if hash is not None:
             payload["hash"] = hash
 
         return self._post("views.publish", payload=payload, **kwargs)
 
-    def push(self, trigger_id: str, view: str, **kwargs) -> Response:
+    def push(
+        self, trigger_id: str, view: Union[str, dict], **kwargs
+    ) -> Response:
         """
         Push a view onto the stack of a root view.
         https://api.slack.com/methods/views.push
@@ -162,7 +177,7 @@ class Views(SlackAPI):
         :type str: e.g. 12345.98765.abcd2358fdea
 
         :param view: A view payload. This must be a JSON-encoded string.
-        :type str:
+        :type Union[str, dict]: e.g. {"type": "modal", "blocks": []}
 
         :returns response:
         :type requests.Response: e.g. <Response [200]>
@@ -227,14 +242,14 @@ class Views(SlackAPI):
         payload = {
             "token": self._token,
             "trigger_id": trigger_id,
-            "view": view,
+            "view": make_json_encoded(view, self._codec),
         }
 
         return self._post("views.push", payload=payload, **kwargs)
 
     def update(
         self,
-        view: str,
+        view: Union[str, dict],
         external_id: str = None,
         hash: float = None,
         view_id: str = None,
@@ -248,7 +263,7 @@ class Views(SlackAPI):
         :type str: e.g. xxxx-xxxxxxxxx-xxxx
 
         :param view: A view object. This must be a JSON-encoded string.
-        :type str:
+        :type Union[str, dict]: e.g. {"type": "modal", "blocks": []}
 
         :param external_id: A unique identifier of the view set by the developer. Must be unique for all views on a team. Max length of 255 characters. Either view_id or external_id is required.
         :type str: e.g. bmarley_view2
@@ -320,7 +335,10 @@ class Views(SlackAPI):
         }
         """
 
-        payload = {"token": self._token, "view": view}
+        payload = {
+            "token": self._token,
+            "view": make_json_encoded(view, self._codec),
+        }
 
         if external_id is not None:
             payload["external_id"] = external_id
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+multipart/form-data bodies that are streamed from their files.
+
+requests builds a multipart body in memory, so uploading a 500MB file
+takes 500MB+ of memory. `MultipartStream` is a file like body that reads
+each file in chunks as the request is sent, so uploads run in constant
+memory, and can report progress as they go.
+
+use:
+  >>> def progress(sent, total, rate):
+  ...     print(f"{sent}/{total} bytes at {rate / 1e6:.1f}MB/s")
+  >>> client.files.upload("C123", file="logs.tar.gz", progress=progress)
+"""
+import io
+import mimetypes
+import os
+import time
+import uuid
+from typing import Callable
+from typing import Iterator
+
+__all__ = ["MultipartStream", "CHUNK_SIZE"]
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _filename(name: str, file) -> str:
+    """like requests, the file's base name or else the field name"""
+    path = getattr(file, "name", None)
+    if isinstance(path, str) and not path.startswith("<"):
+        return os.path.basename(path)
+    return name
+
+
+def _remaining(file) -> int:
+    """bytes left to read in `file`, or None if that can't be known"""
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        position = file.tell()
+        end = file.seek(0, io.SEEK_END)
+        file.seek(position)
+        return end - position
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+class MultipartStream:
+    """
+    A multipart/form-data body read from its files while it's sent.
+
+    Files can be given the way requests takes them: a file object, or a
+    tuple of (filename, file object[, content type]). Send it as the
+    request's `data` with its `content_type` as the Content-Type header.
+
+    :param fields: form fields, values are sent as text
+    :type dict: e.g. {"token": "xoxb-...", "channels": "C123"}
+
+    :param files: file fields
+    :type dict: e.g. {"file": open("logs.tar.gz", "rb")}
+
+    :param progress: called after each chunk with the bytes sent so far,
+      the total (None if unknown) and the average bytes per second
+    :type Callable[[int, int, float], None]: e.g. print
+
+    :param chunk_size: bytes to read from a file at a time when iterated
+    :type int: e.g. 65536
+    """
+
+    def __init__(
+        self,
+        fields: dict = None,
+        files: dict = None,
+        progress: Callable = None,
+        chunk_size: int = CHUNK_SIZE,
+        boundary: str = None,
+        clock=time.monotonic,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self._clock = clock
+        self._parts = []
+        self._starts = {}
+        for name, value in (fields or {}).items():
+            self._add_field(name, value)
+        for name, value in (files or {}).items():
+            self._add_file(name, value)
+        self._parts.append(memoryview(f"--{self.boundary}--\r\n".encode()))
+
+        self.total = self._total()
+        # read by requests for the Content-Length, 0 sends it chunked
+        self.len = self.total or 0
+        self.sent = 0
+        self._index = 0
+        self._offset = 0
+        self._started = None
+
+    def _add_field(self, name: str, value) -> None:
+        if value is None:
+            return
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for value in values:
+            if not isinstance(value, bytes):
+                value = str(value).encode()
+            header = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(name)}"'
+                "\r\n\r\n"
+            )
+            self._parts.append(memoryview(header.encode() + value + b"\r\n"))
+
+    def _add_file(self, name: str, value) -> None:
+        content_type = None
+        if isinstance(value, tuple):
+            filename, file, *rest = value
+            content_type = rest[0] if rest else None
+        else:
+            file = value
+            filename = _filename(name, file)
+        if isinstance(file, str):
+            file = file.encode()
+        if content_type is None:
+            guessed = mimetypes.guess_type(filename or "")[0]
+            content_type = guessed or "application/octet-stream"
+        header = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(name)}"; '
+            f'filename="{_quote(filename or name)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        self._parts.append(memoryview(header.encode()))
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            # sliced as it's sent rather than copied into a file object
+            file = memoryview(file).cast("B")
+        else:
+            try:
+                self._starts[id(file)] = file.tell()
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                pass
+        self._parts.append(file)
+        self._parts.append(memoryview(b"\r\n"))
+
+    def _total(self) -> int:
+        total = 0
+        for part in self._parts:
+            if isinstance(part, memoryview):
+                size = len(part)
+            else:
+                size = _remaining(part)
+            if size is None:
+                return None
+            total += size
+        return total
+
+    def __len__(self) -> int:
+        return self.len
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} sent={self.sent} "
+            f"total={self.total}>"
+        )
+
+    def _report(self, n: int) -> None:
+        if self._started is None:
+            self._started = self._clock()
+        self.sent += n
+        if self.progress is not None and n:
+            elapsed = self._clock() - self._started
+            rate = self.sent / elapsed if elapsed > 0 else 0.0
+            self.progress(self.sent, self.total, rate)
+
+    def read(self, size: int = -1) -> bytes:
+        """read up to `size` bytes of the body, all of it if size < 0"""
+        chunks = []
+        wanted = size
+        while self._index < len(self._parts) and wanted != 0:
+            part = self._parts[self._index]
+            if isinstance(part, memoryview):
+                offset = self._offset
+                end = len(part) if wanted < 0 else offset + wanted
+                chunk = part[offset:end]
+                self._offset = offset + len(chunk)
+                if self._offset >= len(part):
+                    self._index += 1
+                    self._offset = 0
+            else:
+                chunk = part.read(wanted if wanted > 0 else -1)
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                if not chunk:
+                    self._index += 1
+                    continue
+            chunks.append(chunk)
+            if wanted > 0:
+                wanted -= len(chunk)
+        data = b"".join(chunks)
+        self._report(len(data))
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """rewind the body to the start so it can be sent again"""
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("can only seek to the start")
+        for part in self._parts:
+            if id(part) in self._starts:
+                part.seek(self._starts[id(part)])
+        self._index = 0
+        self._offset = 0
+        self.sent = 0
+        self._started = None
+        return 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+A queue for outgoing messages, with one lane per channel.
+
+Slack allows about one message a second in each channel, so posting to
+many channels one call at a time either hits `ratelimited` or waits on
+the slowest channel. The `Outbox` keeps a FIFO lane per channel, paced on
+its own, and sends from the lanes in parallel over a pool of threads, so
+every channel gets its full rate while its messages stay in order.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> with Outbox(client) as outbox:
+  ...     for channel in on_call_channels:
+  ...         outbox.post_message(channel, "the build is broken")
+"""
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable
+
+from slack_time.pacing import Lane
+from slack_time.pacing import PacedLanes
+
+__all__ = ["Outbox"]
+
+
+class Outbox(PacedLanes):
+    """
+    Per channel lanes in front of chat.post_message and chat.post_ephemeral.
+
+    Each call returns a `Future` for its response. A lane sends one
+    message at a time, in the order they were queued, and no sooner than
+    `1 / rate` seconds after its previous one started; lanes for different
+    channels send in parallel over `workers` threads.
+
+    At most `maxsize` messages can be queued or in flight at once, after
+    which queueing blocks until there's room (or raises `queue.Full` if
+    `block` is False or `timeout` runs out).
+
+    :param client: client to send the messages with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param rate: max messages a second in each channel
+    :type float: e.g. 1
+
+    :param maxsize: max messages queued or in flight
+    :type int: e.g. 1000
+
+    :param workers: max messages sent at once across every channel
+    :type int: e.g. 8
+    """
+
+    def __init__(
+        self,
+        client,
+        rate: float = 1,
+        maxsize: int = 1000,
+        workers: int = 8,
+        clock=time.monotonic,
+    ):
+        self._client = client
+        self.maxsize = maxsize
+        super().__init__(rate, workers, clock)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} size={self._size} "
+            f"lanes={len(self._lanes)}>"
+        )
+
+    def _lane_key(self, channel: str) -> str:
+        # a channel's name and ID share a lane when they can be resolved
+        directory = getattr(self._client, "_channel_directory", None)
+        return directory.resolve(channel) if directory else channel
+
+    def _empty(self) -> deque:
+        return deque()
+
+    def _take(self, lane: Lane) -> tuple:
+        return lane.pending.popleft()
+
+    def submit(
+        self,
+        method: Callable,
+        channel: str,
+        block: bool = True,
+        timeout: float = None,
+        **kwargs
+    ) -> Future:
+        """
+        queue `method(channel=channel, **kwargs)` in the channel's lane
+
+        :param method: client method taking a `channel`
+        :type Callable: e.g. client.chat.post_message
+        """
+        future = Future()
+        key = self._lane_key(channel)
+        with self._cond:
+            has_room = self._cond.wait_for(
+                lambda: self._size < self.maxsize or self._closed,
+                timeout if block else 0,
+            )
+            if self._closed:
+                raise RuntimeError("the outbox is closed")
+            if not has_room:
+                raise queue.Full(f"{self._size} messages are already queued")
+            lane = self._lane(key)
+            lane.pending.append(
+                (future, partial(method, channel=channel, **kwargs))
+            )
+            self._added(lane)
+        return future
+
+    def post_message(
+        self, channel: str, text: str = None, **kwargs
+    ) -> Future:
+        """queue chat.post_message, see `submit` for `block` and `timeout`"""
+        return self.submit(
+            self._client.chat.post_message, channel, text=text, **kwargs
+        )
+
+    def post_ephemeral(
+        self, channel: str, user: str, text: str = None, **kwargs
+    ) -> Future:
+        """queue chat.post_ephemeral, see `submit` for `block` and `timeout`"""
+        kwargs.setdefault("attachments", None)
+        return self.submit(
+            self._client.chat.post_ephemeral,
+            channel,
+            user=user,
+            text=text,
+            **kwargs,
+        )
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        block until every queued message has been sent, returning False
+        if `timeout` ran out first
+        """
+        return self._wait_until_done(timeout)
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
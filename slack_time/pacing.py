@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Paced lanes of calls, the scheduler behind `Outbox` and `Updater`.
+
+Calls are queued in a lane per key, e.g. a channel. Each lane runs one call
+at a time, and starts each no sooner than `1 / rate` seconds after its
+previous one started. Different lanes run in parallel over a pool of
+threads. A lane is dropped once it's idle and its pacing has run out, so a
+long running queue doesn't grow with every key it has seen.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Hashable
+
+__all__ = ["PacedLanes"]
+
+
+class Lane:
+    __slots__ = ("key", "pending", "busy", "scheduled", "next_at")
+
+    def __init__(self, key: Hashable, pending):
+        self.key = key
+        self.pending = pending
+        self.busy = False
+        self.scheduled = False
+        self.next_at = 0.0
+
+
+class PacedLanes:
+    """
+    Base for queues that pace calls per key.
+
+    Subclasses keep the calls waiting in a lane in `lane.pending` (which
+    is falsy when there are none), call `_added` under `_cond` whenever
+    they add one, and implement `_empty` and `_take`.
+
+    :param rate: max calls a second in each lane
+    :type float: e.g. 1
+
+    :param workers: max calls running at once across every lane
+    :type int: e.g. 8
+    """
+
+    def __init__(
+        self, rate: float = 1, workers: int = 8, clock=time.monotonic
+    ):
+        self.interval = 1 / rate
+        self._clock = clock
+        self._lanes = {}
+        self._ready = []
+        self._order = itertools.count()
+        self._size = 0
+        self._flushing = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._thread = threading.Thread(target=self._schedule, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _empty(self):
+        """a new lane's `pending`"""
+        raise NotImplementedError
+
+    def _take(self, lane: Lane) -> tuple:
+        """remove the next call from `lane.pending` as (future, call)"""
+        raise NotImplementedError
+
+    def _lane(self, key: Hashable) -> Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = Lane(key, self._empty())
+        return lane
+
+    def _added(self, lane: Lane) -> None:
+        self._size += 1
+        if not lane.busy and not lane.scheduled:
+            self._push(lane)
+
+    def _push(self, lane: Lane) -> None:
+        now = self._clock()
+        at = now if self._flushing else max(lane.next_at, now)
+        lane.scheduled = True
+        heapq.heappush(self._ready, (at, next(self._order), lane))
+        self._cond.notify_all()
+
+    def _schedule(self) -> None:
+        with self._cond:
+            while True:
+                if self._closed and not self._size:
+                    return
+                if not self._ready:
+                    self._cond.wait()
+                    continue
+                at, _, lane = self._ready[0]
+                now = self._clock()
+                if at > now:
+                    self._cond.wait(at - now)
+                    continue
+                heapq.heappop(self._ready)
+                lane.scheduled = False
+                if not lane.pending:
+                    # idle and past its pacing, so nothing to remember
+                    del self._lanes[lane.key]
+                    continue
+                lane.busy = True
+                lane.next_at = now + self.interval
+                future, call = self._take(lane)
+                self._pool.submit(self._run, lane, future, call)
+
+    def _run(self, lane: Lane, future: Future, call: Callable) -> None:
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(call())
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            with self._cond:
+                lane.busy = False
+                self._size -= 1
+                # either its next call, or dropping it once it's idle
+                self._push(lane)
+                self._cond.notify_all()
+
+    def _expedite(self) -> None:
+        """make every waiting lane due now, call under `_cond`"""
+        now = self._clock()
+        self._ready = [(now, i, lane) for _, i, lane in self._ready]
+        heapq.heapify(self._ready)
+        self._cond.notify_all()
+
+    def _wait_until_done(self, timeout: float = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._size, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """stop taking calls, running the ones already queued"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join()
+            self._pool.shutdown(wait=True)
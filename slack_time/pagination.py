@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Iterators over paginated Slack methods.
+
+Most methods paginate with a cursor (`paginate`), while some older ones,
+such as search.messages or files.list, take a page number and a count
+(`paginate_numbered`).
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> for message in client.paginate(client.conversations.history, "C123"):
+  ...     print(message["text"])
+"""
+import inspect
+import queue
+import re
+import threading
+from functools import partial
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+from slack_time.bulk import iter_bulk
+
+__all__ = [
+    "iter_pages",
+    "paginate",
+    "page_items",
+    "method_name",
+    "prefetched",
+    "iter_numbered_pages",
+    "paginate_numbered",
+    "is_cursor_paginated",
+]
+
+# largest page each method accepts, methods not listed here accept 1000
+MAX_LIMITS = {
+    "admin.conversations.search": 20,
+    "admin.teams.list": 100,
+    "admin.users.list": 100,
+}
+DEFAULT_MAX_LIMIT = 1000
+
+# largest `count` for page number paginated methods, the rest use
+# Slack's default
+MAX_COUNTS = {
+    "search.all": 100,
+    "search.files": 100,
+    "search.messages": 100,
+    "team.accessLogs": 1000,
+}
+
+DOC_URL_PATTERN = re.compile(r"https://api\.slack\.com/methods/([\w.]+)")
+
+
+def method_name(method: Callable) -> str:
+    """
+    name of the Slack method a client method calls, read from its docstring
+    e.g. client.conversations.history -> conversations.history
+    """
+    match = DOC_URL_PATTERN.search(method.__doc__ or "")
+    if match is None:
+        raise ValueError(f"{method!r} isn't a Slack API method")
+    return match.group(1)
+
+
+def max_limit(method: Callable) -> int:
+    return MAX_LIMITS.get(method_name(method), DEFAULT_MAX_LIMIT)
+
+
+def next_cursor(body: dict) -> str:
+    metadata = body.get("response_metadata") or {}
+    return metadata.get("next_cursor") or body.get("next_cursor") or None
+
+
+def page_items(body: dict, key: str = None) -> list:
+    """
+    the items in a page, under `key` or else the first list in the body
+    e.g. "messages" for conversations.history or "members" for users.list
+    """
+    if key is not None:
+        return body.get(key) or []
+    for value in body.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+class _Raised:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_DONE = object()
+
+
+def prefetched(iterable: Iterable, depth: int = 1) -> Iterator:
+    """
+    iterate `iterable` in a background thread that keeps up to `depth`
+    items ready ahead of the consumer, so producing the next item (e.g.
+    fetching the next page) overlaps with consuming the current one
+
+    exceptions are re-raised in the consumer, and the thread stops once
+    the returned iterator is closed or garbage collected
+    """
+    ready = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Raised(e))
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = ready.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Raised):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+
+
+def _iter_pages(method: Callable, *args, limit: int = None, **kwargs):
+    if limit is None:
+        limit = max_limit(method)
+    cursor = kwargs.pop("cursor", None)
+    while True:
+        resp = method(*args, cursor=cursor, limit=limit, **kwargs)
+        yield resp
+        cursor = next_cursor(resp.body)
+        if not cursor:
+            return
+
+
+def iter_pages(
+    method: Callable, *args, limit: int = None, prefetch: int = 0, **kwargs
+) -> Iterator:
+    """
+    yield each response of a cursor paginated method, following
+    `response_metadata.next_cursor` until there are no more pages
+
+    :param method: client method that takes `cursor` and `limit`
+    :type Callable: e.g. client.conversations.history
+
+    :param limit: page size, the largest the method accepts by default
+    :type int: e.g. 200
+
+    :param prefetch: number of pages to fetch in the background ahead of
+      the one being consumed, 0 to fetch each page only when it's needed
+    :type int: e.g. 1
+    """
+    pages = _iter_pages(method, *args, limit=limit, **kwargs)
+    if prefetch:
+        return prefetched(pages, depth=prefetch)
+    return pages
+
+
+def paginate(
+    method: Callable,
+    *args,
+    key: str = None,
+    limit: int = None,
+    prefetch: int = 0,
+    **kwargs
+) -> Iterator:
+    """
+    lazily yield every item of a cursor paginated method, one page in
+    memory at a time (plus up to `prefetch` pages fetched ahead)
+
+    :param method: client method that takes `cursor` and `limit`
+    :type Callable: e.g. client.users.list
+
+    :param key: body key holding the items, found automatically by default
+    :type str: e.g. "members"
+
+    :param limit: page size, the largest the method accepts by default
+    :type int: e.g. 200
+
+    :param prefetch: number of pages to fetch in the background ahead of
+      the one being consumed
+    :type int: e.g. 1
+    """
+    pages = iter_pages(method, *args, limit=limit, prefetch=prefetch, **kwargs)
+    for resp in pages:
+        yield from page_items(resp.body, key)
+
+
+def is_cursor_paginated(method: Callable) -> bool:
+    """does `method` paginate with a cursor rather than a page number"""
+    return "cursor" in inspect.signature(method).parameters
+
+
+def paging(body: dict) -> dict:
+    """
+    the `paging` of a page number paginated response, which search
+    methods nest under "messages" and "files"
+    """
+    if "paging" in body:
+        return body["paging"]
+    nested = [
+        value["paging"]
+        for value in body.values()
+        if isinstance(value, dict) and "paging" in value
+    ]
+    return max(nested, key=lambda p: p.get("pages", 1), default={})
+
+
+def numbered_page_items(body: dict, key: str = None) -> list:
+    """
+    the items in a page number paginated response, under `key` (dotted
+    for nested keys e.g. "files.matches") or else the first list found
+    """
+    if key is not None:
+        value = body
+        for part in key.split("."):
+            value = value.get(part) or {}
+        return value or []
+    items = page_items(body)
+    if items:
+        return items
+    for value in body.values():
+        if isinstance(value, dict) and "matches" in value:
+            return value["matches"]
+    return []
+
+
+def iter_numbered_pages(
+    method: Callable, *args, count: int = None, workers: int = 4, **kwargs
+) -> Iterator:
+    """
+    yield each response of a page number paginated method in page order
+
+    the first page tells us how many pages there are, the rest are then
+    fetched concurrently over `workers` threads, with no more than
+    `workers` pages in flight or waiting to be consumed at once; each
+    request still goes through the client's rate limiter
+
+    :param method: client method that takes `page` and `count`
+    :type Callable: e.g. client.search.messages
+
+    :param count: page size, the largest the method accepts by default
+    :type int: e.g. 100
+
+    :param workers: number of pages to fetch at once
+    :type int: e.g. 4
+    """
+    if count is None:
+        count = MAX_COUNTS.get(method_name(method))
+    first = method(*args, count=count, page=1, **kwargs)
+    yield first
+
+    pages = paging(first.body).get("pages", 1)
+    if pages <= 1:
+        return
+
+    fetch = partial(method, *args)
+    calls = (
+        (fetch, dict(kwargs, count=count, page=page))
+        for page in range(2, pages + 1)
+    )
+    for result in iter_bulk(calls, workers=workers):
+        if not result.ok:
+            raise result.error
+        yield result.response
+
+
+def paginate_numbered(
+    method: Callable,
+    *args,
+    key: str = None,
+    count: int = None,
+    workers: int = 4,
+    **kwargs
+) -> Iterator:
+    """
+    lazily yield every item of a page number paginated method, fetching
+    pages concurrently but yielding them in order
+
+    :param method: client method that takes `page` and `count`
+    :type Callable: e.g. client.files.list
+
+    :param key: where the items are, found automatically by default
+    :type str: e.g. "files.matches" (for search.all)
+
+    :param count: page size, the largest the method accepts by default
+    :type int: e.g. 100
+
+    :param workers: number of pages to fetch at once
+    :type int: e.g. 4
+    """
+    pages = iter_numbered_pages(
+        method, *args, count=count, workers=workers, **kwargs
+    )
+    for resp in pages:
+        yield from numbered_page_items(resp.body, key)
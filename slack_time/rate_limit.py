@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+__all__ = ["RateLimiter", "TokenBucket", "METHOD_TIERS", "TIERS"]
+
+# requests per minute allowed for each tier
+# https://api.slack.com/docs/rate-limits
+TIERS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# methods not listed here are treated as tier 3
+METHOD_TIERS = {
+    "admin.conversations.search": 2,
+    "admin.teams.list": 2,
+    "admin.users.list": 2,
+    "api.test": 4,
+    "auth.test": 4,
+    "bots.info": 3,
+    "chat.delete": 3,
+    "chat.getPermalink": 4,
+    "chat.postEphemeral": 4,
+    "chat.update": 3,
+    "conversations.create": 2,
+    "conversations.history": 3,
+    "conversations.info": 3,
+    "conversations.list": 2,
+    "conversations.members": 4,
+    "conversations.replies": 3,
+    "conversations.setTopic": 2,
+    "dnd.teamInfo": 2,
+    "emoji.list": 2,
+    "files.info": 4,
+    "files.upload": 2,
+    "migration.exchange": 2,
+    "pins.list": 2,
+    "reactions.list": 2,
+    "reminders.add": 2,
+    "reminders.list": 2,
+    "rtm.connect": 1,
+    "rtm.start": 1,
+    "search.all": 2,
+    "search.files": 2,
+    "search.messages": 2,
+    "team.accessLogs": 2,
+    "team.billableInfo": 1,
+    "team.integrationLogs": 2,
+    "usergroups.list": 2,
+    "usergroups.users.list": 2,
+    "users.deletePhoto": 1,
+    "users.info": 4,
+    "users.list": 2,
+    "users.profile.get": 4,
+    "users.setPhoto": 1,
+    "users.setPresence": 2,
+    "views.open": 4,
+    "views.publish": 4,
+    "views.push": 4,
+    "views.update": 4,
+}
+
+# methods limited per channel rather than per workspace, in requests/second
+PER_CHANNEL_METHODS = {"chat.postMessage": 1}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations instead of
+    refusing calls: `reserve` always takes a token and returns how long the
+    caller has to wait before the token is theirs, so callers are queued in
+    the order they reserved.
+
+    :param rate: number of tokens added per second
+    :type float: e.g. 50 / 60 (for 50 per minute)
+
+    :param capacity: max number of tokens the bucket can save up for bursts
+    :type float: e.g. 5
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """take a token, returning the seconds to wait until it is valid"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """stop handing out tokens for the next `seconds`"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+class RateLimiter:
+    """
+    Schedules requests against Slack's rate limits: one token bucket per
+    method (sized by the method's tier) plus one per channel for methods
+    such as chat.postMessage, and honors `Retry-After` on HTTP 429.
+
+    :param burst: seconds worth of quota a bucket may save up for bursts
+    :type float: e.g. 10
+
+    :param max_retries: how many times a rate limited request is re-queued
+    :type int: e.g. 5
+
+    :param tiers: method to tier overrides on top of METHOD_TIERS
+    :type dict: e.g. {"users.info": 2}
+    """
+
+    default_tier = 3
+
+    def __init__(
+        self,
+        burst: float = 10,
+        max_retries: int = 5,
+        tiers: dict = None,
+        clock=time.monotonic,
+    ):
+        self.burst = burst
+        self.max_retries = max_retries
+        self.tiers = dict(METHOD_TIERS, **(tiers or {}))
+        self._clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _make_bucket(self, path: str) -> TokenBucket:
+        if path in PER_CHANNEL_METHODS:
+            rate = PER_CHANNEL_METHODS[path]
+        else:
+            rate = TIERS[self.tiers.get(path, self.default_tier)] / 60
+        capacity = max(1.0, rate * self.burst)
+        return TokenBucket(rate, capacity, clock=self._clock)
+
+    def bucket(self, path: str, payload: dict = None) -> TokenBucket:
+        key = path
+        if path in PER_CHANNEL_METHODS and payload:
+            key = (path, payload.get("channel"))
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = self._make_bucket(path)
+            return self._buckets[key]
+
+    def reserve(self, path: str, payload: dict = None) -> float:
+        """reserve a slot for a request, returning the seconds to wait"""
+        return self.bucket(path, payload).reserve()
+
+    def wait(self, path: str, payload: dict = None) -> None:
+        """block until a request to `path` is allowed"""
+        delay = self.reserve(path, payload)
+        if delay:
+            time.sleep(delay)
+
+    def retry_after(
+        self, path: str, payload: dict = None, retry_after: str = None
+    ) -> None:
+        """pause `path` after Slack answered with HTTP 429"""
+        try:
+            seconds = float(retry_after)
+        except (TypeError, ValueError):
+            seconds = 1.0
+        self.bucket(path, payload).pause(seconds)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+
+__all__ = ["SlackResponse"]
+
+# Slack puts "ok" first in its responses, so it can be read off the front
+# of the body without decoding the (maybe huge) rest of it
+OK_PATTERN = re.compile(rb'\s*\{\s*"ok"\s*:\s*(true|false)\b')
+
+
+class _lazy:
+    """
+    computed on first access and stored on the instance, so it goes with
+    the response rather than living on in a cache (as `cached_property`
+    falls back to before Python 3.8)
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.func.__name__] = self.func(instance)
+        return value
+
+
+class SlackResponse:
+    """
+    Wraps an HTTP response from Slack, decoding the JSON body lazily.
+
+    `body` is decoded on first access, while `successful` and `error` are
+    read off the front of the raw body when possible so callers that only
+    need `ok` never pay for decoding. Everything else is passed through to
+    the wrapped response, e.g. `status_code`, `headers` or `json()`.
+
+    :param response: the response to wrap
+    :type requests.Response: e.g. <Response [200]>
+
+    :param content: the raw body, if it isn't `response.content`
+    :type bytes: e.g. b'{"ok":true}'
+
+    :param loads: function to decode the raw body with
+    :type Callable: e.g. json.loads
+    """
+
+    def __init__(self, response, content: bytes = None, loads=None):
+        self._response = response
+        self._content = content
+        self._loads = loads or json.loads
+
+    def __getattr__(self, name: str):
+        if name == "_response":
+            raise AttributeError(name)
+        return getattr(self._response, name)
+
+    def __repr__(self) -> str:
+        return repr(self._response)
+
+    def __bool__(self) -> bool:
+        return bool(self._response)
+
+    def __iter__(self):
+        return iter(self._response)
+
+    @property
+    def content(self) -> bytes:
+        if self._content is not None:
+            return self._content
+        return getattr(self._response, "content", None)
+
+    @_lazy
+    def body(self) -> dict:
+        content = self.content
+        if isinstance(content, bytes):
+            return self._loads(content)
+        return self._response.json()
+
+    @_lazy
+    def successful(self) -> bool:
+        content = self.content
+        if isinstance(content, bytes):
+            match = OK_PATTERN.match(content)
+            if match is not None:
+                return match.group(1) == b"true"
+        return self.body["ok"]
+
+    @property
+    def error(self) -> str:
+        if self.successful and "body" not in self.__dict__:
+            return None
+        return self.body.get("error")
+
+    def json(self, **kwargs):
+        # an async response's json() is a coroutine, so leave it be
+        if kwargs or self._content is not None:
+            return self._response.json(**kwargs)
+        return self.body
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import random
+
+__all__ = ["RetryPolicy", "RETRY_ERRORS", "RETRY_STATUSES"]
+
+# errors returned in the body by Slack that are worth another try
+RETRY_ERRORS = frozenset(
+    {
+        "fatal_error",
+        "internal_error",
+        "ratelimited",
+        "request_timeout",
+        "service_unavailable",
+    }
+)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# responses that tell us Slack did not act on the request at all, so even
+# write methods can be sent again safely
+UNPROCESSED_ERRORS = frozenset({"ratelimited"})
+UNPROCESSED_STATUSES = frozenset({429})
+
+# last part of a method name for methods that only read, e.g. users.info
+IDEMPOTENT_PREFIXES = (
+    "get",
+    "history",
+    "info",
+    "list",
+    "lookup",
+    "members",
+    "replies",
+    "test",
+)
+
+
+class RetryPolicy:
+    """
+    Retry policy for transient failures, with exponential backoff and full
+    jitter.
+
+    Read methods (e.g. users.info, conversations.history) are retried on
+    connection errors, timeouts, 5xx statuses, non JSON bodies and the
+    errors in `retry_errors`. Write methods (e.g. chat.postMessage) are
+    only retried when Slack can't have acted on the request: the
+    connection was never made or the request was rate limited.
+
+    :param max_attempts: total number of tries, including the first
+    :type int: e.g. 3
+
+    :param backoff: seconds to back off after the first failed try,
+      doubled on every try after that
+    :type float: e.g. 0.5
+
+    :param max_backoff: max number of seconds to back off
+    :type float: e.g. 30
+
+    :param jitter: pick a random backoff between 0 and the computed one
+    :type bool: e.g. True
+
+    :param retry_errors: errors in the response body to retry
+    :type Iterable[str]: e.g. {"internal_error", "ratelimited"}
+
+    :param overrides: method specific policies
+    :type dict: e.g. {"chat.postMessage": RetryPolicy(max_attempts=1)}
+
+    :param idempotent: methods that are safe to retry on any failure
+    :type Iterable[str]: e.g. {"chat.update"}
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        jitter: bool = True,
+        retry_errors=RETRY_ERRORS,
+        retry_statuses=RETRY_STATUSES,
+        overrides: dict = None,
+        idempotent=(),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_errors = frozenset(retry_errors)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.overrides = overrides or {}
+        self.idempotent = frozenset(idempotent)
+
+    def for_method(self, path: str) -> "RetryPolicy":
+        return self.overrides.get(path, self)
+
+    def is_idempotent(self, path: str) -> bool:
+        if path in self.idempotent or path.startswith("search."):
+            return True
+        return path.rsplit(".", maxsplit=1).pop().startswith(
+            IDEMPOTENT_PREFIXES
+        )
+
+    def should_retry_exception(
+        self, path: str, attempt: int, sent: bool = True
+    ) -> bool:
+        """
+        should a request that failed in transport be tried again
+
+        :param sent: False if the request never reached the server
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return not sent or self.is_idempotent(path)
+
+    def should_retry_response(
+        self, path: str, attempt: int, status: int, error: str = None
+    ) -> bool:
+        """should a request that got a response be tried again"""
+        if attempt >= self.max_attempts:
+            return False
+        if status in UNPROCESSED_STATUSES or error in UNPROCESSED_ERRORS:
+            return True
+        retryable = status in self.retry_statuses or error in self.retry_errors
+        return retryable and self.is_idempotent(path)
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """seconds to wait before the next try"""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        try:
+            return max(delay, float(retry_after))
+        except (TypeError, ValueError):
+            return delay
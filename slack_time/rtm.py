@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Real Time Messaging sessions.
+
+`RTMSession` connects to the websocket url from rtm.connect, keeps a
+heartbeat going, reconnects when the connection drops and hands events to
+handlers on a pool of worker threads. Events for the same channel are
+always handled in the order they arrived, one at a time, while events for
+different channels are handled concurrently.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> session = RTMSession(client)
+  >>> @session.on("message")
+  ... def echo(event):
+  ...     print(event["channel"], event.get("text"))
+  >>> session.run()
+
+When the connection is made again, the messages sent while it was down
+are fetched with conversations.history, from the last message seen in
+each channel, and replayed to the handlers before the new live events.
+"""
+import itertools
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Callable
+from typing import Hashable
+from typing import List
+
+from slack_time.bulk import iter_bulk
+from slack_time.pagination import paginate
+from slack_time.utils import ts_key
+
+try:
+    import websocket
+except ImportError:
+    raise ImportError(
+        "RTMSession requires websocket-client, install it with: "
+        "pip install slack_time[rtm]"
+    ) from None
+
+__all__ = ["RTMSession", "Dispatcher", "channel_of", "ts_key"]
+
+logger = logging.getLogger(__name__)
+
+# failures after which it's worth connecting again, rather than e.g. an
+# invalid token
+RECONNECT_EXCEPTIONS = (websocket.WebSocketException, OSError, ValueError)
+
+
+class ConnectionLost(websocket.WebSocketException):
+    """the server stopped answering the heartbeat"""
+
+
+def channel_of(event: dict) -> str:
+    """
+    the channel an event belongs to, e.g. "C123" for a message or a
+    reaction to a message in C123, or None
+    """
+    channel = event.get("channel")
+    if channel is None:
+        item = event.get("item")
+        channel = item.get("channel") if isinstance(item, dict) else None
+    if isinstance(channel, dict):
+        channel = channel.get("id")
+    return channel
+
+
+_STOP = object()
+
+
+class Dispatcher:
+    """
+    Runs calls on a fixed pool of worker threads, keeping the calls for
+    each key in order: every key always goes to the same worker, so calls
+    with the same key run one at a time in the order they were submitted.
+    Calls without a key are spread over the workers.
+
+    Each worker has a queue of at most `queue_size` calls, `submit` blocks
+    when it's full so a slow handler slows the reader rather than letting
+    memory grow.
+
+    :param workers: number of worker threads
+    :type int: e.g. 8
+
+    :param queue_size: max calls waiting per worker
+    :type int: e.g. 1000
+
+    :param on_error: called with the exception when a call raises, logged
+      by default
+    :type Callable[[Exception], None]: e.g. print
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        queue_size: int = 1000,
+        on_error: Callable = None,
+    ):
+        self.on_error = on_error
+        self._queues = [
+            queue.Queue(maxsize=queue_size) for _ in range(workers)
+        ]
+        self._next = itertools.cycle(range(workers))
+        self._threads = [
+            threading.Thread(target=self._work, args=(q,), daemon=True)
+            for q in self._queues
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self, calls: queue.Queue) -> None:
+        while True:
+            call = calls.get()
+            try:
+                if call is _STOP:
+                    return
+                func, args = call
+                try:
+                    func(*args)
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
+                    else:
+                        logger.exception("error handling an event")
+            finally:
+                calls.task_done()
+
+    def submit(self, key: Hashable, func: Callable, *args) -> None:
+        """run `func(*args)` after the calls submitted before with `key`"""
+        if key is None:
+            index = next(self._next)
+        else:
+            index = hash(key) % len(self._queues)
+        self._queues[index].put((func, args))
+
+    def join(self) -> None:
+        """block until every call submitted so far has run"""
+        for calls in self._queues:
+            calls.join()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """stop the workers once they've run the calls already submitted"""
+        for calls in self._queues:
+            calls.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class RTMSession:
+    """
+    A Real Time Messaging connection that reconnects when it drops.
+
+    Handlers are registered for an event type, or "*" for every event,
+    and are called with the event on the dispatcher's workers, in order
+    per channel. A ping is sent every `ping_interval` seconds and the
+    connection is dropped and made again if nothing at all is heard for
+    twice that long.
+
+    :param client: client to call rtm.connect with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param workers: number of threads handling events
+    :type int: e.g. 8
+
+    :param queue_size: max events waiting per worker before reading pauses
+    :type int: e.g. 1000
+
+    :param ping_interval: seconds between heartbeats
+    :type float: e.g. 30
+
+    :param reconnect: connect again when the connection fails
+    :type bool: e.g. True
+
+    :param max_backoff: max seconds to wait between reconnection attempts
+    :type float: e.g. 30
+
+    :param on_error: called with the exception when a handler or a
+      backfill raises
+    :type Callable[[Exception], None]: e.g. print
+
+    :param backfill: replay the messages missed while reconnecting
+    :type bool: e.g. True
+
+    :param backfill_workers: number of channels to backfill at once
+    :type int: e.g. 4
+
+    :param last_ts: ts of the last message seen in each channel, e.g. saved
+      by an earlier session, to backfill from on the first connection
+    :type dict: e.g. {"C1234567890": "1503435956.000247"}
+
+    :param connect_kwargs: passed to rtm.connect
+    :type dict: e.g. {"batch_presence_aware": 1}
+    """
+
+    def __init__(
+        self,
+        client,
+        workers: int = 8,
+        queue_size: int = 1000,
+        ping_interval: float = 30,
+        reconnect: bool = True,
+        max_backoff: float = 30,
+        on_error: Callable = None,
+        backfill: bool = True,
+        backfill_workers: int = 4,
+        last_ts: dict = None,
+        clock=time.monotonic,
+        **connect_kwargs
+    ):
+        self._client = client
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ping_interval = ping_interval
+        self.reconnect = reconnect
+        self.max_backoff = max_backoff
+        self.on_error = on_error
+        self.connect_kwargs = connect_kwargs
+        self.backfill_enabled = backfill
+        self.backfill_workers = backfill_workers
+        self.last_ts = dict(last_ts or {})
+        self._replayed = {}
+        self.connections = 0
+        self.self_info = None
+        self.team = None
+        self._clock = clock
+        codec = getattr(client, "_codec", None)
+        self._loads = codec.loads if codec is not None else json.loads
+        self._dumps = codec.dumps if codec is not None else json.dumps
+        self._handlers = {}
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dispatcher = None
+
+    def on(self, event_type: str = "*") -> Callable:
+        """decorator registering a handler for an event type"""
+
+        def register(handler: Callable) -> Callable:
+            self.add_handler(event_type, handler)
+            return handler
+
+        return register
+
+    def add_handler(self, event_type: str, handler: Callable) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def _handle(self, event: dict) -> None:
+        handlers = self._handlers.get(event.get("type"), [])
+        for handler in handlers + self._handlers.get("*", []):
+            handler(event)
+
+    def _error(self, exc: Exception) -> None:
+        if self.on_error is not None:
+            self.on_error(exc)
+        else:
+            logger.error("error backfilling a channel", exc_info=exc)
+
+    def dispatch(self, event: dict) -> None:
+        """queue `event` for its handlers, after the channel's earlier ones"""
+        channel = channel_of(event)
+        ts = event.get("ts") if event.get("type") == "message" else None
+        if channel is not None and ts is not None:
+            if ts in self._replayed.get(channel, ()):
+                # already replayed by the backfill
+                return
+            last = self.last_ts.get(channel)
+            if last is None or ts_key(ts) > ts_key(last):
+                self.last_ts[channel] = ts
+        self._dispatcher.submit(channel, self._handle, event)
+
+    def _history(self, channel: str, oldest: str) -> List[dict]:
+        messages = paginate(
+            self._client.conversations.history,
+            channel,
+            key="messages",
+            oldest=oldest,
+        )
+        return sorted(messages, key=lambda message: ts_key(message["ts"]))
+
+    def backfill(self) -> int:
+        """
+        fetch the messages after the last one seen in each channel, over
+        `backfill_workers` threads, and dispatch them oldest first,
+        returning how many were replayed; live events for the same
+        messages are skipped until the next reconnection
+        """
+        self._replayed = {}
+        calls = (
+            (self._history, {"channel": channel, "oldest": ts})
+            for channel, ts in list(self.last_ts.items())
+        )
+        replayed = 0
+        for result in iter_bulk(calls, workers=self.backfill_workers):
+            if not result.ok:
+                self._error(result.error)
+                continue
+            channel = result.call[1]["channel"]
+            seen = self._replayed[channel] = set()
+            for message in result.response:
+                self.dispatch(dict(message, channel=channel))
+                seen.add(message["ts"])
+                replayed += 1
+        return replayed
+
+    def connect(self) -> "websocket.WebSocket":
+        """call rtm.connect and open its websocket url"""
+        resp = self._client.rtm.connect(**self.connect_kwargs)
+        self.self_info = resp.body.get("self")
+        self.team = resp.body.get("team")
+        ws = websocket.create_connection(
+            resp.body["url"], timeout=self.ping_interval
+        )
+        self.connections += 1
+        return ws
+
+    def send(self, event: dict) -> int:
+        """send an event over the socket, returning the id it was given"""
+        event = dict(event)
+        event.setdefault("id", next(self._ids))
+        with self._send_lock:
+            ws = self._ws
+            if ws is None:
+                raise websocket.WebSocketConnectionClosedException(
+                    "the session isn't connected"
+                )
+            ws.send(self._dumps(event))
+        return event["id"]
+
+    def ping(self) -> int:
+        return self.send({"type": "ping"})
+
+    def _read(self, ws: "websocket.WebSocket") -> None:
+        """dispatch events from `ws` until it closes or goes quiet"""
+        last_heard = last_ping = self._clock()
+        while not self._stop.is_set():
+            try:
+                data = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                data = None
+            now = self._clock()
+            if data is None:
+                if now - last_heard >= 2 * self.ping_interval:
+                    raise ConnectionLost("no reply to the heartbeat")
+            elif not data:
+                raise websocket.WebSocketConnectionClosedException(
+                    "the server closed the connection"
+                )
+            else:
+                last_heard = now
+                event = self._loads(data)
+                event_type = event.get("type")
+                if event_type == "goodbye":
+                    return
+                if event_type != "pong":
+                    self.dispatch(event)
+            if now - last_ping >= self.ping_interval:
+                self.ping()
+                last_ping = now
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, 0.5 * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+
+    def run(self) -> None:
+        """connect and handle events until `stop` is called"""
+        self._stop.clear()
+        self._dispatcher = Dispatcher(
+            self.workers, self.queue_size, self.on_error
+        )
+        attempt = 0
+        try:
+            while not self._stop.is_set():
+                ws = None
+                try:
+                    ws = self.connect()
+                    attempt = 0
+                    with self._send_lock:
+                        self._ws = ws
+                    if self.backfill_enabled and self.last_ts:
+                        self.backfill()
+                    self._read(ws)
+                except RECONNECT_EXCEPTIONS:
+                    if self._stop.is_set():
+                        break
+                    if not self.reconnect:
+                        raise
+                    attempt += 1
+                    self._stop.wait(self._backoff(attempt))
+                finally:
+                    with self._send_lock:
+                        self._ws = None
+                    if ws is not None:
+                        ws.close()
+        finally:
+            self._dispatcher.shutdown()
+
+    def start(self) -> threading.Thread:
+        """`run` in a background thread"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        close the connection and wait for the handlers to finish the events
+        already received
+        """
+        self._stop.set()
+        with self._send_lock:
+            ws = self._ws
+        if ws is not None:
+            ws.abort()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "RTMSession":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
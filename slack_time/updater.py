@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Coalesced chat.update calls for messages that change often.
+
+A bot showing progress can update the same message many times a second,
+spending quota on states nobody sees. The `Updater` holds the latest
+content for each message (channel and ts) and sends it at most `rate`
+times a second: an update made while an earlier one is waiting replaces
+it, and one made while an earlier one is being sent waits for it to
+finish, so a message's updates are never sent out of order.
+
+use:
+  >>> client = SlackTime(token='insert-your-token-here')
+  >>> ts = client.chat.post_message(channel, text="deploying").body["ts"]
+  >>> with Updater(client) as updater:
+  ...     for step, total in deploy():
+  ...         updater.update(channel, ts, text=f"deploying {step}/{total}")
+  ...     updater.update(channel, ts, text="deployed")
+"""
+import time
+from concurrent.futures import Future
+from functools import partial
+
+from slack_time.pacing import Lane
+from slack_time.pacing import PacedLanes
+
+__all__ = ["Updater"]
+
+
+class Updater(PacedLanes):
+    """
+    Debounced chat.update, keyed by channel and ts.
+
+    `update` returns a `Future` for the response of the call that sends
+    its content, which is shared with the later updates that replace it
+    before it's sent. `coalesced` counts the updates replaced that way.
+
+    `flush` (and leaving the `with` block) sends whatever is waiting
+    straight away, so a message always ends on its last update.
+
+    :param client: client to send the updates with
+    :type SlackTime: e.g. SlackTime(token)
+
+    :param rate: max updates a second to each message
+    :type float: e.g. 1
+
+    :param workers: max updates sent at once across every message
+    :type int: e.g. 4
+    """
+
+    def __init__(
+        self,
+        client,
+        rate: float = 1,
+        workers: int = 4,
+        clock=time.monotonic,
+    ):
+        self._client = client
+        self.coalesced = 0
+        super().__init__(rate, workers, clock)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} size={self._size} "
+            f"coalesced={self.coalesced}>"
+        )
+
+    def _key(self, channel: str, ts: str) -> tuple:
+        directory = getattr(self._client, "_channel_directory", None)
+        return directory.resolve(channel) if directory else channel, str(ts)
+
+    def _empty(self) -> None:
+        return None
+
+    def _take(self, lane: Lane) -> tuple:
+        future, kwargs = lane.pending
+        lane.pending = None
+        return future, partial(self._client.chat.update, **kwargs)
+
+    def update(self, channel: str, ts: str, **kwargs) -> Future:
+        """
+        set the content `channel` and `ts` should be updated to next, see
+        chat.update for `kwargs`
+        """
+        key = self._key(channel, ts)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("the updater is closed")
+            lane = self._lane(key)
+            kwargs = dict(kwargs, channel=channel, ts=ts)
+            if lane.pending is not None:
+                # replaces the update waiting, and shares its future
+                self.coalesced += 1
+                lane.pending = lane.pending[0], kwargs
+            else:
+                lane.pending = Future(), kwargs
+                self._added(lane)
+            return lane.pending[0]
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        send the waiting updates without waiting for their turn and block
+        until they're done, returning False if `timeout` ran out first
+        """
+        with self._cond:
+            self._flushing += 1
+            try:
+                self._expedite()
+                return self._cond.wait_for(lambda: not self._size, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self, wait: bool = True) -> None:
+        """flush the waiting updates and stop taking new ones"""
+        with self._cond:
+            self._closed = True
+        if wait:
+            self.flush()
+        super().close(wait)
+
+    def __enter__(self) -> "Updater":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
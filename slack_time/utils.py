@@ -1,19 +1,20 @@
 # -*- coding: utf-8 -*-
+import io
 import json
+import os
 from collections.abc import Iterable
 from functools import wraps
 from os import PathLike
 from typing import IO
 from typing import Union
 
+from slack_time.errors import error_class
+from slack_time.errors import SlackError  # noqa: F401
+
 SLACK_API_BASE_URL = "https://slack.com/api"
 SLACK_DOC_BASE_URL = "https://api.slack.com/methods/"
 
 
-class SlackError(Exception):
-    pass
-
-
 # class CachedProperty:
 #     """
 #     A property that is only computed once per instance and then replaces
@@ -57,32 +58,90 @@ def make_cached_property():
 cached_property = make_cached_property()
 
 
-def make_file(file: Union[str, PathLike, IO]):
+class OpenedFile(io.BufferedReader):
     """
-    converter for user input to file fields for multipart/form-data
+    a file the client opened from a path, closed once it has been sent
     """
 
+
+def make_file(file: Union[str, PathLike, IO, bytes, memoryview]):
+    """
+    converter for user input to file fields for multipart/form-data
+
+    paths are opened as an `OpenedFile` that's closed after the request,
+    open files are sent as they are and left open for the caller to close,
+    and bytes-like objects are sent without being copied
+    """
     if isinstance(file, (str, PathLike)):
-        return open(file, "rb")
-    else:
-        return file
-    # else:
-    #     raise TypeError(
-    #         "A file parameter or content parameter or other parameter that "
-    #         "sends a file to Slack requires either a filename (e.g. hello.txt) "
-    #         f"or PathLike object or an open IO object not {file} of class "
-    #         f"{file.__class__}"
-    #     )
+        return OpenedFile(io.FileIO(os.fspath(file), "rb"))
+    return file
 
 
-def make_json_encoded(param: Union[str, list, dict]):
+def make_text(content: Union[str, PathLike, IO, bytes, memoryview]) -> str:
+    """
+    converter for user input to text sent as a form field, e.g. the
+    `content` of files.upload: a str is always the text itself, never a
+    path, only `PathLike` objects (e.g. pathlib.Path) and open files are
+    read
     """
-    converter for user input to turn into json encoded field
+    if isinstance(content, PathLike):
+        with open(content, encoding="utf-8") as f:
+            return f.read()
+    if hasattr(content, "read"):
+        content = content.read()
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return str(content, "utf-8")
+    return content
+
+
+def ts_key(ts: str) -> tuple:
+    """
+    sort key for a message ts, "1234567890.123456" has too many digits to
+    compare exactly as a float
+    """
+    seconds, _, micros = str(ts).partition(".")
+    return int(seconds), int(micros or 0)
+
+
+def close_opened_files(files: dict):
+    """
+    close the file fields the client opened itself
+    """
+    for file in (files or {}).values():
+        if isinstance(file, OpenedFile):
+            file.close()
+
+
+def rewind_files(files: dict):
+    """
+    seek file fields back to the start so a request can be sent again
+    """
+    for file in (files or {}).values():
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+
+def rewind_body(kwargs: dict):
+    """
+    seek the file fields and a streamed body of a request's kwargs back to
+    the start so the request can be sent again
+    """
+    rewind_files(kwargs.get("files"))
+    data = kwargs.get("data")
+    if hasattr(data, "seek"):
+        data.seek(0)
+
+
+def make_json_encoded(param: Union[str, list, dict], codec=None):
+    """
+    converter for user input to turn into json encoded field, using the
+    `dumps` of `codec` if one is given
     """
     if isinstance(param, str):
         return param
     elif isinstance(param, (list, dict)):
-        return json.dumps(param)
+        dumps = codec.dumps if codec is not None else json.dumps
+        return dumps(param)
     else:
         raise TypeError(
             "A JSON-encoded object must be passed to the function as either a "
@@ -106,20 +165,41 @@ def comma_separated_string(param: Union[str, Iterable]):
         )
 
 
+def check_response(path: str, resp):
+    """
+    raise a SlackError subclass if the server returned an error response
+    """
+    if not resp.successful:
+        url = SLACK_API_BASE_URL + "/" + path
+        doc = SLACK_DOC_BASE_URL + url.rsplit("/", maxsplit=1).pop()
+        exception = error_class(resp.error)
+        raise exception(
+            f"You tried to perform a request to {url} \n"
+            f"The server returned a '{resp.error}' response "
+            f"Find out more at: {doc}#errors",
+            response=resp,
+        )
+    else:
+        return resp
+
+
 def raise_exception_on_error_from_server(func):
     @wraps(func)
     def wrapper(instance, path, **kwargs):
-        resp = func(instance, path, **kwargs)
-        if not resp.successful:
-            url = SLACK_API_BASE_URL + "/" + path
-            doc = SLACK_DOC_BASE_URL + url.rsplit("/", maxsplit=1).pop()
-            exception = type(resp.error, (SlackError,), {})
-            raise exception(
-                f"You tried to perform a request to {url} \n"
-                f"The server returned a '{resp.error}' response "
-                f"Find out more at: {doc}#errors"
-            )
-        else:
-            return resp
+        try:
+            resp = func(instance, path, **kwargs)
+        finally:
+            close_opened_files(kwargs.get("files"))
+        return check_response(path, resp)
 
     return wrapper
+
+
+def sync_only(func):
+    """
+    mark a helper that blocks on the sync transport, e.g. to stream a
+    download, so the async client leaves it out rather than running it
+    with coroutines
+    """
+    func.sync_only = True
+    return func
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import io
+import json
+from collections import Counter
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackError
+from slack_time.rate_limit import RateLimiter
+from slack_time.retry import RetryPolicy
+
+aiohttp = pytest.importorskip("aiohttp")
+web = pytest.importorskip("aiohttp.web")
+
+# requests the stand-in server got, by method
+received = Counter()
+
+
+async def slack_handler(request):
+    method = request.match_info["method"]
+    received[method] += 1
+    args = dict(request.query)
+    if request.method == "POST":
+        form = await request.post()
+        for key, value in form.items():
+            if isinstance(value, web.FileField):
+                value = value.file.read().decode()
+            args[key] = value
+    if args.get("error") == "ratelimited":
+        return web.json_response(
+            {"ok": False, "error": "ratelimited"},
+            status=429,
+            headers={"Retry-After": "0"},
+        )
+    if "error" in args:
+        return web.json_response({"ok": False, "error": args["error"]})
+    if method == "users.list":
+        cursor = int(args.get("cursor") or 0)
+        return web.json_response(
+            {
+                "ok": True,
+                "members": [cursor],
+                "response_metadata": {
+                    "next_cursor": str(cursor + 1) if cursor < 2 else ""
+                },
+            }
+        )
+    if method == "search.messages":
+        page = int(args["page"])
+        return web.json_response(
+            {
+                "ok": True,
+                "messages": {
+                    "matches": [f"{args['query']} {page}/{args['count']}"],
+                    "paging": {"page": page, "pages": 3},
+                },
+            }
+        )
+    return web.json_response({"ok": True, "method": method, "args": args})
+
+
+def run_against_server(monkeypatch, test, **client_kwargs):
+    """
+    run `test(client)` against a local stand-in for the Slack web API
+    """
+    from slack_time.aio import AsyncSlackTime
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/api/{method}", slack_handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(SlackAPI, "url", f"http://127.0.0.1:{port}/api")
+        try:
+            async with AsyncSlackTime("token", **client_kwargs) as client:
+                return await test(client)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_async_slack_time_namespaces_are_async():
+    from slack_time.aio import AsyncSlackAPI
+    from slack_time.aio import AsyncSlackTime
+
+    async def main():
+        async with AsyncSlackTime("token") as client:
+            assert isinstance(client.chat, AsyncSlackAPI)
+            assert isinstance(client.files.comments, AsyncSlackAPI)
+            assert isinstance(client.admin.conversations.ekm, AsyncSlackAPI)
+            assert client.admin.conversations.ekm._session is client._session
+            assert client.chat is client.chat
+
+    asyncio.run(main())
+
+
+def test_async_slack_time_get(monkeypatch):
+    async def test(client):
+        return await client.api.test(foo="bar")
+
+    resp = run_against_server(monkeypatch, test)
+    assert resp.successful
+    assert resp.error is None
+    assert resp.body["method"] == "api.test"
+    assert resp.body["args"] == {"token": "token", "foo": "bar"}
+
+
+def test_async_slack_time_post(monkeypatch):
+    async def test(client):
+        return await client.chat.post_message(
+            "C1234567890", text="hello", blocks=[{"type": "divider"}]
+        )
+
+    resp = run_against_server(monkeypatch, test)
+    assert resp.body["method"] == "chat.postMessage"
+    assert resp.body["args"]["channel"] == "C1234567890"
+    assert json.loads(resp.body["args"]["blocks"]) == [{"type": "divider"}]
+
+
+def test_async_slack_time_upload(monkeypatch):
+    async def test(client):
+        return await client.files.upload(file=io.BytesIO(b"Hello World!"))
+
+    resp = run_against_server(monkeypatch, test)
+    assert resp.body["args"]["file"] == "Hello World!"
+
+
+def test_async_slack_time_raises_slack_error(monkeypatch):
+    async def test(client):
+        with pytest.raises(SlackError):
+            await client.api.test(error="silly")
+
+    run_against_server(monkeypatch, test)
+
+
+def test_async_slack_time_gives_up_after_max_retries(monkeypatch):
+    async def test(client):
+        with pytest.raises(SlackError):
+            await client.api.test(error="ratelimited")
+
+    received.clear()
+    run_against_server(
+        monkeypatch, test, rate_limiter=RateLimiter(max_retries=2), retry=False
+    )
+    assert received["api.test"] == 3
+
+
+def test_async_slack_time_retries_429_in_one_place(monkeypatch):
+    async def test(client):
+        with pytest.raises(SlackError):
+            await client.api.test(error="ratelimited")
+
+    received.clear()
+    run_against_server(
+        monkeypatch,
+        test,
+        rate_limiter=RateLimiter(max_retries=2),
+        retry_policy=RetryPolicy(max_attempts=3, backoff=0),
+    )
+    # the rate limiter's retries, not multiplied by the retry policy's
+    assert received["api.test"] == 3
+
+
+def test_async_slack_time_does_not_retry_mistakes(monkeypatch):
+    from slack_time.aio import AsyncSlackTime
+
+    async def main():
+        async with AsyncSlackTime("token", rate_limit=False) as client:
+            client.api.url = "slack.com/api"
+            with pytest.raises(aiohttp.InvalidURL):
+                await client.api.test()
+
+    slept = []
+
+    async def sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr("slack_time.aio.asyncio.sleep", sleep)
+    asyncio.run(main())
+    assert not slept
+
+
+def test_async_slack_time_paginate(monkeypatch):
+    async def test(client):
+        return [user async for user in client.paginate(client.users.list)]
+
+    assert run_against_server(monkeypatch, test) == [0, 1, 2]
+
+
+def test_async_slack_time_paginate_numbered(monkeypatch):
+    async def test(client):
+        search = client.search.messages
+        return [m async for m in client.paginate(search, "hi", workers=2)]
+
+    assert run_against_server(monkeypatch, test) == [
+        "hi 1/100",
+        "hi 2/100",
+        "hi 3/100",
+    ]
+
+
+def test_async_slack_time_bulk(monkeypatch):
+    async def test(client):
+        calls = [(client.api.test, {"foo": str(n)}) for n in range(10)]
+        calls.append((client.api.test, {"error": "silly"}))
+        results = await client.bulk(calls, workers=3)
+        streamed = [r async for r in client.iter_bulk(calls, workers=3)]
+        return results, streamed
+
+    results, streamed = run_against_server(
+        monkeypatch, test, rate_limit=False
+    )
+    for results in (results, streamed):
+        assert [r.ok for r in results] == [True] * 10 + [False]
+        assert [r.response.body["args"]["foo"] for r in results[:-1]] == [
+            str(n) for n in range(10)
+        ]
+        assert isinstance(results[-1].error, SlackError)
+
+
+def test_async_slack_time_leaves_out_sync_only_helpers():
+    from slack_time.aio import AsyncSlackTime
+
+    async def main():
+        async with AsyncSlackTime("token") as client:
+            for helper in (client.files.download, client.files.download_many):
+                with pytest.raises(NotImplementedError, match="sync client"):
+                    helper("F0TD00400", "downloads/")
+
+    asyncio.run(main())
+
+
+def test_async_slack_time_upload_many(monkeypatch, tmp_path):
+    paths = []
+    for n in range(4):
+        path = tmp_path / f"artifact{n}.txt"
+        path.write_text(f"artifact {n}")
+        paths.append(str(path))
+
+    async def test(client):
+        return await client.files.upload_many(
+            paths, channels="C1", workers=2
+        )
+
+    results = run_against_server(monkeypatch, test, rate_limit=False)
+    assert [r.ok for r in results] == [True] * 4
+    for n, result in enumerate(results):
+        args = result.response.body["args"]
+        assert args["file"] == f"artifact {n}"
+        assert args["channels"] == "C1"
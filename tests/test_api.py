@@ -24,6 +24,12 @@ def test_slack_api():
         "session": session,
         "proxies": proxies,
         "timeout": timeout,
+        "rate_limiter": None,
+        "retry_policy": None,
+        "codec": None,
+        "cache": None,
+        "channel_directory": None,
+        "single_flight": None,
     }
 
     path = "hello"
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest.mock import Mock
+
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.bulk import bulk
+from slack_time.bulk import iter_bulk
+from slack_time.errors import SlackError
+
+
+def test_bulk_in_order_with_errors():
+    def method(n):
+        time.sleep(0.01 * (5 - n))
+        if n == 3:
+            raise ValueError(n)
+        return n * 10
+
+    calls = [(method, {"n": n}) for n in range(5)]
+    results = bulk(calls, workers=3)
+
+    assert [r.response for r in results] == [0, 10, 20, None, 40]
+    assert [r.ok for r in results] == [True, True, True, False, True]
+    assert isinstance(results[3].error, ValueError)
+    assert results[1].call == calls[1]
+
+
+def test_iter_bulk_bounded_and_lazy():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def method(n):
+        with lock:
+            running.append(n)
+            peak.append(len(running))
+        time.sleep(0.005)
+        with lock:
+            running.remove(n)
+        return n
+
+    consumed = []
+
+    def calls():
+        for n in range(50):
+            consumed.append(n)
+            yield method, {"n": n}
+
+    results = iter_bulk(calls(), workers=4)
+    assert next(results).response == 0
+    # only a window of calls was taken from the generator
+    assert len(consumed) <= 5
+    assert [r.response for r in results] == list(range(1, 50))
+    assert max(peak) <= 4
+
+
+def test_slack_time_bulk(monkeypatch):
+    def request(method, url, params=None, data=None, **kwargs):
+        payload = params or data
+        if payload["user"] == "U2":
+            return Mock(successful=False, error="user_not_found")
+        return Mock(successful=True, body={"user": {"id": payload["user"]}})
+
+    monkeypatch.setattr(SlackAPI, "_request", Mock(side_effect=request))
+    client = SlackTime("token")
+    calls = [(client.users.info, {"user": u}) for u in ("U1", "U2", "U3")]
+
+    results = client.bulk(calls)
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[2].response.body["user"]["id"] == "U3"
+    assert isinstance(results[1].error, SlackError)
+    assert results[1].error.code == "user_not_found"
+
+    streamed = client.iter_bulk(iter(calls), workers=2)
+    assert [r.ok for r in streamed] == [True, False, True]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import Mock
+
+import pytest
+from slack_time import ResponseCache
+from slack_time import SlackAPI
+from slack_time import SlackError
+from slack_time import SlackTime
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def ok(**body):
+    return Mock(successful=True, body=dict(ok=True, **body))
+
+
+def test_cache_key_normalizes_payload():
+    cache = ResponseCache()
+    a = cache.key("users.info", {"token": "t", "user": "U1", "x": None})
+    b = cache.key("users.info", {"user": "U1", "token": "t"})
+    assert a == b
+    assert a != cache.key("users.info", {"user": "U1", "token": "other"})
+    assert a != cache.key("users.info", {"user": "U2", "token": "t"})
+
+
+def test_cache_ttl():
+    clock = Clock()
+    cache = ResponseCache({"users.info": 10}, clock=clock)
+    key = cache.key("users.info", {"user": "U1"})
+    resp = ok()
+
+    assert cache.get(key) is None
+    cache.set(key, resp)
+    clock.now = 9
+    assert cache.get(key) is resp
+    clock.now = 10
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 0
+
+
+def test_cache_skips_unknown_methods_and_errors():
+    cache = ResponseCache({"users.info": 10})
+    cache.set(cache.key("chat.postMessage"), ok())
+    cache.set(cache.key("users.info"), Mock(successful=False))
+    assert len(cache) == 0
+    assert not cache.cacheable("chat.postMessage", {})
+    assert not cache.cacheable("users.info", {"files": {"file": "x"}})
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache({"users.info": 10}, maxsize=2)
+    keys = [cache.key("users.info", {"user": u}) for u in "abc"]
+    cache.set(keys[0], ok())
+    cache.set(keys[1], ok())
+    cache.get(keys[0])
+    cache.set(keys[2], ok())
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_slack_time_uses_cache(monkeypatch):
+    request = Mock(side_effect=lambda *a, **kw: ok(user={"id": "U1"}))
+    monkeypatch.setattr(SlackAPI, "_request", request)
+    cache = ResponseCache()
+    client = SlackTime("token", cache=cache)
+
+    first = client.users.info("U1")
+    second = client.users.info("U1")
+    client.users.info("U2")
+    client.conversations.members("C1")
+    client.conversations.members("C1")
+
+    assert first is second
+    assert request.call_count == 4
+    assert cache.hits == 1
+
+
+def test_slack_api_does_not_cache_errors(monkeypatch):
+    request = Mock(return_value=Mock(successful=False, error="user_not_found"))
+    monkeypatch.setattr(SlackAPI, "_request", request)
+    api = SlackAPI("token", cache=ResponseCache())
+
+    for _ in range(2):
+        with pytest.raises(SlackError):
+            api._get("users.info", payload={"user": "U1"})
+    assert request.call_count == 2
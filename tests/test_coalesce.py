@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.coalesce import SingleFlight
+
+
+def run_concurrently(func, n=5):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(func) for _ in range(n)]
+        return [future.result() for future in futures]
+
+
+def blocking(result, started, release):
+    def func(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return Mock(side_effect=func)
+
+
+def wait_for_waiters(flight, n):
+    for _ in range(500):
+        if flight.shared >= n:
+            return
+        time.sleep(0.01)
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    func = blocking("result", started, release)
+
+    def call():
+        return flight.do("key", func)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(call)
+        started.wait(5)
+        rest = [pool.submit(call) for _ in range(3)]
+        wait_for_waiters(flight, 3)
+        release.set()
+        results = [first.result()] + [f.result() for f in rest]
+
+    assert results == ["result"] * 4
+    assert func.call_count == 1
+    assert flight.shared == 3
+    assert len(flight) == 0
+
+
+def test_single_flight_shares_exception():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    func = blocking(ValueError("boom"), started, release)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(flight.do, "key", func)
+        started.wait(5)
+        second = pool.submit(flight.do, "key", func)
+        wait_for_waiters(flight, 1)
+        release.set()
+        for future in (first, second):
+            with pytest.raises(ValueError):
+                future.result()
+    assert func.call_count == 1
+    # nothing in flight, so the next call runs again
+    release.set()
+    with pytest.raises(ValueError):
+        flight.do("key", func)
+    assert func.call_count == 2
+
+
+def test_single_flight_different_keys():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.shared == 0
+
+
+@pytest.fixture
+def slack_request(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    slack_request = blocking(
+        Mock(successful=True, body={"ok": True}), started, release
+    )
+    slack_request.started = started
+    slack_request.release = release
+    monkeypatch.setattr(SlackAPI, "_request", slack_request)
+    return slack_request
+
+
+def test_slack_time_coalesces_identical_reads(slack_request):
+    client = SlackTime("token")
+    flight = client._single_flight
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(client.users.info, "U1")
+        slack_request.started.wait(5)
+        rest = [pool.submit(client.users.info, "U1") for _ in range(3)]
+        wait_for_waiters(flight, 3)
+        slack_request.release.set()
+        responses = [first.result()] + [f.result() for f in rest]
+
+    assert slack_request.call_count == 1
+    assert all(resp is responses[0] for resp in responses)
+
+    # different arguments, or writes, aren't shared
+    client.users.info("U2")
+    client.chat.post_message("C1", "hey")
+    client.chat.post_message("C1", "hey")
+    assert slack_request.call_count == 4
+
+
+def test_slack_time_without_coalesce(slack_request):
+    client = SlackTime("token", coalesce=False)
+    assert client._single_flight is None
+    slack_request.release.set()
+    run_concurrently(lambda: client.users.info("U1"), n=3)
+    assert slack_request.call_count == 3
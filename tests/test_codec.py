@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.codec import get_codec
+from slack_time.codec import JSONCodec
+from slack_time.utils import make_json_encoded
+
+CODEC_NAMES = ["json"]
+try:
+    import orjson  # noqa: F401
+
+    CODEC_NAMES.append("orjson")
+except ImportError:
+    pass
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_codec_round_trip(name):
+    codec = get_codec(name)
+    obj = {"ok": True, "blocks": [{"type": "divider"}], "n": 1.5}
+    assert codec.loads(codec.dumps(obj).encode()) == obj
+    assert isinstance(codec.dumps(obj), str)
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_make_json_encoded_with_codec(name):
+    field = [{"type": "section", "text": "hello"}]
+    encoded = make_json_encoded(field, get_codec(name))
+    assert json.loads(encoded) == field
+
+
+def test_get_codec_default_is_fastest():
+    assert get_codec().name == CODEC_NAMES[-1]
+
+
+def test_slack_time_codec_is_shared():
+    codec = JSONCodec()
+    client = SlackTime("token", codec=codec)
+    assert client.chat._codec is codec
+    assert client.admin.conversations.ekm._codec is codec
+
+
+def test_slack_api_decodes_with_codec():
+    codec = Mock(loads=Mock(return_value={"ok": True, "hello": "world"}))
+    session = Mock()
+    session.request.return_value = Mock(
+        status_code=200, content=b'{"ok": true, "hello": "world"}'
+    )
+    api = SlackAPI("token", session, codec=codec)
+
+    resp = api._get("api.test")
+    assert resp.body == {"ok": True, "hello": "world"}
+    codec.loads.assert_called_once_with(b'{"ok": true, "hello": "world"}')
+
+
+def test_chat_encodes_blocks_with_codec(monkeypatch):
+    _post = Mock()
+    monkeypatch.setattr(SlackAPI, "_post", _post)
+    codec = Mock(dumps=Mock(return_value="encoded"))
+    client = SlackTime("token", codec=codec)
+
+    client.chat.post_message("C1234567890", "hi", blocks=[{}])
+    assert _post.call_args[1]["payload"]["blocks"] == "encoded"
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.directory import ChannelDirectory
+from slack_time.directory import is_channel_id
+from slack_time.directory import UserDirectory
+
+
+def make_user(id, name, display_name="", email=None, updated=1, **kwargs):
+    profile = {"display_name": display_name, "real_name": name.title()}
+    if email:
+        profile["email"] = email
+    return dict(id=id, name=name, profile=profile, updated=updated, **kwargs)
+
+
+USERS = [
+    make_user("U1", "spengler", "Egon", "egon@example.com"),
+    make_user("U2", "venkman", "Pete", "peter@example.com"),
+    make_user("U3", "stantz", "Ray", "RAY@example.com"),
+    make_user("U4", "zeddemore", "Ray"),
+    make_user("U5", "gozer", "Gozer", deleted=True),
+]
+
+
+@pytest.fixture
+def users_list(monkeypatch):
+    users = list(USERS)
+
+    def request(path, payload):
+        assert path == "users.list"
+        start = int(payload.get("cursor") or 0)
+        end = start + 2
+        cursor = str(end) if end < len(users) else ""
+        return Mock(
+            body={
+                "ok": True,
+                "members": users[start:end],
+                "response_metadata": {"next_cursor": cursor},
+            }
+        )
+
+    users_list = Mock(side_effect=request)
+    users_list.users = users
+    monkeypatch.setattr(SlackAPI, "_get", users_list)
+    return users_list
+
+
+@pytest.fixture
+def directory(users_list):
+    return UserDirectory(SlackTime("token"))
+
+
+def test_user_directory_lookups(directory, users_list):
+    assert directory.get("U1").name == "spengler"
+    assert users_list.call_count == 3
+    assert len(directory) == 4
+    assert "U5" not in directory
+
+    assert directory.by_email("ray@EXAMPLE.com").id == "U3"
+    assert directory.by_name("@venkman").id == "U2"
+    assert [u.id for u in directory.by_display_name("ray")] == ["U3", "U4"]
+    assert directory.get("U9") is None
+    assert directory.by_email("nobody@example.com") is None
+    # the lookups didn't call the API again
+    assert users_list.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "query, user_id",
+    [
+        ("U2", "U2"),
+        ("egon@example.com", "U1"),
+        ("@stantz", "U3"),
+        ("Pete", "U2"),
+        ("Ray", None),
+        ("Gozer", None),
+    ],
+)
+def test_user_directory_find(directory, query, user_id):
+    user = directory.find(query)
+    assert (user and user.id) == user_id
+
+
+def test_user_directory_include_deleted(users_list):
+    directory = UserDirectory(SlackTime("token"), include_deleted=True)
+    assert directory.by_name("gozer").deleted
+
+
+def test_user_directory_refresh(directory, users_list):
+    directory.load()
+    users_list.users[0] = make_user("U1", "spengler", "Dr Egon", updated=2)
+    del users_list.users[1]
+
+    directory.refresh()
+    assert directory.by_display_name("Egon") == []
+    assert directory.by_display_name("dr egon")[0].id == "U1"
+    assert directory.by_email("egon@example.com") is None
+    assert directory.get("U2") is None
+    assert directory.by_name("venkman") is None
+
+
+def test_user_directory_update(directory):
+    directory.load()
+    directory.update(make_user("U6", "tully", "Louis", "louis@example.com"))
+    assert directory.by_email("louis@example.com").id == "U6"
+
+    directory.update(make_user("U6", "tully", "Louis", deleted=True))
+    assert directory.get("U6") is None
+    assert directory.by_name("tully") is None
+
+
+CHANNELS = [
+    {"id": "C1", "name": "general", "previous_names": ["lobby"]},
+    {"id": "G2", "name": "ghostbusters", "is_private": True},
+    {"id": "G3", "name": "mpdm-egon--pete--ray-1"},
+    {"id": "D4", "user": "U1"},
+]
+
+
+@pytest.fixture
+def slack_request(monkeypatch):
+    channels = list(CHANNELS)
+
+    def request(method, url, params=None, data=None, **kwargs):
+        path = url.rsplit("/", maxsplit=1).pop()
+        payload = params or data
+        body = {"ok": True}
+        if path == "conversations.list":
+            assert payload["types"] == "public_channel,private_channel,mpim,im"
+            start = int(payload.get("cursor") or 0)
+            end = start + 3
+            cursor = str(end) if end < len(channels) else ""
+            body["channels"] = channels[start:end]
+            body["response_metadata"] = {"next_cursor": cursor}
+        return Mock(body=body, successful=True)
+
+    slack_request = Mock(side_effect=request)
+    slack_request.channels = channels
+    monkeypatch.setattr(SlackAPI, "_request", slack_request)
+    return slack_request
+
+
+def calls_to(slack_request, path):
+    return [
+        call
+        for call in slack_request.call_args_list
+        if call[0][1].endswith("/" + path)
+    ]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("C012AB3CD", True),
+        ("D0123456", True),
+        ("U0123456789", True),
+        ("W0123456789", True),
+        ("general", False),
+        ("GENERAL", False),
+        ("DEPLOYS", False),
+        ("UPDATES", False),
+        ("WEBHOOKS", False),
+    ],
+)
+def test_is_channel_id(value, expected):
+    assert is_channel_id(value) is expected
+
+
+def test_channel_directory_resolve(slack_request):
+    directory = ChannelDirectory(SlackTime("token"))
+    assert directory.resolve("#General") == "C1"
+    assert directory.resolve("GENERAL") == "C1"
+    assert len(calls_to(slack_request, "conversations.list")) == 2
+    assert len(directory) == 4
+
+    assert directory.resolve("lobby") == "C1"
+    assert directory.resolve("ghostbusters") == "G2"
+    assert directory.resolve("mpdm-egon--pete--ray-1") == "G3"
+    assert directory.resolve("C999999999") == "C999999999"
+    assert directory.im_for("U1") == "D4"
+    assert directory.get("G2").is_private
+    # an unknown name within min_reload_interval doesn't reload
+    assert directory.resolve("nope") == "nope"
+    assert len(calls_to(slack_request, "conversations.list")) == 2
+
+
+def test_channel_directory_reloads_on_miss(slack_request):
+    now = [0]
+    directory = ChannelDirectory(
+        SlackTime("token"), min_reload_interval=60, clock=lambda: now[0]
+    )
+    directory.load()
+    slack_request.channels.append({"id": "C5", "name": "ecto-1"})
+    assert directory.resolve("ecto-1") == "ecto-1"
+
+    now[0] = 61
+    assert directory.resolve("ecto-1") == "C5"
+    assert len(calls_to(slack_request, "conversations.list")) == 4
+
+
+def test_channel_directory_resolve_user_ids(slack_request):
+    now = [0]
+    directory = ChannelDirectory(
+        SlackTime("token"), min_reload_interval=60, clock=lambda: now[0]
+    ).load()
+    for _ in range(3):
+        now[0] += 61
+        assert directory.resolve("U0123456789") == "U0123456789"
+    # user IDs are passed through without a reload
+    assert len(calls_to(slack_request, "conversations.list")) == 2
+
+
+def test_channel_directory_concurrent_misses_reload_once(slack_request):
+    directory = ChannelDirectory(SlackTime("token"))
+    barrier = threading.Barrier(8)
+
+    def resolve():
+        barrier.wait()
+        return directory.resolve("nope")
+
+    with ThreadPoolExecutor(8) as pool:
+        results = [pool.submit(resolve) for _ in range(8)]
+    assert [r.result() for r in results] == ["nope"] * 8
+    # one scan of two pages, not one for every thread that missed
+    assert len(calls_to(slack_request, "conversations.list")) == 2
+
+
+def test_channel_directory_update_rename(slack_request):
+    directory = ChannelDirectory(SlackTime("token")).load()
+    directory.update({"id": "C1", "name": "firehouse"})
+    assert directory.resolve("firehouse") == "C1"
+    assert directory.resolve("general") == "C1"
+    assert directory.get("C1").name == "firehouse"
+
+
+def test_slack_time_resolve_channels(slack_request):
+    client = SlackTime("token", resolve_channels=True)
+    client.chat.post_message("#ghostbusters", "who you gonna call?")
+    client.conversations.history("general")
+    client.chat.post_message("C012AB3CD", "no lookup needed")
+
+    first, last = calls_to(slack_request, "chat.postMessage")
+    assert first[1]["data"]["channel"] == "G2"
+    assert last[1]["data"]["channel"] == "C012AB3CD"
+    history, = calls_to(slack_request, "conversations.history")
+    assert history[1]["params"]["channel"] == "C1"
+    # the directory was loaded once and shared by every namespace
+    assert len(calls_to(slack_request, "conversations.list")) == 2
+
+
+def test_slack_time_without_resolve_channels(slack_request):
+    client = SlackTime("token")
+    client.chat.post_message("#ghostbusters", "who you gonna call?")
+    post, = calls_to(slack_request, "chat.postMessage")
+    assert post[1]["data"]["channel"] == "#ghostbusters"
+    assert not calls_to(slack_request, "conversations.list")
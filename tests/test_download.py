@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+from slack_time import RetryPolicy
+from slack_time import SlackTime
+from slack_time.download import destination
+from slack_time.download import download_file
+from slack_time.download import DownloadError
+
+CONTENT = bytes(range(256)) * 10000
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.path == "/login":
+            return self.reply(200, b"<html>sign in</html>", "text/html")
+        if self.headers.get("Authorization") != "Bearer token":
+            return self.reply(403, b"", "text/plain")
+
+        start = 0
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if match and self.path != "/no-ranges":
+            start = int(match.group(1))
+            if start >= len(CONTENT):
+                return self.reply(416, b"", "text/plain")
+        body = CONTENT[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Type", "image/gif")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if server.interruptions > 0:
+            server.interruptions -= 1
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def reply(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.requests = []
+    server.interruptions = 0
+    server.base = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def file_info(server, id="F1", name="dramacat.gif", path="/f", **kwargs):
+    info = {
+        "id": id,
+        "name": name,
+        "size": len(CONTENT),
+        "url_private_download": server.base + path,
+    }
+    info.update(kwargs)
+    return info
+
+
+def test_destination(tmp_path):
+    assert destination(tmp_path, "a.gif") == str(tmp_path / "a.gif")
+    new_dir = str(tmp_path / "new") + os.sep
+    assert destination(new_dir, "a.gif") == new_dir + "a.gif"
+    assert os.path.isdir(new_dir)
+    assert destination(tmp_path / "b.gif", "a.gif") == str(tmp_path / "b.gif")
+
+
+def test_files_download(server, tmp_path):
+    progress = []
+    with SlackTime("token") as client:
+        path = client.files.download(
+            file_info(server),
+            tmp_path,
+            progress=lambda written, size: progress.append(written),
+        )
+    assert path == str(tmp_path / "dramacat.gif")
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert not os.path.exists(path + ".part")
+    assert progress[-1] == len(CONTENT)
+    # written in chunks, not all at once
+    assert len(progress) > 1
+
+
+def test_files_download_by_id(server, tmp_path, monkeypatch):
+    from slack_time.methods.files import Files
+
+    info = Mock(return_value=Mock(body={"file": file_info(server)}))
+    monkeypatch.setattr(Files, "info", info)
+    with SlackTime("token") as client:
+        path = client.files.download("F1", tmp_path / "cat.gif")
+    assert path == str(tmp_path / "cat.gif")
+    info.assert_called_once_with("F1")
+
+
+def test_download_resumes_after_interruption(server, tmp_path):
+    server.interruptions = 1
+    dest = tmp_path / "cat.gif"
+    policy = RetryPolicy(backoff=0, jitter=False)
+    download_file(
+        server.base + "/f",
+        dest,
+        token="token",
+        size=len(CONTENT),
+        retry_policy=policy,
+    )
+    assert dest.read_bytes() == CONTENT
+    first, second = server.requests
+    assert "Range" not in first
+    # only the rest of the file was asked for
+    offset = int(second["Range"][len("bytes=") : -1])
+    assert 0 < offset <= len(CONTENT) // 2
+
+
+def test_download_resumes_part_file(server, tmp_path):
+    dest = tmp_path / "cat.gif"
+    (tmp_path / "cat.gif.part").write_bytes(CONTENT[:1000])
+    download_file(server.base + "/f", dest, token="token", size=len(CONTENT))
+    assert dest.read_bytes() == CONTENT
+    assert server.requests[0]["Range"] == "bytes=1000-"
+
+
+def test_download_restarts_without_range_support(server, tmp_path):
+    dest = tmp_path / "cat.gif"
+    (tmp_path / "cat.gif.part").write_bytes(b"stale")
+    download_file(server.base + "/no-ranges", dest, token="token")
+    assert dest.read_bytes() == CONTENT
+
+
+def test_download_complete_part_file(server, tmp_path):
+    dest = tmp_path / "cat.gif"
+    (tmp_path / "cat.gif.part").write_bytes(CONTENT)
+    download_file(server.base + "/f", dest, token="token")
+    assert dest.read_bytes() == CONTENT
+
+
+def test_download_without_resume_gives_up(server, tmp_path):
+    server.interruptions = 1
+    with pytest.raises(Exception):
+        download_file(
+            server.base + "/f",
+            tmp_path / "cat.gif",
+            token="token",
+            resume=False,
+            retry_policy=RetryPolicy(backoff=0),
+        )
+
+
+def test_download_size_mismatch(server, tmp_path):
+    dest = tmp_path / "cat.gif"
+    with pytest.raises(DownloadError):
+        download_file(server.base + "/f", dest, token="token", size=10)
+    assert not dest.exists()
+    assert not (tmp_path / "cat.gif.part").exists()
+
+
+def test_download_sign_in_page(server, tmp_path):
+    with pytest.raises(DownloadError, match="files:read"):
+        download_file(server.base + "/login", tmp_path / "x", token="token")
+
+
+def test_files_download_many(server, tmp_path):
+    files = [
+        file_info(server, id=f"F{n}", name=f"cat{n}.gif") for n in range(5)
+    ]
+    files.insert(2, file_info(server, id="F9", path="/login"))
+    with SlackTime("token") as client:
+        results = client.files.download_many(files, tmp_path, workers=3)
+
+    assert [r.ok for r in results] == [True, True, False, True, True, True]
+    assert isinstance(results[2].error, DownloadError)
+    assert results[3].response == str(tmp_path / "F2-cat2.gif")
+    for n in range(5):
+        assert (tmp_path / f"F{n}-cat{n}.gif").read_bytes() == CONTENT
+
+
+def test_files_download_many_same_names(server, tmp_path):
+    files = [
+        file_info(server, id=f"F{n}", name="image.png") for n in range(4)
+    ]
+    with SlackTime("token", rate_limit=False) as client:
+        results = client.files.download_many(files, tmp_path, workers=4)
+
+    assert all(r.ok for r in results)
+    paths = [r.response for r in results]
+    assert paths == [str(tmp_path / f"F{n}-image.png") for n in range(4)]
+    assert sorted(os.listdir(tmp_path)) == [
+        f"F{n}-image.png" for n in range(4)
+    ]
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == CONTENT
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import pickle
+from unittest.mock import Mock
+
+import pytest
+from slack_time import errors
+from slack_time import SlackError
+from slack_time.utils import check_response
+
+
+@pytest.mark.parametrize(
+    "code, name",
+    [
+        ("channel_not_found", "ChannelNotFound"),
+        ("ratelimited", "Ratelimited"),
+        ("invalid_arg_name", "InvalidArgName"),
+        ("some-new.error", "SomeNewError"),
+        ("2fa_required", "Error2faRequired"),
+    ],
+)
+def test_class_name(code, name):
+    assert errors.class_name(code) == name
+
+
+def test_known_errors_are_importable():
+    from slack_time.errors import ChannelNotFound
+
+    assert issubclass(ChannelNotFound, SlackError)
+    assert ChannelNotFound.code == "channel_not_found"
+    assert errors.error_class("channel_not_found") is ChannelNotFound
+    assert "ChannelNotFound" in errors.__all__
+
+
+def test_error_classes_are_reused():
+    cls = errors.error_class("a_brand_new_error")
+    assert errors.error_class("a_brand_new_error") is cls
+    assert errors.ABrandNewError is cls
+    assert pickle.loads(pickle.dumps(cls)) is cls
+
+
+def test_check_response_raises_registered_class():
+    resp = Mock(successful=False, error="channel_not_found")
+
+    with pytest.raises(errors.ChannelNotFound) as first:
+        check_response("chat.postMessage", resp)
+    with pytest.raises(errors.ChannelNotFound) as second:
+        check_response("chat.postMessage", resp)
+
+    assert type(first.value) is type(second.value)
+    assert first.value.response is resp
+    assert "chat.postMessage#errors" in str(first.value)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import os
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.__main__ import main
+from slack_time.errors import error_class
+from slack_time.export import Exporter
+from slack_time.utils import ts_key
+
+
+class Workspace:
+    """stands in for conversations.list, history and replies, two items a
+    page, failing a history call when `fail_after` pages have been sent"""
+
+    def __init__(self):
+        self.messages = {}
+        self.replies = {}
+        self.fail_after = None
+        self.pages = 0
+        self.lock = threading.Lock()
+
+    def page(self, items, payload, key):
+        start = int(payload.get("cursor") or 0)
+        cursor = str(start + 2) if start + 2 < len(items) else ""
+        return Mock(
+            body={
+                "ok": True,
+                key: items[start : start + 2],
+                "response_metadata": {"next_cursor": cursor},
+            }
+        )
+
+    def get(self, path, payload=None, **kwargs):
+        if path == "conversations.list":
+            channels = [{"id": c} for c in self.messages]
+            return self.page(channels, payload, "channels")
+        channel = payload["channel"]
+        if channel not in self.messages:
+            raise error_class("channel_not_found")("not found")
+        if path == "conversations.replies":
+            parent = [
+                m for m in self.messages[channel] if m["ts"] == payload["ts"]
+            ]
+            oldest = ts_key(payload.get("oldest", "0.0"))
+            replies = [
+                m
+                for m in self.replies[payload["ts"]]
+                if ts_key(m["ts"]) > oldest
+            ]
+            return self.page(parent + replies, payload, "messages")
+        with self.lock:
+            self.pages += 1
+            if self.fail_after is not None and self.pages > self.fail_after:
+                self.fail_after = None
+                raise ConnectionError("interrupted")
+        oldest = ts_key(payload.get("oldest", "0.0"))
+        latest = ts_key(payload.get("latest", "9999999999.0"))
+        inclusive = payload.get("inclusive")
+        found = [
+            m
+            for m in self.messages[channel]
+            if oldest < ts_key(m["ts"]) < latest
+            or inclusive and ts_key(m["ts"]) == latest
+        ]
+        found.sort(key=lambda m: ts_key(m["ts"]), reverse=True)
+        return self.page(found, payload, "messages")
+
+    def post(self, channel, *messages):
+        self.messages.setdefault(channel, []).extend(
+            {"type": "message", "ts": ts, "text": ts} for ts in messages
+        )
+
+    def reply(self, channel, parent, *replies):
+        (message,) = [m for m in self.messages[channel] if m["ts"] == parent]
+        thread = self.replies.setdefault(parent, [])
+        thread.extend(
+            {"type": "message", "ts": ts, "thread_ts": parent}
+            for ts in replies
+        )
+        message.update(
+            thread_ts=parent,
+            reply_count=len(thread),
+            latest_reply=thread[-1]["ts"],
+        )
+
+
+@pytest.fixture
+def workspace(monkeypatch):
+    workspace = Workspace()
+    monkeypatch.setattr(
+        SlackAPI,
+        "_get",
+        lambda self, *args, **kwargs: workspace.get(*args, **kwargs),
+    )
+    return workspace
+
+
+@pytest.fixture
+def client():
+    return SlackTime("token", rate_limit=False, retry=False)
+
+
+def read(path):
+    with gzip.open(path, "rt") as f:
+        return [json.loads(line)["ts"] for line in f]
+
+
+def test_export_channel(workspace, client, tmp_path):
+    workspace.post("C1", "1.000001", "2.000001", "3.000001")
+    workspace.reply("C1", "2.000001", "2.000002", "2.000003", "2.000004")
+
+    exporter = Exporter(client, tmp_path)
+    assert exporter.export_channel("C1") == 6
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        "3.000001",
+        "2.000001",
+        "2.000002",
+        "2.000003",
+        "2.000004",
+        "1.000001",
+    ]
+    checkpoint = exporter.load_checkpoint("C1")
+    assert checkpoint["complete"]
+    assert checkpoint["newest"] == "3.000001"
+    assert checkpoint["threads"] == {"2.000001": "2.000004"}
+
+
+def test_export_resumes_after_an_interruption(workspace, client, tmp_path):
+    workspace.post("C1", *(f"{n}.000001" for n in range(1, 8)))
+    workspace.fail_after = 2
+    exporter = Exporter(client, tmp_path)
+    with pytest.raises(ConnectionError):
+        exporter.export_channel("C1")
+    checkpoint = exporter.load_checkpoint("C1")
+    assert not checkpoint["complete"]
+    assert checkpoint["latest"] == "4.000001"
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        "7.000001",
+        "6.000001",
+        "5.000001",
+        "4.000001",
+    ]
+
+    # junk written after the checkpoint is dropped, not exported twice
+    with open(tmp_path / "C1.jsonl.gz", "ab") as f:
+        f.write(b"half a gzip member")
+    assert exporter.export_channel("C1") == 3
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        f"{n}.000001" for n in range(7, 0, -1)
+    ]
+
+
+def test_export_only_fetches_new_messages(workspace, client, tmp_path):
+    workspace.post("C1", "1.000001", "2.000001")
+    exporter = Exporter(client, tmp_path)
+    assert exporter.export_channel("C1") == 2
+    assert exporter.export_channel("C1") == 0
+    workspace.post("C1", "3.000001")
+    assert exporter.export_channel("C1") == 1
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        "2.000001",
+        "1.000001",
+        "3.000001",
+    ]
+    assert exporter.load_checkpoint("C1")["newest"] == "3.000001"
+
+
+def test_export_fetches_new_replies_to_old_threads(
+    workspace, client, tmp_path
+):
+    workspace.post("C1", "1.000001", "2.000001")
+    workspace.reply("C1", "1.000001", "1.000002")
+    exporter = Exporter(client, tmp_path, thread_max_age=None)
+    assert exporter.export_channel("C1") == 3
+
+    # the thread carries on below a parent older than the last export
+    workspace.reply("C1", "1.000001", "1.000003", "1.000004")
+    workspace.post("C1", "3.000001")
+    assert exporter.export_channel("C1") == 3
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        "2.000001",
+        "1.000001",
+        "1.000002",
+        "3.000001",
+        "1.000003",
+        "1.000004",
+    ]
+    checkpoint = exporter.load_checkpoint("C1")
+    assert checkpoint["threads"] == {"1.000001": "1.000004"}
+    assert exporter.export_channel("C1") == 0
+
+
+def test_export_fetches_threads_started_on_old_messages(
+    workspace, client, tmp_path
+):
+    now = int(time.time())
+    first, second, third = (f"{now - n}.000001" for n in (60, 30, 0))
+    workspace.post("C1", first, second)
+    exporter = Exporter(client, tmp_path)
+    assert exporter.export_channel("C1") == 2
+
+    # replied to after it was exported without any replies
+    workspace.reply("C1", second, f"{now - 30}.000002", f"{now - 30}.000003")
+    workspace.post("C1", third)
+    assert exporter.export_channel("C1") == 3
+    assert read(tmp_path / "C1.jsonl.gz") == [
+        second,
+        first,
+        third,
+        f"{now - 30}.000002",
+        f"{now - 30}.000003",
+    ]
+    checkpoint = exporter.load_checkpoint("C1")
+    assert checkpoint["threads"] == {second: f"{now - 30}.000003"}
+    assert exporter.export_channel("C1") == 0
+
+
+def test_export_resumes_a_run_with_nothing_new(workspace, client, tmp_path):
+    workspace.post("C1", "1.000001", "2.000001")
+    exporter = Exporter(client, tmp_path)
+    assert exporter.export_channel("C1") == 2
+    path = tmp_path / "C1.jsonl.gz"
+    size = os.path.getsize(path)
+
+    # a crash left half a member behind, and nothing was posted since
+    with open(path, "ab") as f:
+        f.write(b"half a gzip member" * 50)
+    assert exporter.export_channel("C1") == 0
+    assert exporter.load_checkpoint("C1")["offset"] == size
+    assert os.path.getsize(path) == size
+
+    workspace.post("C1", "3.000001")
+    assert exporter.export_channel("C1") == 1
+    assert exporter.load_checkpoint("C1")["offset"] == os.path.getsize(path)
+    # the next member follows on, with no padding for `gzip -dc` to stop at
+    assert path.read_bytes()[size : size + 2] == b"\x1f\x8b"
+    assert read(path) == ["2.000001", "1.000001", "3.000001"]
+
+
+def test_export_skips_threads_quiet_for_too_long(
+    workspace, client, tmp_path
+):
+    # 1970 is a while ago
+    workspace.post("C1", "1.000001")
+    workspace.reply("C1", "1.000001", "1.000002")
+    exporter = Exporter(client, tmp_path)
+    assert exporter.export_channel("C1") == 2
+    workspace.reply("C1", "1.000001", "1.000003")
+    assert exporter.export_channel("C1") == 0
+    assert exporter.load_checkpoint("C1")["threads"] == {}
+
+
+def test_export_channels_concurrently(workspace, client, tmp_path):
+    for c in range(6):
+        workspace.post(f"C{c}", *(f"{n}.00000{c}" for n in range(1, 6)))
+    results = list(Exporter(client, tmp_path, workers=3).export())
+    assert [r.call[1]["channel"] for r in results] == [
+        f"C{c}" for c in range(6)
+    ]
+    assert [r.response for r in results] == [5] * 6
+    for c in range(6):
+        assert len(read(tmp_path / f"C{c}.jsonl.gz")) == 5
+
+
+def test_export_command(workspace, tmp_path, capsys):
+    workspace.post("C1", "1.000001")
+    code = main(
+        ["--token", "xoxb", "export", "--dest", str(tmp_path), "C1", "C404"]
+    )
+    assert code == 1
+    out, err = capsys.readouterr()
+    assert out == "C1: 1 messages\n"
+    assert "C404: failed" in err
+    assert read(tmp_path / "C1.jsonl.gz") == ["1.000001"]
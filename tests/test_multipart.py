@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.multipart import MultipartStream
+from urllib3 import encode_multipart_formdata
+from urllib3.fields import RequestField
+
+
+class Unseekable(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+        self.reads = []
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return self._data.read(size)
+
+
+def test_multipart_stream_matches_urllib3():
+    fields = {"token": "xoxb", "channels": "C1,C2", "title": None, "n": 1}
+    file = io.BytesIO(b"hello world" * 100)
+    file.name = "/tmp/hello.txt"
+    body = MultipartStream(fields, {"file": file}, boundary="b0undary")
+
+    file_field = RequestField("file", file.getvalue(), filename="hello.txt")
+    file_field.make_multipart(content_type="text/plain")
+    expected, content_type = encode_multipart_formdata(
+        [("token", "xoxb"), ("channels", "C1,C2"), ("n", "1"), file_field],
+        boundary="b0undary",
+    )
+
+    assert body.content_type == content_type
+    assert len(body) == body.total == len(expected)
+    assert body.read() == expected
+    assert body.read() == b""
+
+
+def test_multipart_stream_reads_in_chunks():
+    data = bytes(range(256)) * 64
+    file = Unseekable(data)
+    progress = []
+    body = MultipartStream(
+        {"token": "xoxb"},
+        {"file": ("data.bin", file)},
+        progress=lambda sent, total, rate: progress.append((sent, total)),
+        chunk_size=1000,
+    )
+    # the size can't be known, so it's sent chunked
+    assert body.total is None
+    assert len(body) == 0
+
+    chunks = list(body)
+    assert max(len(chunk) for chunk in chunks) <= 1000
+    assert max(size for size in file.reads) <= 1000
+    content = b"".join(chunks)
+    assert data in content
+    assert b'filename="data.bin"' in content
+    assert b"Content-Type: application/octet-stream" in content
+    assert progress[-1] == (len(content), None)
+    sent = [sent for sent, _ in progress]
+    assert sent == sorted(set(sent))
+
+
+def test_multipart_stream_rewinds(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+    with open(path, "rb") as file:
+        body = MultipartStream({"token": "xoxb"}, {"file": file})
+        first = body.read(10) + body.read()
+        assert body.sent == len(body)
+        body.seek(0)
+        assert body.sent == 0
+        assert body.read() == first
+        with pytest.raises(io.UnsupportedOperation):
+            body.seek(5)
+    assert b"Content-Type: text/csv" in first
+
+
+def test_multipart_stream_bytes_and_memoryview():
+    data = bytearray(b"x" * 100)
+    body = MultipartStream(files={"file": ("x.bin", memoryview(data))})
+    assert b"x" * 100 in body.read()
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.server.received.append((self.headers, self.rfile.read(length)))
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    server.received = []
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    monkeypatch.setattr(
+        SlackAPI, "url", f"http://127.0.0.1:{server.server_port}/api"
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_files_upload_streams(server, tmp_path):
+    path = tmp_path / "logs.txt"
+    path.write_bytes(b"log line\n" * 10000)
+    progress = []
+
+    with SlackTime("token") as client, open(path, "rb") as file:
+        client.files.upload(
+            channels=["C1", "C2"],
+            file=file,
+            progress=lambda *args: progress.append(args),
+        )
+
+    (headers, body), = server.received
+    assert headers["Content-Type"].startswith("multipart/form-data")
+    assert int(headers["Content-Length"]) == len(body)
+    assert b"log line\n" * 10000 in body
+    assert b'name="channels"\r\n\r\nC1,C2\r\n' in body
+    assert b'filename="logs.txt"' in body
+    sent, total, rate = progress[-1]
+    assert sent == total == len(body)
+    assert rate > 0
+
+
+def test_upload_paths_close_opened_files(server, tmp_path, monkeypatch):
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG" * 100)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("ghosts: 3")
+    opened = []
+    monkeypatch.setattr(
+        "slack_time.utils.OpenedFile.close",
+        lambda self: opened.append(self) or io.BufferedReader.close(self),
+    )
+
+    with SlackTime("token") as client:
+        client.files.upload(file=str(path))
+        client.users.set_photo(image=path)
+        client.files.upload(content=notes, filename="notes.txt")
+        client.files.upload(file=memoryview(b"in memory"), filename="m.txt")
+
+    assert len(opened) == 2
+    assert all(f.closed for f in opened)
+    uploads = [body for _, body in server.received]
+    assert b'name="file"; filename="photo.png"' in uploads[0]
+    assert b'name="image"; filename="photo.png"' in uploads[1]
+    # content is a form field with the file's text, not a file part
+    assert not uploads[2].startswith(b"--")
+    assert b"content=ghosts%3A+3" in uploads[2]
+    assert b"in memory" in uploads[3]
+
+
+def test_files_upload_many(server, tmp_path):
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"artifact{n}.txt"
+        path.write_bytes(b"artifact %d" % n)
+        paths.append(str(path))
+    files = paths[:5] + [{"file": paths[5], "title": "Release notes"}]
+
+    with SlackTime("token", rate_limit=False) as client:
+        results = client.files.upload_many(
+            files, channels=["C1"], thread_ts="1234.5678", workers=3
+        )
+
+    assert [r.ok for r in results] == [True] * 6
+    assert results[5].call[1]["title"] == "Release notes"
+    bodies = [body for _, body in server.received]
+    assert len(bodies) == 6
+    for n in range(6):
+        (body,) = [b for b in bodies if b"artifact %d" % n in b]
+        assert b'name="channels"\r\n\r\nC1\r\n' in body
+        assert b'name="thread_ts"\r\n\r\n1234.5678\r\n' in body
+    assert sum(b"Release notes" in body for body in bodies) == 1
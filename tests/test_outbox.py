@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import queue
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackTime
+from slack_time.errors import error_class
+from slack_time.outbox import Outbox
+
+
+class Recorder:
+    """stands in for chat.post_message, noting when each call started"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, channel, **kwargs):
+        with self.lock:
+            self.calls.append((time.monotonic(), channel, kwargs))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        if kwargs.get("text") == "boom":
+            raise error_class("channel_not_found")("not found")
+        return Mock(body={"ok": True, "channel": channel})
+
+    def sent(self, channel):
+        return [c for c in self.calls if c[1] == channel]
+
+
+@pytest.fixture
+def client():
+    client = SlackTime("token", rate_limit=False)
+    client.chat.post_message = Recorder()
+    client.chat.post_ephemeral = Recorder()
+    return client
+
+
+def test_outbox_keeps_order_per_channel(client):
+    with Outbox(client, rate=1000, workers=4) as outbox:
+        futures = [
+            outbox.post_message(f"C{n % 5}", text=str(n)) for n in range(100)
+        ]
+    assert all(f.result().body["ok"] for f in futures)
+    for c in range(5):
+        sent = client.chat.post_message.sent(f"C{c}")
+        assert [int(k["text"]) for _, _, k in sent] == list(range(c, 100, 5))
+
+
+def test_outbox_paces_each_channel(client):
+    post = client.chat.post_message = Recorder(delay=0.01)
+    with Outbox(client, rate=20, workers=4) as outbox:
+        for n in range(4):
+            outbox.post_message("C1", text=str(n))
+            outbox.post_message("C2", text=str(n))
+        assert outbox.flush(timeout=5)
+
+    for channel in ("C1", "C2"):
+        starts = [at for at, _, _ in post.sent(channel)]
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= 0.045
+    # the channels didn't wait on each other
+    assert post.max_running == 2
+    first = post.sent("C1")[0][0], post.sent("C2")[0][0]
+    assert abs(first[0] - first[1]) < 0.04
+
+
+def test_outbox_backpressure(client):
+    release = threading.Event()
+    client.chat.post_message = Mock(side_effect=lambda **kw: release.wait())
+    outbox = Outbox(client, maxsize=2)
+    outbox.post_message("C1", text="1")
+    outbox.post_message("C2", text="2")
+    assert len(outbox) == 2
+
+    with pytest.raises(queue.Full):
+        outbox.post_message("C3", text="3", block=False)
+    started = time.monotonic()
+    with pytest.raises(queue.Full):
+        outbox.post_message("C3", text="3", timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+
+    # a blocked caller carries on once a message has been sent
+    threading.Timer(0.05, release.set).start()
+    future = outbox.post_message("C3", text="3", timeout=5)
+    outbox.close()
+    assert future.done()
+    assert client.chat.post_message.call_count == 3
+
+
+def test_outbox_errors(client):
+    with Outbox(client, rate=1000) as outbox:
+        failed = outbox.post_message("C1", text="boom")
+        sent = outbox.post_message("C1", text="ok")
+    assert failed.exception().code == "channel_not_found"
+    assert sent.result().body["ok"]
+
+    with pytest.raises(RuntimeError):
+        outbox.post_message("C1", text="too late")
+
+
+def test_outbox_post_ephemeral(client):
+    with Outbox(client, rate=1000) as outbox:
+        outbox.post_ephemeral("C1", "U1", text="psst")
+    _, channel, kwargs = client.chat.post_ephemeral.calls[0]
+    assert channel == "C1"
+    assert kwargs == {"user": "U1", "text": "psst", "attachments": None}
+
+
+def test_outbox_lanes_share_resolved_channels(client):
+    client._channel_directory = Mock()
+    client._channel_directory.resolve.side_effect = {
+        "#general": "C1",
+        "C1": "C1",
+    }.get
+    post = client.chat.post_message = Recorder(delay=0.02)
+    with Outbox(client, rate=1000) as outbox:
+        outbox.post_message("#general", text="1")
+        outbox.post_message("C1", text="2")
+    # one lane, so one at a time
+    assert post.max_running == 1
+
+
+def test_outbox_drops_idle_lanes(client):
+    with Outbox(client, rate=100) as outbox:
+        for c in range(200):
+            outbox.post_message(f"C{c}", text="once")
+        assert outbox.flush(timeout=5)
+        # kept only until their pacing runs out
+        deadline = time.monotonic() + 5
+        while outbox._lanes and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert not outbox._lanes
+    assert len(client.chat.post_message.calls) == 200
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.pagination import is_cursor_paginated
+from slack_time.pagination import iter_pages
+from slack_time.pagination import method_name
+from slack_time.pagination import numbered_page_items
+from slack_time.pagination import page_items
+from slack_time.pagination import paginate_numbered
+from slack_time.pagination import paging
+from slack_time.pagination import prefetched
+
+PAGES = {
+    None: {
+        "ok": True,
+        "messages": [1, 2],
+        "has_more": True,
+        "response_metadata": {"next_cursor": "abc"},
+    },
+    "abc": {
+        "ok": True,
+        "messages": [3, 4],
+        "has_more": True,
+        "response_metadata": {"next_cursor": "def"},
+    },
+    "def": {
+        "ok": True,
+        "messages": [5],
+        "has_more": False,
+        "response_metadata": {"next_cursor": ""},
+    },
+}
+
+
+@pytest.fixture
+def slack_request(monkeypatch):
+    def request(path, payload):
+        return Mock(body=PAGES[payload.get("cursor")])
+
+    slack_request = Mock(side_effect=request)
+    monkeypatch.setattr(SlackAPI, "_get", slack_request)
+    monkeypatch.setattr(SlackAPI, "_post", slack_request)
+    return slack_request
+
+
+@pytest.fixture
+def client():
+    return SlackTime("token")
+
+
+def test_method_name(client):
+    assert method_name(client.conversations.history) == "conversations.history"
+    assert method_name(client.admin.users.list) == "admin.users.list"
+    with pytest.raises(ValueError):
+        method_name(print)
+
+
+@pytest.mark.parametrize(
+    "body, key, items",
+    [
+        ({"ok": True, "members": [1, 2]}, None, [1, 2]),
+        ({"ok": True, "file": {}, "comments": [1]}, None, [1]),
+        ({"ok": True, "emoji": {"a": "b"}}, None, []),
+        ({"ok": True, "a": [1], "b": [2]}, "b", [2]),
+        ({"ok": True}, "b", []),
+    ],
+)
+def test_page_items(body, key, items):
+    assert page_items(body, key) == items
+
+
+def test_paginate_follows_cursor(client, slack_request):
+    messages = client.paginate(client.conversations.history, "C1234567890")
+    assert list(messages) == [1, 2, 3, 4, 5]
+
+    calls = slack_request.call_args_list
+    assert [c[1]["payload"].get("cursor") for c in calls] == [
+        None,
+        "abc",
+        "def",
+    ]
+    assert all(c[1]["payload"]["limit"] == 1000 for c in calls)
+    assert all(c[1]["payload"]["channel"] == "C1234567890" for c in calls)
+
+
+def test_paginate_is_lazy(client, slack_request):
+    messages = client.paginate(client.conversations.history, "C1234567890")
+    assert next(messages) == 1
+    assert slack_request.call_count == 1
+
+
+def test_iter_pages_limit_and_cursor(client, slack_request):
+    pages = iter_pages(
+        client.admin.users.list, team_id="T1", cursor="abc", limit=None
+    )
+    assert [p.body["messages"] for p in pages] == [[3, 4], [5]]
+    assert slack_request.call_args[1]["payload"]["limit"] == 100
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_prefetched_fetches_ahead_with_bounded_depth():
+    produced = []
+
+    def produce():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    items = prefetched(produce(), depth=2)
+    assert next(items) == 0
+    # the next items are made while the consumer still holds the first
+    wait_for(lambda: len(produced) >= 3)
+    time.sleep(0.2)
+    # but no more than depth ready + the one waiting to be queued
+    assert len(produced) <= 4
+    assert list(items) == list(range(1, 10))
+
+
+def test_prefetched_raises_in_consumer():
+    def produce():
+        yield 1
+        raise KeyError("boom")
+
+    items = prefetched(produce())
+    assert next(items) == 1
+    with pytest.raises(KeyError):
+        next(items)
+
+
+def test_prefetched_stops_when_closed():
+    def produce():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    before = threading.active_count()
+    items = prefetched(produce())
+    next(items)
+    items.close()
+    wait_for(lambda: threading.active_count() == before)
+
+
+def test_paginate_prefetch(client, slack_request):
+    messages = client.paginate(
+        client.conversations.history, "C1234567890", prefetch=1
+    )
+    assert list(messages) == [1, 2, 3, 4, 5]
+    assert slack_request.call_count == 3
+
+
+def search_page(count, page, pages=4):
+    matches = [f"{page}.{i}" for i in range(2)]
+    paging = {"count": count, "page": page, "pages": pages, "total": 8}
+    return {
+        "ok": True,
+        "query": "hi",
+        "messages": {"matches": matches, "paging": paging},
+    }
+
+
+@pytest.fixture
+def search_request(monkeypatch):
+    def request(path, payload):
+        # finish out of order to check pages are still yielded in order
+        time.sleep(0.05 * (4 - payload["page"]))
+        return Mock(body=search_page(payload["count"], payload["page"]))
+
+    search_request = Mock(side_effect=request)
+    monkeypatch.setattr(SlackAPI, "_get", search_request)
+    monkeypatch.setattr(SlackAPI, "_post", search_request)
+    return search_request
+
+
+@pytest.mark.parametrize(
+    "body, key, items",
+    [
+        ({"ok": True, "files": [1], "paging": {}}, None, [1]),
+        (search_page(20, 1), None, ["1.0", "1.1"]),
+        (search_page(20, 1), "messages.matches", ["1.0", "1.1"]),
+        (search_page(20, 1), "files.matches", []),
+    ],
+)
+def test_numbered_page_items(body, key, items):
+    assert numbered_page_items(body, key) == items
+
+
+def test_paging_nested_in_search_all():
+    body = {
+        "messages": {"paging": {"pages": 2}},
+        "files": {"paging": {"pages": 5}},
+    }
+    assert paging(body) == {"pages": 5}
+    assert paging({"paging": {"pages": 3}}) == {"pages": 3}
+    assert paging({}) == {}
+
+
+def test_paginate_numbered_fans_out_in_order(client, search_request):
+    matches = paginate_numbered(client.search.messages, "hi", workers=3)
+    assert list(matches) == [f"{p}.{i}" for p in range(1, 5) for i in range(2)]
+
+    payloads = [c[1]["payload"] for c in search_request.call_args_list]
+    assert sorted(p["page"] for p in payloads) == [1, 2, 3, 4]
+    assert all(p["count"] == 100 for p in payloads)
+
+
+def test_slack_time_paginate_dispatches(client, search_request):
+    assert is_cursor_paginated(client.conversations.history)
+    assert not is_cursor_paginated(client.search.messages)
+
+    matches = client.paginate(client.search.messages, "hi", count=2)
+    assert len(list(matches)) == 8
+    assert search_request.call_args[1]["payload"]["count"] == 2
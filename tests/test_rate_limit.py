@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from slack_time import SlackAPI
+from slack_time.rate_limit import RateLimiter
+from slack_time.rate_limit import TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_bursts_then_queues():
+    clock = Clock()
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1)
+    assert bucket.reserve() == pytest.approx(2)
+
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_pause():
+    clock = Clock()
+    bucket = TokenBucket(rate=1, capacity=5, clock=clock)
+    bucket.pause(30)
+    assert bucket.reserve() == pytest.approx(30)
+
+
+def test_rate_limiter_tiers():
+    limiter = RateLimiter(burst=0)
+    assert limiter.bucket("rtm.start").rate == pytest.approx(1 / 60)
+    assert limiter.bucket("users.list").rate == pytest.approx(20 / 60)
+    assert limiter.bucket("chat.update").rate == pytest.approx(50 / 60)
+    assert limiter.bucket("users.info").rate == pytest.approx(100 / 60)
+    assert limiter.bucket("some.new.method").rate == pytest.approx(50 / 60)
+
+    limiter = RateLimiter(tiers={"users.info": 1})
+    assert limiter.bucket("users.info").rate == pytest.approx(1 / 60)
+
+
+def test_rate_limiter_post_message_per_channel():
+    clock = Clock()
+    limiter = RateLimiter(burst=0, clock=clock)
+
+    general = {"channel": "general"}
+    random = {"channel": "random"}
+    assert limiter.reserve("chat.postMessage", general) == 0
+    assert limiter.reserve("chat.postMessage", random) == 0
+    assert limiter.reserve("chat.postMessage", general) == pytest.approx(1)
+
+
+@pytest.mark.parametrize("retry_after, wait", [("7", 7), (None, 1)])
+def test_rate_limiter_retry_after(retry_after, wait):
+    clock = Clock()
+    limiter = RateLimiter(clock=clock)
+    limiter.retry_after("users.info", retry_after=retry_after)
+    assert limiter.reserve("users.info") == pytest.approx(wait)
+
+
+def make_response(status_code, body, headers=None):
+    return Mock(
+        status_code=status_code,
+        headers=headers or {},
+        json=Mock(return_value=body),
+    )
+
+
+def test_slack_api_requeues_on_429():
+    session = Mock()
+    session.request.side_effect = [
+        make_response(
+            429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "3"}
+        ),
+        make_response(200, {"ok": True}),
+    ]
+    limiter = RateLimiter()
+    api = SlackAPI("token", session=session, rate_limiter=limiter)
+
+    with patch("slack_time.rate_limit.time.sleep") as sleep:
+        resp = api._get("users.info", payload={"user": "U1234567890"})
+
+    assert resp.successful
+    assert session.request.call_count == 2
+    sleep.assert_called_once()
+    assert sleep.call_args[0][0] == pytest.approx(3, abs=0.1)
+
+
+def test_slack_api_gives_up_after_max_retries():
+    from slack_time import SlackError
+
+    session = Mock()
+    session.request.return_value = make_response(
+        429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "0"}
+    )
+    api = SlackAPI(
+        "token", session=session, rate_limiter=RateLimiter(max_retries=2)
+    )
+
+    with patch("slack_time.rate_limit.time.sleep"):
+        with pytest.raises(SlackError):
+            api._get("users.info")
+    assert session.request.call_count == 3
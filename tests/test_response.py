@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import gc
+import json
+import weakref
+from unittest.mock import Mock
+
+import pytest
+from slack_time.response import SlackResponse
+
+
+def make_response(body):
+    content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    response = Mock(content=content, status_code=200)
+    response.json.side_effect = lambda: json.loads(content)
+    return response
+
+
+@pytest.mark.parametrize(
+    "content, successful",
+    [
+        (b'{"ok":true,"members":[]}', True),
+        (b'{\n    "ok": false,\n    "error": "silly"\n}', False),
+    ],
+)
+def test_slack_response_reads_ok_without_decoding(content, successful):
+    resp = SlackResponse(make_response(content))
+    assert resp.successful is successful
+    assert "body" not in resp.__dict__
+
+
+def test_slack_response_ok_not_first():
+    resp = SlackResponse(make_response({"warning": "hi", "ok": True}))
+    assert resp.successful is True
+
+
+def test_slack_response_body_is_decoded_once():
+    body = {"ok": True, "members": [{"id": "U1234567890"}]}
+    resp = SlackResponse(make_response(body))
+    assert resp.error is None
+    assert resp.body == body
+    assert resp.body is resp.body
+    assert resp.json() is resp.body
+    resp._response.json.assert_not_called()
+
+
+def test_slack_response_error():
+    resp = SlackResponse(make_response({"ok": False, "error": "silly"}))
+    assert resp.successful is False
+    assert resp.error == "silly"
+
+
+def test_slack_response_passes_through():
+    response = make_response({"ok": True})
+    resp = SlackResponse(response)
+    assert resp.status_code == 200
+    assert repr(resp) == repr(response)
+
+
+def test_slack_response_not_json():
+    resp = SlackResponse(make_response(b"<html>Bad Gateway</html>"))
+    with pytest.raises(ValueError):
+        resp.successful
+
+
+def test_slack_response_cached_on_the_instance():
+    resp = SlackResponse(make_response({"ok": True}))
+    assert resp.successful and resp.body == {"ok": True}
+    assert resp.__dict__["body"] is resp.body
+    ref = weakref.ref(resp)
+    del resp
+    gc.collect()
+    assert ref() is None
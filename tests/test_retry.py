@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+import requests
+from slack_time import SlackAPI
+from slack_time import SlackError
+from slack_time.rate_limit import RateLimiter
+from slack_time.retry import RetryPolicy
+
+
+def make_response(status_code=200, body=None, headers=None):
+    body = body if body is not None else {"ok": True}
+    return Mock(
+        status_code=status_code,
+        headers=headers or {},
+        json=Mock(return_value=body),
+    )
+
+
+@pytest.mark.parametrize(
+    "path, idempotent",
+    [
+        ("users.info", True),
+        ("conversations.history", True),
+        ("users.lookupByEmail", True),
+        ("search.messages", True),
+        ("chat.getPermalink", True),
+        ("chat.postMessage", False),
+        ("files.upload", False),
+        ("conversations.invite", False),
+    ],
+)
+def test_retry_policy_is_idempotent(path, idempotent):
+    assert RetryPolicy().is_idempotent(path) is idempotent
+
+
+def test_retry_policy_retry_response():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry_response("users.info", 1, 200, "internal_error")
+    assert policy.should_retry_response("users.info", 2, 503)
+    assert not policy.should_retry_response("users.info", 3, 503)
+    assert not policy.should_retry_response("users.info", 1, 200, "silly")
+
+    assert policy.should_retry_response("chat.postMessage", 1, 429)
+    assert policy.should_retry_response(
+        "chat.postMessage", 1, 200, "ratelimited"
+    )
+    assert not policy.should_retry_response("chat.postMessage", 1, 503)
+    assert not policy.should_retry_response(
+        "chat.postMessage", 1, 200, "internal_error"
+    )
+
+
+def test_retry_policy_retry_exception():
+    policy = RetryPolicy()
+    assert policy.should_retry_exception("users.info", 1, sent=True)
+    assert policy.should_retry_exception("chat.postMessage", 1, sent=False)
+    assert not policy.should_retry_exception("chat.postMessage", 1, sent=True)
+
+
+def test_retry_policy_overrides():
+    no_retry = RetryPolicy(max_attempts=1)
+    policy = RetryPolicy(overrides={"users.info": no_retry})
+    assert policy.for_method("users.info") is no_retry
+    assert policy.for_method("users.list") is policy
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+    assert [policy.delay(i) for i in range(1, 5)] == [1, 2, 4, 5]
+    assert policy.delay(1, retry_after="10") == 10
+
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= policy.delay(4) <= 5 for _ in range(100))
+
+
+def test_slack_api_retries_transient_errors():
+    session = Mock()
+    session.request.side_effect = [
+        requests.ConnectionError("reset"),
+        make_response(502, {"ok": False, "error": "bad_gateway"}),
+        make_response(200, {"ok": False, "error": "internal_error"}),
+        make_response(),
+    ]
+    api = SlackAPI("token", session, retry_policy=RetryPolicy(max_attempts=4))
+
+    with patch("slack_time.api.time.sleep") as sleep:
+        resp = api._get("users.info", payload={"user": "U1234567890"})
+
+    assert resp.successful
+    assert session.request.call_count == 4
+    assert sleep.call_count == 3
+
+
+def test_slack_api_does_not_retry_sent_writes():
+    session = Mock()
+    session.request.side_effect = requests.ReadTimeout("timeout")
+    api = SlackAPI("token", session, retry_policy=RetryPolicy())
+
+    with patch("slack_time.api.time.sleep"):
+        with pytest.raises(requests.ReadTimeout):
+            api._post("chat.postMessage", payload={"channel": "C1"})
+    assert session.request.call_count == 1
+
+
+def test_slack_api_retries_unsent_writes():
+    session = Mock()
+    session.request.side_effect = [
+        requests.ConnectTimeout("timeout"),
+        make_response(200, {"ok": False, "error": "ratelimited"}),
+        make_response(),
+    ]
+    api = SlackAPI("token", session, retry_policy=RetryPolicy())
+
+    with patch("slack_time.api.time.sleep"):
+        resp = api._post("chat.postMessage", payload={"channel": "C1"})
+    assert resp.successful
+    assert session.request.call_count == 3
+
+
+def test_slack_api_gives_up_after_max_attempts():
+    session = Mock()
+    session.request.return_value = make_response(
+        200, {"ok": False, "error": "internal_error"}
+    )
+    api = SlackAPI("token", session, retry_policy=RetryPolicy(max_attempts=2))
+
+    with patch("slack_time.api.time.sleep"):
+        with pytest.raises(SlackError):
+            api._get("users.info")
+    assert session.request.call_count == 2
+
+
+def test_slack_api_retries_429_in_one_place():
+    session = Mock()
+    session.request.return_value = make_response(
+        429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "0"}
+    )
+    api = SlackAPI(
+        "token",
+        session,
+        rate_limiter=RateLimiter(max_retries=5),
+        retry_policy=RetryPolicy(max_attempts=3),
+    )
+
+    with patch("slack_time.api.time.sleep") as sleep:
+        with patch("slack_time.rate_limit.time.sleep"):
+            with pytest.raises(SlackError):
+                api._get("users.info")
+    # the rate limiter's retries, not multiplied by the retry policy's
+    assert session.request.call_count == 6
+    sleep.assert_not_called()
+
+    # without a rate limiter the retry policy handles them
+    session.request.reset_mock()
+    api = SlackAPI("token", session, retry_policy=RetryPolicy(max_attempts=3))
+    with patch("slack_time.api.time.sleep"):
+        with pytest.raises(SlackError):
+            api._get("users.info")
+    assert session.request.call_count == 3
+
+
+def test_slack_api_retries_bodies_that_arent_json():
+    session = Mock()
+    session.request.side_effect = [
+        Mock(status_code=502, headers={}, content=b"<html>Bad Gateway"),
+        make_response(),
+    ]
+    api = SlackAPI("token", session, retry_policy=RetryPolicy())
+
+    with patch("slack_time.api.time.sleep"):
+        resp = api._get("users.info")
+    assert resp.successful
+    assert session.request.call_count == 2
+
+
+def test_slack_api_does_not_retry_mistakes():
+    api = SlackAPI("token", retry_policy=RetryPolicy())
+    api.url = "slack.com/api"
+
+    with patch("slack_time.api.time.sleep") as sleep:
+        with pytest.raises(requests.exceptions.MissingSchema):
+            api._get("users.info")
+    sleep.assert_not_called()
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+import base64
+import hashlib
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackAPI
+from slack_time import SlackTime
+from slack_time.errors import error_class
+from slack_time.methods.rtm import Rtm
+from slack_time.rtm import channel_of
+from slack_time.rtm import Dispatcher
+from slack_time.rtm import RTMSession
+from slack_time.rtm import ts_key
+
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+class Connection(socketserver.BaseRequestHandler):
+    """one client of the stand-in RTM server, speaking just enough of RFC
+    6455 for text frames, pings and closes"""
+
+    def setup(self):
+        self.lock = threading.Lock()
+        self.received = []
+        self.file = self.request.makefile("rb")
+
+    def handle(self):
+        headers = {}
+        self.file.readline()
+        for line in iter(self.file.readline, b"\r\n"):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers["sec-websocket-key"].encode()
+        accept = base64.b64encode(hashlib.sha1(key + GUID).digest())
+        self.request.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        self.server.connections.append(self)
+        if self.server.hello:
+            self.send({"type": "hello"})
+        try:
+            while True:
+                opcode, data = self.read_frame()
+                if opcode == 8:
+                    self.send_frame(8, data)
+                    return
+                if opcode != 1:
+                    continue
+                event = json.loads(data)
+                self.received.append(event)
+                if event.get("type") == "ping" and not self.server.mute:
+                    self.send({"type": "pong", "reply_to": event["id"]})
+        except (OSError, ValueError):
+            return
+
+    def read_frame(self):
+        header = self.file.read(2)
+        if len(header) < 2:
+            raise ValueError("closed")
+        opcode = header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self.file.read(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self.file.read(8))
+        mask = self.file.read(4) if header[1] & 0x80 else b"\0" * 4
+        data = bytes(
+            b ^ mask[i % 4] for i, b in enumerate(self.file.read(length))
+        )
+        return opcode, data
+
+    def send_frame(self, opcode, data):
+        if len(data) < 126:
+            header = struct.pack("!BB", 0x80 | opcode, len(data))
+        elif len(data) < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, len(data))
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, len(data))
+        with self.lock:
+            self.request.sendall(header + data)
+
+    def send(self, event):
+        self.send_frame(1, json.dumps(event).encode())
+
+    def drop(self):
+        self.request.shutdown(socket.SHUT_RDWR)
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Connection)
+        self.connections = []
+        self.hello = True
+        self.mute = False
+        self.url = f"ws://127.0.0.1:{self.server_address[1]}/"
+
+    @property
+    def current(self):
+        wait_until(lambda: self.connections)
+        return self.connections[-1]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StandInServer()
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    connect = Mock(
+        return_value=Mock(
+            body={"ok": True, "url": server.url, "self": {"id": "U1"}}
+        )
+    )
+    monkeypatch.setattr(Rtm, "connect", connect)
+    server.rtm_connect = connect
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session(server):
+    session = RTMSession(SlackTime("token"), max_backoff=0.05)
+    yield session
+    session.stop(timeout=5)
+
+
+@pytest.mark.parametrize(
+    "event, channel",
+    [
+        ({"type": "message", "channel": "C1"}, "C1"),
+        ({"type": "reaction_added", "item": {"channel": "C2"}}, "C2"),
+        ({"type": "channel_created", "channel": {"id": "C3"}}, "C3"),
+        ({"type": "presence_change", "user": "U1"}, None),
+    ],
+)
+def test_channel_of(event, channel):
+    assert channel_of(event) == channel
+
+
+def test_dispatcher_keeps_order_per_key():
+    seen = {}
+    lock = threading.Lock()
+
+    def handle(key, n):
+        time.sleep(random.random() / 10000)
+        with lock:
+            seen.setdefault(key, []).append(n)
+
+    dispatcher = Dispatcher(workers=4, queue_size=10)
+    for n in range(200):
+        key = f"C{n % 7}"
+        dispatcher.submit(key, handle, key, n)
+    dispatcher.join()
+    dispatcher.shutdown()
+    for key, ns in seen.items():
+        assert ns == sorted(ns)
+    assert sum(len(ns) for ns in seen.values()) == 200
+
+
+def test_rtm_session_dispatches_events(server, session):
+    messages, everything = [], []
+    session.on("message")(messages.append)
+    session.add_handler("*", everything.append)
+    session.start()
+
+    server.current.send({"type": "message", "channel": "C1", "text": "hi"})
+    wait_until(lambda: messages)
+    assert messages[0]["text"] == "hi"
+    wait_until(lambda: len(everything) == 2)
+    assert [e["type"] for e in everything] == ["hello", "message"]
+    assert session.self_info == {"id": "U1"}
+
+
+def test_rtm_session_per_channel_order_under_load(server, session):
+    seen = {}
+    running = [0, 0]
+    lock = threading.Lock()
+
+    @session.on("message")
+    def handle(event):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(random.random() / 2000)
+        with lock:
+            running[0] -= 1
+            seen.setdefault(event["channel"], []).append(event["n"])
+
+    session.start()
+    connection = server.current
+    for n in range(2000):
+        connection.send({"type": "message", "channel": f"C{n % 10}", "n": n})
+
+    wait_until(lambda: sum(len(ns) for ns in seen.values()) == 2000)
+    assert len(seen) == 10
+    for ns in seen.values():
+        assert ns == sorted(ns)
+    # channels were handled concurrently
+    assert running[1] > 1
+
+
+def test_rtm_session_reconnects(server, session):
+    hellos = []
+    session.on("hello")(hellos.append)
+    session.start()
+    first = server.current
+    wait_until(lambda: hellos)
+
+    first.drop()
+    wait_until(lambda: len(server.connections) == 2)
+    wait_until(lambda: len(hellos) == 2)
+    assert session.connections == 2
+    assert server.rtm_connect.call_count == 2
+
+
+def test_rtm_session_reconnects_on_goodbye(server, session):
+    session.start()
+    server.current.send({"type": "goodbye"})
+    wait_until(lambda: len(server.connections) == 2)
+
+
+def test_rtm_session_heartbeat(server):
+    session = RTMSession(
+        SlackTime("token"), ping_interval=0.05, max_backoff=0.05
+    )
+    pongs = []
+    session.on("pong")(pongs.append)
+    with session:
+        first = server.current
+        wait_until(lambda: len(first.received) >= 2)
+        assert {e["type"] for e in first.received} == {"ping"}
+        # pongs are heartbeat replies, not events for the handlers
+        assert not pongs
+
+        # a server that stops answering is reconnected to
+        server.mute = True
+        server.hello = False
+        wait_until(lambda: len(server.connections) == 2)
+
+
+def test_rtm_session_handler_errors(server):
+    errors, messages = [], []
+    session = RTMSession(SlackTime("token"), on_error=errors.append)
+
+    @session.on("message")
+    def handle(event):
+        if event["text"] == "boom":
+            raise ValueError(event["text"])
+        messages.append(event)
+
+    with session:
+        for text in ("boom", "ok"):
+            server.current.send(
+                {"type": "message", "channel": "C1", "text": text}
+            )
+        wait_until(lambda: messages)
+    assert isinstance(errors[0], ValueError)
+
+
+def test_rtm_session_send(server, session):
+    @session.on("message")
+    def typing(event):
+        session.send({"type": "typing", "channel": event["channel"]})
+
+    session.start()
+    connection = server.current
+    connection.send({"type": "message", "channel": "C1"})
+    wait_until(lambda: connection.received)
+    assert connection.received[0]["type"] == "typing"
+    assert connection.received[0]["id"] == 1
+
+
+@pytest.mark.parametrize(
+    "ts, key",
+    [("1503435956.000247", (1503435956, 247)), ("12", (12, 0))],
+)
+def test_ts_key(ts, key):
+    assert ts_key(ts) == key
+
+
+@pytest.fixture
+def history(monkeypatch):
+    messages = {}
+
+    def get(self, path, payload=None, **kwargs):
+        assert path == "conversations.history"
+        channel = payload["channel"]
+        if channel not in messages:
+            raise error_class("channel_not_found")("not found")
+        found = [
+            m
+            for m in messages[channel]
+            if ts_key(m["ts"]) > ts_key(payload["oldest"])
+        ]
+        # newest first, one message a page
+        found.sort(key=lambda m: ts_key(m["ts"]), reverse=True)
+        start = int(payload.get("cursor") or 0)
+        cursor = str(start + 1) if start + 1 < len(found) else ""
+        return Mock(
+            body={
+                "ok": True,
+                "messages": found[start : start + 1],
+                "response_metadata": {"next_cursor": cursor},
+            }
+        )
+
+    history = Mock(side_effect=get)
+    history.messages = messages
+    monkeypatch.setattr(
+        SlackAPI, "_get", lambda *args, **kwargs: history(*args, **kwargs)
+    )
+    return history
+
+
+def message(channel, ts, **kwargs):
+    return dict(type="message", channel=channel, ts=ts, **kwargs)
+
+
+def test_rtm_session_backfills_after_reconnect(server, session, history):
+    seen = []
+    session.on("message")(lambda e: seen.append((e["channel"], e["ts"])))
+    session.start()
+
+    first = server.current
+    for event in (
+        message("C1", "100.000001"),
+        message("C1", "100.000002"),
+        message("C2", "200.000001"),
+    ):
+        first.send(event)
+    wait_until(lambda: len(seen) == 3)
+    assert session.last_ts == {"C1": "100.000002", "C2": "200.000001"}
+
+    history.messages["C1"] = [
+        {"type": "message", "ts": ts}
+        for ts in ("100.000001", "100.000002", "100.000003", "100.000004")
+    ]
+    history.messages["C2"] = [{"type": "message", "ts": "200.000002"}]
+    first.drop()
+    wait_until(lambda: len(server.connections) == 2)
+    second = server.current
+    # sent live as well as missed, so only handled once
+    second.send(message("C1", "100.000004"))
+    second.send(message("C1", "100.000005"))
+
+    wait_until(lambda: len(seen) == 7)
+    # give a duplicate time to show up
+    time.sleep(0.05)
+    assert [ts for channel, ts in seen if channel == "C1"] == [
+        "100.000001",
+        "100.000002",
+        "100.000003",
+        "100.000004",
+        "100.000005",
+    ]
+    assert [ts for channel, ts in seen if channel == "C2"] == [
+        "200.000001",
+        "200.000002",
+    ]
+    payloads = [call[1]["payload"] for call in history.call_args_list]
+    oldest = {payload["channel"]: payload["oldest"] for payload in payloads}
+    assert oldest == {"C1": "100.000002", "C2": "200.000001"}
+
+
+def test_rtm_session_backfill_from_saved_last_ts(server, history):
+    errors, seen = [], []
+    history.messages["C1"] = [{"type": "message", "ts": "100.000002"}]
+    session = RTMSession(
+        SlackTime("token"),
+        last_ts={"C1": "100.000001", "C9": "900.000001"},
+        on_error=errors.append,
+    )
+    session.on("message")(seen.append)
+    with session:
+        wait_until(lambda: seen)
+    assert seen == [message("C1", "100.000002")]
+    assert errors[0].code == "channel_not_found"
+
+
+def test_rtm_session_without_backfill(server, history):
+    session = RTMSession(
+        SlackTime("token"), last_ts={"C1": "100.000001"}, backfill=False
+    )
+    with session:
+        wait_until(lambda: server.connections)
+    assert not history.called
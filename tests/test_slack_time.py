@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+from requests import Session
+from slack_time import SlackTime
+
+
+def test_slack_time_makes_pooled_session():
+    client = SlackTime("token", pool_connections=3, pool_maxsize=7)
+    assert isinstance(client._session, Session)
+
+    adapter = client._session.get_adapter("https://slack.com/api")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+
+
+def test_slack_time_session_is_shared_by_namespaces():
+    client = SlackTime("token")
+    session = client._session
+
+    assert client.chat._session is session
+    assert client.files.comments._session is session
+    assert client.admin.conversations.ekm._session is session
+
+
+def test_slack_time_keep_alive_off():
+    client = SlackTime("token", keep_alive=False)
+    assert client._session.headers["Connection"] == "close"
+
+
+def test_slack_time_close_owned_session():
+    with patch.object(Session, "close") as close:
+        with SlackTime("token"):
+            pass
+        close.assert_called_once_with()
+
+
+def test_slack_time_does_not_close_user_session():
+    session = Session()
+    with patch.object(session, "close") as close:
+        with SlackTime("token", session=session) as client:
+            assert client._session is session
+        close.assert_not_called()
+
+
+def test_slack_time_imports_namespaces_lazily():
+    code = (
+        "import sys\n"
+        "from slack_time import SlackTime\n"
+        "loaded = lambda: {m for m in sys.modules if m.startswith("
+        "'slack_time.methods.')}\n"
+        "assert not loaded(), loaded()\n"
+        "SlackTime('token', rate_limit=False).chat\n"
+        "assert loaded() == {'slack_time.methods.chat'}, loaded()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_slack_time_methods_lazy_attributes():
+    from slack_time import methods
+    from slack_time.methods.admin import Admin
+
+    assert methods.Admin is Admin
+    assert "Workflows" in dir(methods)
+    with pytest.raises(AttributeError):
+        methods.Nope
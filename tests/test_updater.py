@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from slack_time import SlackTime
+from slack_time.updater import Updater
+
+
+class Recorder:
+    """stands in for chat.update, noting each call's text and start"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, channel, ts, text=None, **kwargs):
+        with self.lock:
+            self.calls.append((time.monotonic(), channel, ts, text))
+        time.sleep(self.delay)
+        return Mock(body={"ok": True, "channel": channel, "text": text})
+
+    def texts(self, channel="C1", ts="1.000001"):
+        return [c[3] for c in self.calls if c[1:3] == (channel, ts)]
+
+
+@pytest.fixture
+def client():
+    client = SlackTime("token", rate_limit=False)
+    client.chat.update = Recorder(delay=0.01)
+    return client
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+def test_updater_keeps_only_the_latest_update(client):
+    with Updater(client, rate=10) as updater:
+        futures = [updater.update("C1", "1.000001", text="0")]
+        wait_until(lambda: client.chat.update.calls)
+        futures += [
+            updater.update("C1", "1.000001", text=str(n))
+            for n in range(1, 50)
+        ]
+        time.sleep(0.25)
+        assert len(updater) == 0
+    texts = client.chat.update.texts()
+    # the first is sent straight away, the rest collapse into the last
+    assert texts == ["0", "49"]
+    assert updater.coalesced == 48
+    assert futures[0].result().body["text"] == "0"
+    assert {f.result().body["text"] for f in futures[1:]} == {"49"}
+
+
+def test_updater_paces_each_message(client):
+    post = client.chat.update
+    with Updater(client, rate=20) as updater:
+        deadline = time.monotonic() + 0.3
+        n = 0
+        while time.monotonic() < deadline:
+            updater.update("C1", "1.000001", text=str(n))
+            updater.update("C2", "2.000001", text=str(n))
+            n += 1
+            time.sleep(0.001)
+
+    for key in (("C1", "1.000001"), ("C2", "2.000001")):
+        calls = [c for c in post.calls if c[1:3] == key]
+        starts = [c[0] for c in calls]
+        gaps = [b - a for a, b in zip(starts, starts[1:-1])]
+        assert min(gaps) >= 0.045
+        assert len(calls) <= 9
+        # in order, ending with the last update
+        texts = [int(c[3]) for c in calls]
+        assert texts == sorted(texts)
+        assert texts[-1] == n - 1
+
+
+def test_updater_never_reorders_in_flight_updates(client):
+    release = threading.Event()
+    sent = []
+
+    def update(channel, ts, text):
+        if text == "slow":
+            release.wait()
+        sent.append(text)
+
+    client.chat.update = update
+    updater = Updater(client, rate=1000)
+    first = updater.update("C1", "1.000001", text="slow")
+    time.sleep(0.05)
+    second = updater.update("C1", "1.000001", text="fast")
+    time.sleep(0.05)
+    # waits for the update in flight rather than racing it
+    assert not second.done()
+    release.set()
+    updater.close()
+    assert sent == ["slow", "fast"]
+    assert first.done() and second.done()
+
+
+def test_updater_flush_skips_the_wait(client):
+    updater = Updater(client, rate=0.1)
+    updater.update("C1", "1.000001", text="start")
+    wait_until(lambda: client.chat.update.calls)
+    updater.update("C1", "1.000001", text="middle")
+    updater.update("C1", "1.000001", text="done")
+    started = time.monotonic()
+    assert updater.flush(timeout=5)
+    assert time.monotonic() - started < 1
+    assert client.chat.update.texts() == ["start", "done"]
+    updater.close()
+
+    with pytest.raises(RuntimeError):
+        updater.update("C1", "1.000001", text="too late")
+
+
+def test_updater_errors(client):
+    client.chat.update = Mock(side_effect=ValueError("boom"))
+    with Updater(client) as updater:
+        future = updater.update("C1", "1.000001", text="x")
+    assert isinstance(future.exception(), ValueError)
+    assert len(updater) == 0
+
+
+def test_updater_drops_idle_messages(client):
+    client.chat.update = Recorder()
+    with Updater(client, rate=100) as updater:
+        for n in range(200):
+            updater.update("C1", f"{n}.000001", text="once")
+        assert updater.flush(timeout=5)
+        # kept only until their pacing runs out
+        wait_until(lambda: not updater._lanes)
+    assert len(client.chat.update.calls) == 200
@@ -6,9 +6,12 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from slack_time.utils import close_opened_files
 from slack_time.utils import comma_separated_string
 from slack_time.utils import make_file
 from slack_time.utils import make_json_encoded
+from slack_time.utils import make_text
+from slack_time.utils import OpenedFile
 
 FILENAME = "hello.txt"
 TEXT = "Hello World!"
@@ -43,6 +46,37 @@ def test_make_file_with_io(temp_file):
     assert f.read().decode() == TEXT
 
 
+@pytest.mark.parametrize(
+    "data", [b"Hello", bytearray(b"Hello"), memoryview(b"Hello")]
+)
+def test_make_file_with_bytes(data):
+    assert make_file(data) is data
+
+
+def test_close_opened_files(temp_file):
+    opened = make_file(temp_file)
+    given = open(temp_file, "rb")
+    assert isinstance(opened, OpenedFile)
+    assert not isinstance(given, OpenedFile)
+
+    close_opened_files({"file": opened, "other": given, "data": b"x"})
+    assert opened.closed
+    assert not given.closed
+    given.close()
+
+
+def test_make_text(temp_file):
+    assert make_text(TEXT) == TEXT
+    assert make_text(temp_file) == TEXT
+    # a str is the text itself, even when it names a file
+    assert make_text(str(temp_file)) == str(temp_file)
+    assert make_text(memoryview(TEXT.encode())) == TEXT
+    with open(temp_file, "rb") as f:
+        assert make_text(f) == TEXT
+    with open(temp_file) as f:
+        assert make_text(f) == TEXT
+
+
 @pytest.mark.parametrize("field", [[1, 2, 3], {1: "a", 2: "b"}])
 def test_make_json_encoded(field):
     assert make_json_encoded(field) == json.dumps(field)